@@ -21,6 +21,12 @@ PIVOTフレームワーク:
     # エンジンを直接使う場合
     engine = InsightInterviewEngine(domain="biz_analysis")
     result = engine.process_texts(youtube_transcripts)
+
+コマンドライン:
+    python -m nlp.python.pivot corpus interviews/ -o out/ --workers 8
+    python -m nlp.python.pivot watch inbox/ -o out/ --workers 4
+    python -m nlp.python.pivot serve --port 8765
+    python -m nlp.python.pivot db import pivot.db out/shards/*.jsonl
 """
 
 __version__ = "0.4.0"
@@ -29,18 +35,31 @@ __version__ = "0.4.0"
 from .morphology import (
     MorphologyAnalyzer,
     MorphologyResult,
+    MorphologyBatch,
     VerbCategory,
     Sentiment,
     VerbInfo,
     AdjectiveInfo,
     AdverbInfo,
     TailInfo,
+    Mention,
     infer_pivot_from_morphology,
     calculate_intensity_score,
     analyze_text as analyze_morphology,
     get_verb_category,
     get_adjective_sentiment,
     get_degree_factor,
+    MorphologyBackend,
+    RuleBackend,
+    LexicalMatches,
+)
+
+# Morphology Backends
+from .backends import (
+    TokenizerBackend,
+    FugashiBackend,
+    SudachiBackend,
+    get_backend as get_morphology_backend,
 )
 
 # PIVOT Classifier
@@ -48,10 +67,12 @@ from .classifier import (
     PIVOTClassifier,
     PIVOTInsight,
     PIVOTClassificationResult,
+    ClassificationBudget,
     Utterance,
     PIVOT,
     BusinessDomain,
     classify_utterances,
+    aggregate_insights,
     generate_pivot_insight_mart,
     generate_pivot_summary_mart,
     get_pivot_description,
@@ -73,32 +94,134 @@ from .engine import (
     get_urgent_items,
 )
 
+# Corpus Runner
+from .corpus import (
+    CorpusRunner,
+    CorpusReport,
+    collect_inputs,
+    merge_summary,
+)
+
+# Batch Scoring (NumPy)
+from .scoring import (
+    ScoreArrays,
+    calculate_intensity_scores,
+    rank_by_domains,
+)
+
+# What-if Re-weighting
+from .whatif import (
+    WhatIfAnalyzer,
+    DomainView,
+    compare_domains,
+)
+
+# Feature Export
+from .features import (
+    FeatureExtractor,
+    FeatureMatrix,
+    extract_features,
+)
+
+# Lexicon Store
+from .lexicon import (
+    Lexicon,
+    LexiconStore,
+    default_lexicon,
+)
+
+# Near-duplicate Clustering
+from .dedup import (
+    NearDuplicateClusterer,
+    InsightCluster,
+    cluster_insights,
+    dedup_marts,
+)
+
+# Entity Normalization
+from .entities import (
+    EntityNormalizer,
+)
+
+# Regex Safety
+from .regex_safety import (
+    RegexSafety,
+    GuardedPattern,
+)
+from .profiler import RuleProfiler
+
+# Watch-folder Ingestion
+from .watcher import IngestService
+
+# HTTP Service
+from .server import PIVOTService, PIVOTServer
+
+# Mart Store
+from .store import MartStore, MartQuery
+
+# Mart Projection
+from .projection import (
+    InsightMartView,
+    insight_mart_json,
+    write_insight_marts,
+)
+
+# SQLite Repository
+from .repository import InsightRepository
+
+# Insight Search
+from .search import InsightIndex, SearchHit
+
+# Category Codes
+from .codes import InsightCodes, SymbolTable
+
+# Engine Pool
+from .pool import EnginePool
+
+# Concurrency Stress Test
+from .stress import run_scaling_benchmark, run_stress_test
+
+# Streaming Summary
+from .summary import SummaryBuilder
+
 __all__ = [
     # Version
     "__version__",
     # Morphology Engine
     "MorphologyAnalyzer",
     "MorphologyResult",
+    "MorphologyBatch",
     "VerbCategory",
     "Sentiment",
     "VerbInfo",
     "AdjectiveInfo",
     "AdverbInfo",
     "TailInfo",
+    "Mention",
     "infer_pivot_from_morphology",
     "calculate_intensity_score",
     "analyze_morphology",
     "get_verb_category",
     "get_adjective_sentiment",
     "get_degree_factor",
+    "MorphologyBackend",
+    "RuleBackend",
+    "LexicalMatches",
+    # Morphology Backends
+    "TokenizerBackend",
+    "FugashiBackend",
+    "SudachiBackend",
+    "get_morphology_backend",
     # PIVOT Classifier
     "PIVOTClassifier",
     "PIVOTInsight",
     "PIVOTClassificationResult",
+    "ClassificationBudget",
     "Utterance",
     "PIVOT",
     "BusinessDomain",
     "classify_utterances",
+    "aggregate_insights",
     "generate_pivot_insight_mart",
     "generate_pivot_summary_mart",
     "get_pivot_description",
@@ -115,4 +238,63 @@ __all__ = [
     "analyze_texts",
     "get_priority_insights",
     "get_urgent_items",
+    # Corpus Runner
+    "CorpusRunner",
+    "CorpusReport",
+    "collect_inputs",
+    "merge_summary",
+    # Batch Scoring (NumPy)
+    "ScoreArrays",
+    "calculate_intensity_scores",
+    "rank_by_domains",
+    # What-if Re-weighting
+    "WhatIfAnalyzer",
+    "DomainView",
+    "compare_domains",
+    # Feature Export
+    "FeatureExtractor",
+    "FeatureMatrix",
+    "extract_features",
+    # Lexicon Store
+    "Lexicon",
+    "LexiconStore",
+    "default_lexicon",
+    # Near-duplicate Clustering
+    "NearDuplicateClusterer",
+    "InsightCluster",
+    "cluster_insights",
+    "dedup_marts",
+    # Entity Normalization
+    "EntityNormalizer",
+    # Regex Safety
+    "RegexSafety",
+    "GuardedPattern",
+    "RuleProfiler",
+    # Watch-folder Ingestion
+    "IngestService",
+    # HTTP Service
+    "PIVOTService",
+    "PIVOTServer",
+    # Mart Store
+    "MartStore",
+    "MartQuery",
+    # Mart Projection
+    "InsightMartView",
+    "insight_mart_json",
+    "write_insight_marts",
+    # SQLite Repository
+    "InsightRepository",
+    # Insight Search
+    "InsightIndex",
+    "SearchHit",
+    # Category Codes
+    "InsightCodes",
+    "SymbolTable",
+    # Engine Pool
+    "EnginePool",
+    # Concurrency Stress Test
+    "run_stress_test",
+    "run_scaling_benchmark",
+    # Streaming Summary
+    "SummaryBuilder",
 ]
@@ -0,0 +1,42 @@
+"""
+PIVOT コマンドラインエントリポイント
+
+使用方法:
+    python -m nlp.python.pivot corpus <inputs...> -o <output_dir> [options]
+    python -m nlp.python.pivot watch <directory> -o <output_dir> [options]
+    python -m nlp.python.pivot serve [--port 8765] [--workers N]
+    python -m nlp.python.pivot mart {import,query,stats} <store> [options]
+    python -m nlp.python.pivot db {import,query,priority,urgent,stats} <db> [options]
+    python -m nlp.python.pivot search {add,query,stats} <index> [terms...] [options]
+    python -m nlp.python.pivot profile <inputs...> [--top N] [--safe]
+    python -m nlp.python.pivot stress <inputs...> [--threads N] [--bench 1,2,4,8,16,32]
+    python -m nlp.python.pivot summary <marts.jsonl...> --start <date> --end <date> [-o summary.json]
+"""
+
+import sys
+
+COMMANDS = {
+    "corpus": "nlp.python.pivot.corpus",
+    "watch": "nlp.python.pivot.watcher",
+    "serve": "nlp.python.pivot.server",
+    "mart": "nlp.python.pivot.store",
+    "db": "nlp.python.pivot.repository",
+    "search": "nlp.python.pivot.search",
+    "profile": "nlp.python.pivot.profiler",
+    "stress": "nlp.python.pivot.stress",
+    "summary": "nlp.python.pivot.summary",
+}
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+
+    module = __import__(COMMANDS[argv[0]], fromlist=["main"])
+    return module.main(argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
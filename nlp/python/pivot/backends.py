@@ -0,0 +1,353 @@
+"""
+Morphology Backends - 形態素解析器アダプタ
+
+MorphologyAnalyzer の品詞抽出を、ローカルにインストールされた
+形態素解析器で行うためのバックエンド群。
+
+- rule:    キーワード部分一致（既定、依存なし）
+- fugashi: MeCab (fugashi + unidic-lite / unidic / ipadic)
+- sudachi: SudachiPy (+ sudachidict_core 等)
+- auto:    利用可能な形態素解析器、なければ rule
+
+形態素解析器バックエンドの特徴:
+- 辞書（VERB_CATEGORY_DICT 等）の見出しを同じ解析器で原形列に変換し、
+  発話の原形列と最長一致で照合する（活用形・表記揺れに強い）
+- 「できない」の「できる」のように、直後に否定の助動詞が続く
+  単語見出しはマッチさせない（否定を含む見出しは別途マッチする）
+- 解析器インスタンスはスレッドごとに1つ生成して再利用する
+
+使用例:
+    from nlp.python.pivot import MorphologyAnalyzer
+
+    analyzer = MorphologyAnalyzer(backend="sudachi")
+    result = analyzer.analyze("システムが動かなくて業務ができない")
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .morphology import (
+    AdjectiveInfo,
+    AdverbInfo,
+    LexicalMatches,
+    Mention,
+    MorphologyBackend,
+    RuleBackend,
+    VerbInfo,
+    _longest_spans,
+    _resolve_lexicon,
+)
+
+
+# 否定の助動詞（原形）
+NEGATION_BASES = {"ない", "ぬ", "ん", "ず", "無い"}
+
+
+@dataclass
+class Token:
+    """形態素"""
+    surface: str
+    base: str   # 原形（正規化形）
+    pos: str    # 品詞大分類
+
+
+# 見出し → (原形列, 見出し)
+_Entry = Tuple[Tuple[str, ...], str]
+
+# 保持する辞書索引の数（辞書の差し替え直後は新旧の索引が併存する）
+_MAX_INDEXES = 4
+
+
+class TokenizerBackend(MorphologyBackend):
+    """形態素解析器バックエンドの基底クラス"""
+
+    name = "tokenizer"
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # 辞書の内容ハッシュ → 索引
+        self._indexes: Dict[str, Dict[str, Dict[str, List[_Entry]]]] = {}
+
+    # ----------------------------------------
+    # サブクラスで実装
+    # ----------------------------------------
+
+    def _create_tokenizer(self):
+        """解析器インスタンスを生成"""
+        raise NotImplementedError
+
+    def _tokenize_with(self, tokenizer, text: str) -> List[Token]:
+        """解析器でテキストを形態素に分割"""
+        raise NotImplementedError
+
+    # ----------------------------------------
+    # 共通処理
+    # ----------------------------------------
+
+    def tokenize(self, text: str) -> List[Token]:
+        """テキストを形態素に分割"""
+        return self._tokenize_with(self._tokenizer(), text)
+
+    def _tokenizer(self):
+        """スレッドごとの解析器インスタンス"""
+        tokenizer = getattr(self._local, "tokenizer", None)
+        if tokenizer is None:
+            tokenizer = self._create_tokenizer()
+            self._local.tokenizer = tokenizer
+        return tokenizer
+
+    def _lexicon_index(self, lexicon) -> Dict[str, Dict[str, List[_Entry]]]:
+        """辞書見出しを原形列に変換した索引（先頭原形 → 長い順の見出し）"""
+        index = self._indexes.get(lexicon.checksum)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(lexicon.checksum)
+                if index is None:
+                    tokenizer = self._tokenizer()
+                    index = {}
+                    for kind, words in (
+                        ("verb", list(lexicon.verb_to_category)),
+                        ("adjective", list(lexicon.adjective_to_sentiment)),
+                        ("adverb", list(dict.fromkeys([*lexicon.adverb_to_degree, *lexicon.adverb_to_frequency]))),
+                    ):
+                        index[kind] = self._compile_entries(tokenizer, kind, words)
+                    indexes = dict(self._indexes)
+                    while len(indexes) >= _MAX_INDEXES:
+                        indexes.pop(next(iter(indexes)))
+                    indexes[lexicon.checksum] = index
+                    self._indexes = indexes
+        return index
+
+    def _compile_entries(self, tokenizer, kind: str, words: List[str]) -> Dict[str, List[_Entry]]:
+        """見出しを原形列に変換"""
+        table: Dict[str, List[_Entry]] = {}
+        for word in words:
+            # 形容動詞の見出し「〜な」は語幹で照合（「面倒だ」「面倒です」にもマッチ）
+            key = word[:-1] if kind == "adjective" and word.endswith("な") and len(word) > 2 else word
+            bases = tuple(t.base for t in self._tokenize_with(tokenizer, key))
+            if bases:
+                table.setdefault(bases[0], []).append((bases, word))
+        for entries in table.values():
+            entries.sort(key=lambda e: len(e[0]), reverse=True)
+        return table
+
+    def extract_many(self, texts: List[str], lexicon=None) -> List[LexicalMatches]:
+        lexicon = _resolve_lexicon(lexicon)
+        index = self._lexicon_index(lexicon)
+        tokenizer = self._tokenizer()
+        return [
+            self._match(text, self._tokenize_with(tokenizer, text), index, lexicon)
+            for text in texts
+        ]
+
+    def _match(
+        self,
+        text: str,
+        tokens: List[Token],
+        index: Dict[str, Dict[str, List[_Entry]]],
+        lexicon,
+    ) -> LexicalMatches:
+        """原形列を辞書と最長一致で照合"""
+        bases = [t.base for t in tokens]
+        offsets = _token_offsets(text, tokens)
+        matches = LexicalMatches()
+        seen = {"verb": set(), "adjective": set(), "adverb": set()}
+        adverbs: Dict[str, AdverbInfo] = {}
+        mentions: Dict[Tuple[int, str], Mention] = {}
+
+        for kind in ("verb", "adjective", "adverb"):
+            table = index[kind]
+            i = 0
+            while i < len(bases):
+                hit = self._longest_match(bases, i, table.get(bases[i], ()))
+                if hit is None:
+                    i += 1
+                    continue
+                length, word = hit
+                i += length
+                start = offsets[i - length]
+                end = offsets[i - 1] + len(tokens[i - 1].surface)
+                surface = "".join(t.surface for t in tokens[i - length:i])
+                mentions.setdefault((start, word), Mention(word=word, surface=surface, start=start, end=end))
+                if word in seen[kind]:
+                    continue
+                seen[kind].add(word)
+
+                if kind == "verb":
+                    matches.verbs.append(VerbInfo(
+                        surface=surface,
+                        base=word,
+                        category=lexicon.verb_to_category[word],
+                        start=start,
+                    ))
+                elif kind == "adjective":
+                    matches.adjectives.append(AdjectiveInfo(
+                        surface=surface,
+                        sentiment=lexicon.adjective_to_sentiment[word],
+                        base=word,
+                        start=start,
+                    ))
+                else:
+                    adverbs[word] = AdverbInfo(
+                        surface=surface,
+                        degree_factor=lexicon.adverb_to_degree.get(word, 1.0),
+                        frequency_factor=lexicon.adverb_to_frequency.get(word, 1.0),
+                        base=word,
+                        start=start,
+                    )
+
+        matches.adverbs = list(adverbs.values())
+        matches.mentions = _longest_spans(list(mentions.values()))
+        return matches
+
+    def _longest_match(
+        self,
+        bases: List[str],
+        start: int,
+        entries,
+    ) -> Optional[Tuple[int, str]]:
+        """位置 start から始まる最長の見出しを返す"""
+        for entry_bases, word in entries:
+            end = start + len(entry_bases)
+            if tuple(bases[start:end]) != entry_bases:
+                continue
+            # 否定を含まない見出しの直後に否定が続く場合は不一致
+            if (end < len(bases) and bases[end] in NEGATION_BASES
+                    and not NEGATION_BASES.intersection(entry_bases)):
+                continue
+            return len(entry_bases), word
+        return None
+
+
+def _token_offsets(text: str, tokens: List[Token]) -> List[int]:
+    """形態素の開始文字位置（解析器が読み飛ばした空白等を考慮して本文から探す）"""
+    offsets = []
+    position = 0
+    for token in tokens:
+        found = text.find(token.surface, position)
+        if found >= 0:
+            position = found
+        offsets.append(position)
+        position += len(token.surface)
+    return offsets
+
+
+class FugashiBackend(TokenizerBackend):
+    """MeCab (fugashi) バックエンド"""
+
+    name = "fugashi"
+
+    def __init__(self, tagger_args: str = ""):
+        """
+        Args:
+            tagger_args: fugashi.Tagger に渡す引数（辞書指定等）
+        """
+        import fugashi  # noqa: F401 - インストール確認
+        super().__init__()
+        self.tagger_args = tagger_args
+
+    def _create_tokenizer(self):
+        import fugashi
+        return fugashi.Tagger(self.tagger_args)
+
+    def _tokenize_with(self, tokenizer, text: str) -> List[Token]:
+        tokens = []
+        for word in tokenizer(text):
+            feature = word.feature
+            # UniDic は lemma、IPADIC は 7番目の要素が原形
+            base = getattr(feature, "lemma", None)
+            if base is None and len(feature) > 6:
+                base = feature[6]
+            if not base or base == "*":
+                base = word.surface
+            pos = getattr(feature, "pos1", None) or feature[0]
+            tokens.append(Token(surface=word.surface, base=base, pos=pos))
+        return tokens
+
+
+class SudachiBackend(TokenizerBackend):
+    """SudachiPy バックエンド"""
+
+    name = "sudachi"
+
+    def __init__(self, split_mode: str = "C", dict_type: Optional[str] = None):
+        """
+        Args:
+            split_mode: 分割単位 (A / B / C)
+            dict_type: 辞書 (core / small / full、None=既定)
+        """
+        import sudachipy  # noqa: F401 - インストール確認
+        super().__init__()
+        self.split_mode = split_mode
+        self.dict_type = dict_type
+
+    def _create_tokenizer(self):
+        from sudachipy import Dictionary, SplitMode
+        dictionary = Dictionary(dict=self.dict_type) if self.dict_type else Dictionary()
+        mode = getattr(SplitMode, self.split_mode)
+        # SudachiPy 0.7 以降は tokenizer()、それ以前は create()
+        create = getattr(dictionary, "tokenizer", None) or dictionary.create
+        return create(mode=mode)
+
+    def _tokenize_with(self, tokenizer, text: str) -> List[Token]:
+        return [
+            Token(surface=m.surface(), base=m.normalized_form(), pos=m.part_of_speech()[0])
+            for m in tokenizer.tokenize(text)
+        ]
+
+
+# ========================================
+# バックエンド取得
+# ========================================
+
+BACKENDS = {
+    "rule": RuleBackend,
+    "fugashi": FugashiBackend,
+    "mecab": FugashiBackend,
+    "sudachi": SudachiBackend,
+}
+
+# プロセス内で共有するインスタンス（辞書索引・解析器を再利用）
+_shared: Dict[str, MorphologyBackend] = {}
+_shared_lock = threading.Lock()
+
+
+def get_backend(name: str = "rule") -> MorphologyBackend:
+    """
+    名前からバックエンドを取得（プロセス内で共有）
+
+    Args:
+        name: "rule" / "fugashi" ("mecab") / "sudachi" / "auto"
+              （auto は解析器を実際に生成できた最初のもの、なければ rule）
+
+    Returns:
+        MorphologyBackend: バックエンド
+
+    Raises:
+        ValueError: 未知の名前
+        ImportError: 形態素解析器が未インストール
+    """
+    if name == "auto":
+        for candidate in ("sudachi", "fugashi"):
+            try:
+                backend = get_backend(candidate)
+                # 辞書パッケージがない等、解析器を生成できない場合も次の候補へ
+                backend._tokenizer()
+            except Exception:  # noqa: BLE001 - 解析器ごとに例外の型が異なる
+                continue
+            return backend
+        return get_backend("rule")
+
+    if name not in BACKENDS:
+        raise ValueError(f"未知の品詞抽出バックエンド: {name}")
+    if name == "mecab":
+        name = "fugashi"
+
+    with _shared_lock:
+        backend = _shared.get(name)
+        if backend is None:
+            backend = BACKENDS[name]()
+            _shared[name] = backend
+    return backend
@@ -20,9 +20,12 @@ PIVOTフレームワーク:
 """
 
 import re
+import threading
+import time
 import uuid
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import List, Dict, Optional, Sequence, Tuple
 from datetime import datetime
 
 # 品詞分解エンジン
@@ -34,6 +37,8 @@ from .morphology import (
     VerbCategory,
     Sentiment,
 )
+from .lexicon import Lexicon, LexiconStore, default_lexicon
+from .regex_safety import RegexSafety, reset_limited, was_limited
 
 
 # ========================================
@@ -74,6 +79,11 @@ class PIVOTInsight:
     degree_factor: float = 1.0    # 副詞による程度係数
     certainty: float = 1.0        # 語尾による確信度
     reasoning: str = ""           # 分類理由
+    lexicon_version: str = ""     # 分類に使用した辞書の version_id
+    # 正規化前の対象軸（抽出時の表記）
+    layer_surfaces: Dict[str, Optional[str]] = field(default_factory=dict)
+    # 処理予算の超過により省略した処理（DEGRADATIONS のキー、空=通常処理）
+    degraded: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -87,6 +97,120 @@ class PIVOTClassificationResult:
     sentiment_index: float
     stats: Dict
 
+    @property
+    def codes(self) -> "InsightCodes":
+        """items のカテゴリを整数コード化した配列（items を置き換えるまで再利用）"""
+        from .codes import InsightCodes
+
+        cached = self.__dict__.get("_codes")
+        if cached is None or cached[0] is not self.items:
+            cached = self.__dict__["_codes"] = (self.items, InsightCodes.from_insights(self.items))
+        return cached[1]
+
+
+# スレッドプールで分類する際に1スレッドへ割り当てる発話数
+THREAD_CHUNK_SIZE = 64
+
+
+# 縮退処理の種類 → 分類理由に付記するラベル
+DEGRADATIONS = {
+    "truncated": "一部のみ解析",
+    "no_morphology": "品詞分解省略",
+    "keyword_only": "キーワードのみ",
+    "below_threshold": "信頼度が閾値未満",
+}
+# degraded・reasoning での並び順
+_DEGRADATION_ORDER = list(DEGRADATIONS)
+
+
+@dataclass
+class ClassificationBudget:
+    """
+    分類の処理予算（None=制限なし）
+
+    予算を超えた発話は破棄せず、安価な処理に切り替えて分類する:
+        - 文字数が max_chars を超える     → 先頭と末尾の計 max_chars 文字のみを解析
+                                            （文末表現を残す。本文は全文を保持）
+        - 正規表現の安全モードで照合範囲を制限した → truncated として記録
+        - 文字数が morphology_max_chars を超える → 品詞分解を省略
+        - 文字数が pattern_max_chars を超える    → 正規表現を使わずキーワードのみで判定
+        - 品詞分解・Voice判定・対象軸抽出の各段階の前に、経過時間と段階の予測所要時間
+          （文字数 × 直近の長い発話での1文字あたりの時間）の合計が utterance_seconds を超える
+                                          → 品詞分解は省略、Voice判定・対象軸抽出はキーワードのみ
+        - バッチの経過時間が batch_seconds を超えた
+                                          → 残りの発話を品詞分解なし・キーワードのみで処理
+    縮退した処理は PIVOTInsight.degraded と reasoning、集計の stats["degraded"] に記録する。
+    縮退した発話の信頼度が min_confidence に届かない場合も破棄せず、
+    below_threshold を付けて残す（閾値未満は縮退による精度低下の可能性があるため）。
+    """
+    max_chars: Optional[int] = None
+    morphology_max_chars: Optional[int] = None
+    pattern_max_chars: Optional[int] = None
+    utterance_seconds: Optional[float] = None
+    batch_seconds: Optional[float] = None
+
+    def plan(self, length: int, batch_exceeded: bool = False) -> List[str]:
+        """
+        発話の文字数とバッチの状況から、事前に決まる縮退処理を返す
+
+        Args:
+            length: 発話の文字数
+            batch_exceeded: バッチの時間予算を超過しているか
+
+        Returns:
+            List[str]: 縮退処理（DEGRADATIONS のキー）
+        """
+        degraded = []
+        if self.max_chars is not None and length > self.max_chars:
+            degraded.append("truncated")
+            length = self.max_chars
+        if batch_exceeded or (self.morphology_max_chars is not None and length > self.morphology_max_chars):
+            degraded.append("no_morphology")
+        if batch_exceeded or (self.pattern_max_chars is not None and length > self.pattern_max_chars):
+            degraded.append("keyword_only")
+        return degraded
+
+    def clip(self, text: str) -> str:
+        """解析対象を先頭と末尾の計 max_chars 文字に切り詰める（間は句点で区切る）"""
+        if self.max_chars is None or len(text) <= self.max_chars:
+            return text
+        head = self.max_chars // 2
+        return text[:head] + "。" + text[len(text) - (self.max_chars - head):]
+
+
+# 処理段階の1文字あたりの時間を記録する発話の最小文字数（短い発話は固定費が支配的なため除く）
+STAGE_COST_MIN_CHARS = 200
+
+
+class _StageCosts:
+    """
+    処理段階ごとの1文字あたりの所要時間（指数移動平均）
+
+    発話の時間予算で、段階を実行する前に所要時間を予測するために使う。
+    複数スレッドから更新されるが、値は推定値のため競合しても問題ない。
+    """
+
+    ALPHA = 0.2
+
+    def __init__(self):
+        self.seconds_per_char: Dict[str, float] = {}
+
+    def record(self, stage: str, chars: int, seconds: float) -> None:
+        if chars < STAGE_COST_MIN_CHARS:
+            return
+        rate = seconds / chars
+        previous = self.seconds_per_char.get(stage)
+        self.seconds_per_char[stage] = rate if previous is None else previous + self.ALPHA * (rate - previous)
+
+    def predict(self, stage: str, chars: int) -> float:
+        return self.seconds_per_char.get(stage, 0.0) * chars
+
+
+def _with_degradations(reasoning: str, degraded: List[str]) -> str:
+    """分類理由に縮退処理のラベルを付記"""
+    labels = ", ".join(DEGRADATIONS[kind] for kind in degraded)
+    return f"{reasoning} [縮退: {labels}]"
+
 
 # ========================================
 # PIVOT定義
@@ -366,22 +490,57 @@ class PIVOTClassifier:
         domain: Optional[str] = None,
         min_confidence: float = 0.3,
         use_morphology: bool = True,
+        morphology_backend=None,
+        lexicon=None,
+        normalize_entities: bool = False,
+        regex_safety=None,
+        budget: Optional[ClassificationBudget] = None,
+        short_circuit: bool = True,
+        rule_order: Optional[Dict[str, Sequence[int]]] = None,
     ):
         """
         Args:
             domain: 業務ドメイン（重み付けに使用）
             min_confidence: 最小信頼度閾値
             use_morphology: 品詞分解エンジンを使用するか
+            morphology_backend: 品詞抽出バックエンド（None=ルールベース、
+                                "fugashi" / "sudachi" / "auto" または MorphologyBackend）
+            lexicon: 辞書（None=組み込み辞書、Lexicon、辞書ファイルのパス、
+                     または LexiconStore。ストア指定時は差し替えに追従する）
+            normalize_entities: 対象軸の抽出値を正規名に変換するか
+                                （"Excelでの工程管理" → "工程管理" 等。有効にすると
+                                target_layers・by_process・by_tool のキーが変わる）
+            regex_safety: 正規表現の安全モード（True=既定設定、RegexSafety、None=無効）。
+                          高コストなパターンを re2 または入力長の制限で実行する
+            budget: 発話・バッチごとの処理予算（None=制限なし）
+            short_circuit: キーワード/パターン判定で、最高スコアのVoiceが確定した時点で
+                           残りのパターンの実行を省略するか（結果は全件実行と同一）
+            rule_order: Voice別のパターンを試す順序（パターン番号の列、
+                        RuleProfiler.pivot_pattern_order() の結果。None=定義順）
         """
         self.domain = domain
         self.min_confidence = min_confidence
         self.use_morphology = use_morphology
-
-        # 品詞分解エンジン
-        if self.use_morphology:
-            self.morphology_analyzer = MorphologyAnalyzer()
-        else:
-            self.morphology_analyzer = None
+        self.morphology_backend = morphology_backend
+        self.normalize_entities = normalize_entities
+        self.regex_safety: Optional[RegexSafety] = RegexSafety() if regex_safety is True else (regex_safety or None)
+        self.budget = budget
+        self._stage_costs = _StageCosts()
+        self.short_circuit = short_circuit
+        self.rule_order: Dict[str, Tuple[int, ...]] = {}
+        for pivot, order in (rule_order or {}).items():
+            order = tuple(order)
+            if pivot not in PIVOT.ALL or sorted(order) != list(range(len(order))):
+                raise ValueError(f"rule_order が不正です（Voice={pivot}）: パターン番号の並べ替えを指定してください")
+            self.rule_order[pivot] = order
+
+        # 辞書（ストア指定時はバッチ開始ごとに現在の辞書を取得）
+        if isinstance(lexicon, str):
+            lexicon = LexiconStore(lexicon)
+        self.lexicon_store: Optional[LexiconStore] = lexicon if isinstance(lexicon, LexiconStore) else None
+        self._fixed_lexicon: Lexicon = default_lexicon() if lexicon is None or self.lexicon_store else lexicon
+        self._active: Optional[Tuple[Lexicon, Optional[MorphologyAnalyzer]]] = None
+        self._rules_lock = threading.Lock()
 
         # ドメイン別重みを取得
         self.weights = DOMAIN_PIVOT_WEIGHTS.get(
@@ -389,139 +548,327 @@ class PIVOTClassifier:
             {p: 1.0 for p in PIVOT.ALL}
         )
 
-        # パターンをコンパイル
-        self._compile_patterns()
-
-    def _compile_patterns(self):
-        """正規表現パターンをコンパイル"""
-        self.pivot_patterns = {}
-        for pivot, config in PIVOT_KEYWORDS.items():
-            self.pivot_patterns[pivot] = [
-                re.compile(p) for p in config.get("patterns", [])
-            ]
-
-        self.layer_patterns = {}
-        for layer, config in LAYER_PATTERNS.items():
-            self.layer_patterns[layer] = {
-                "patterns": [re.compile(p) for p in config.get("patterns", [])],
-                "extraction": [re.compile(p) for p in config.get("extraction_patterns", [])],
-            }
+        # 辞書に対応する品詞分解エンジンを準備
+        self._rules()
+
+    def _rules(self) -> Tuple[Lexicon, Optional[MorphologyAnalyzer]]:
+        """現在の辞書と、それに対応する品詞分解エンジン"""
+        lexicon = self.lexicon_store.current if self.lexicon_store else self._fixed_lexicon
+        lexicon = lexicon.guarded(self.regex_safety)
+        active = self._active
+        if active is None or active[0] is not lexicon:
+            with self._rules_lock:
+                active = self._active
+                if active is None or active[0] is not lexicon:
+                    analyzer = None
+                    if self.use_morphology:
+                        analyzer = MorphologyAnalyzer(backend=self.morphology_backend, lexicon=lexicon)
+                    # 参照の差し替えのみで更新（処理中のバッチは取得済みの組を使い続ける）
+                    active = (lexicon, analyzer)
+                    self._active = active
+        return active
+
+    @property
+    def lexicon(self) -> Lexicon:
+        """現在の辞書"""
+        return self._rules()[0]
+
+    @property
+    def morphology_analyzer(self) -> Optional[MorphologyAnalyzer]:
+        """現在の辞書に対応する品詞分解エンジン"""
+        return self._rules()[1]
+
+    @property
+    def pivot_patterns(self) -> Dict[str, List[re.Pattern]]:
+        """Voice別のコンパイル済みパターン"""
+        return self.lexicon.compiled_pivot_patterns
+
+    @property
+    def layer_patterns(self) -> Dict[str, Dict[str, List]]:
+        """対象軸別のコンパイル済みパターン"""
+        return self.lexicon.compiled_layer_patterns
 
     def classify(
         self,
         utterances: List[Utterance],
+        budget: Optional[ClassificationBudget] = None,
+        workers: Optional[int] = None,
     ) -> PIVOTClassificationResult:
         """
         発話リストをPIVOT分類
 
         Args:
             utterances: 入力発話リスト
+            budget: 処理予算（None=コンストラクタの設定）
+            workers: 並行して分類するスレッド数（None=呼び出し元のスレッドのみ）
 
         Returns:
             PIVOTClassificationResult: 分類結果
         """
-        items: List[PIVOTInsight] = []
-        by_pivot: Dict[str, List[PIVOTInsight]] = {p: [] for p in PIVOT.ALL}
-        by_process: Dict[str, Dict[str, int]] = {}
-        by_tool: Dict[str, Dict[str, int]] = {}
+        return self.aggregate(self.classify_items(utterances, budget, workers))
+
+    def classify_items(
+        self,
+        utterances: List[Utterance],
+        budget: Optional[ClassificationBudget] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = THREAD_CHUNK_SIZE,
+    ) -> List[PIVOTInsight]:
+        """
+        発話リストを分類し、閾値を満たすインサイトを発話順で返す（集計なし）
+
+        分類器は呼び出しごとの状態を持たないため、同じインスタンスを複数スレッドから
+        同時に呼び出せる。workers を指定すると発話を chunk_size 件ごとに分け、
+        スレッドプールで並行して分類する（結果は逐次処理と同一、発話順）。
+        GIL のあるビルドでは並行処理の効果は小さく、フリースレッド版の CPython で
+        スレッド数に応じて高速化する。
+
+        Args:
+            utterances: 入力発話リスト
+            budget: 処理予算（None=コンストラクタの設定）
+            workers: 並行して分類するスレッド数（None / 1=呼び出し元のスレッドのみ）
+            chunk_size: スレッドに割り当てる発話の単位
+
+        Returns:
+            List[PIVOTInsight]: 分類済みインサイト（発話順）
+        """
+        budget = budget or self.budget
+        deadline = None
+        if budget is not None and budget.batch_seconds is not None:
+            deadline = time.perf_counter() + budget.batch_seconds
+
+        # バッチ内は開始時点の辞書で統一する（全スレッドで同じ組を使う）
+        rules = self._rules()
+        if workers is None or workers <= 1 or len(utterances) <= chunk_size:
+            return self._classify_chunk(utterances, rules, budget, deadline)
+
+        chunks = [utterances[i:i + chunk_size] for i in range(0, len(utterances), chunk_size)]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pivot-classify") as executor:
+            parts = list(executor.map(
+                lambda chunk: self._classify_chunk(chunk, rules, budget, deadline), chunks
+            ))
+        return [item for part in parts for item in part]
+
+    def _classify_chunk(
+        self,
+        utterances: List[Utterance],
+        rules: Tuple[Lexicon, Optional[MorphologyAnalyzer]],
+        budget: Optional[ClassificationBudget],
+        deadline: Optional[float],
+    ) -> List[PIVOTInsight]:
+        """発話を順に分類し、閾値を満たすインサイトを返す"""
+        # 処理予算がなければ品詞分解をまとめて行う（予算ありは発話ごとに時間を計り、
+        # 安全モードは照合範囲の制限を発話ごとに記録するため逐次）
+        morphology: List[Optional[MorphologyResult]] = [None] * len(utterances)
+        morphology_analyzer = rules[1]
+        if budget is None and self.regex_safety is None and self.use_morphology and morphology_analyzer:
+            targets = [i for i, u in enumerate(utterances) if u.text and u.text.strip()]
+            batch = morphology_analyzer.analyze_many([utterances[i].text for i in targets])
+            for i, result in zip(targets, batch):
+                morphology[i] = result
 
-        for utterance in utterances:
-            classified = self._classify_single(utterance)
-            if classified and classified.confidence >= self.min_confidence:
+        items: List[PIVOTInsight] = []
+        for utterance, morphology_result in zip(utterances, morphology):
+            batch_exceeded = deadline is not None and time.perf_counter() > deadline
+            classified = self._classify_single(
+                utterance, rules, budget, batch_exceeded, morphology_result
+            )
+            if classified and self.accepts(classified, self.min_confidence):
+                if classified.confidence < self.min_confidence:
+                    classified = self.mark_below_threshold(classified)
                 items.append(classified)
-                by_pivot[classified.pivot_voice].append(classified)
 
-                # Process/Tool別集計
-                process = classified.target_layers.get("process")
-                tool = classified.target_layers.get("tool")
+        return items
+
+    @staticmethod
+    def accepts(item: PIVOTInsight, min_confidence: float) -> bool:
+        """
+        インサイトを結果に含めるか判定（item は変更しない）
+
+        縮退したインサイトは閾値未満でも破棄しない。結果に含める際は
+        mark_below_threshold で below_threshold を付ける。
+
+        Args:
+            item: 分類済みインサイト
+            min_confidence: 最小信頼度
+
+        Returns:
+            bool: 結果に含めるか
+        """
+        return item.confidence >= min_confidence or bool(item.degraded)
+
+    @staticmethod
+    def mark_below_threshold(item: PIVOTInsight) -> PIVOTInsight:
+        """閾値未満で残す縮退インサイトに below_threshold を付けた複製を返す"""
+        if "below_threshold" in item.degraded:
+            return item
+        degraded = item.degraded + ["below_threshold"]
+        return replace(
+            item,
+            degraded=degraded,
+            reasoning=_with_degradations(item.reasoning.split(" [縮退: ")[0], degraded),
+        )
+
+    def aggregate(
+        self,
+        items: List[PIVOTInsight],
+    ) -> PIVOTClassificationResult:
+        """
+        分類済みインサイトをこの分類器のドメイン重みで集計（aggregate_insights）
+
+        Args:
+            items: PIVOT分類済みインサイト（閾値適用済み・発話順）
 
-                if process:
-                    if process not in by_process:
-                        by_process[process] = {p: 0 for p in PIVOT.ALL}
-                    by_process[process][classified.pivot_voice] += 1
+        Returns:
+            PIVOTClassificationResult: 集計結果
+        """
+        return aggregate_insights(items, self.domain, self.weights)
 
-                if tool:
-                    if tool not in by_tool:
-                        by_tool[tool] = {p: 0 for p in PIVOT.ALL}
-                    by_tool[tool][classified.pivot_voice] += 1
+    def patch(
+        self,
+        result: PIVOTClassificationResult,
+        items: List[PIVOTInsight],
+        removed: List[PIVOTInsight],
+        added: List[PIVOTInsight],
+    ) -> PIVOTClassificationResult:
+        """
+        集計済みの結果を差分で更新（result を更新して返す）
 
-        # ドメイン重みを適用してソート
-        items = self._apply_domain_weights(items)
+        Process/Tool別の件数と合計スコアは削除・追加分だけを加減算する。
+        Voice別リストと並び順は items から組み直す（aggregate と同じ順序になる）。
 
-        # スコア算出
-        total_score = sum(item.pivot_score for item in items)
-        sentiment_index = total_score / len(items) if items else 0.0
+        Args:
+            result: 更新する集計結果
+            items: 更新後の全インサイト（閾値適用済み・発話順）
+            removed: 集計から除くインサイト
+            added: 集計に加えるインサイト
+
+        Returns:
+            PIVOTClassificationResult: 更新した result
+        """
+        for sign, group in ((-1, removed), (1, added)):
+            for item in group:
+                for counts, key in (
+                    (result.by_process, item.target_layers.get("process")),
+                    (result.by_tool, item.target_layers.get("tool")),
+                ):
+                    if not key:
+                        continue
+                    row = counts.setdefault(key, {p: 0 for p in PIVOT.ALL})
+                    row[item.pivot_voice] += sign
+                    if not any(row.values()):
+                        del counts[key]
+                result.total_score += sign * item.pivot_score
 
-        # 統計情報
-        stats = {
+        by_pivot: Dict[str, List[PIVOTInsight]] = {p: [] for p in PIVOT.ALL}
+        for item in items:
+            by_pivot[item.pivot_voice].append(item)
+        result.by_pivot = by_pivot
+        result.items = self._apply_domain_weights(items)
+        result.sentiment_index = result.total_score / len(items) if items else 0.0
+        result.stats.update({
             "total": len(items),
             "by_pivot": {p: len(lst) for p, lst in by_pivot.items()},
             "domain": self.domain,
-            "total_score": total_score,
-            "sentiment_index": sentiment_index,
-        }
-
-        return PIVOTClassificationResult(
-            items=items,
-            by_pivot=by_pivot,
-            by_process=by_process,
-            by_tool=by_tool,
-            total_score=total_score,
-            sentiment_index=sentiment_index,
-            stats=stats,
-        )
+            "total_score": result.total_score,
+            "sentiment_index": result.sentiment_index,
+            "lexicon_versions": list(dict.fromkeys(item.lexicon_version for item in items)),
+            "degraded": _degraded_counts(items),
+        })
+        return result
+
+    def _classify_single(
+        self,
+        utterance: Utterance,
+        rules: Optional[Tuple[Lexicon, Optional[MorphologyAnalyzer]]] = None,
+        budget: Optional[ClassificationBudget] = None,
+        batch_exceeded: bool = False,
+        morphology_result: Optional[MorphologyResult] = None,
+    ) -> Optional[PIVOTInsight]:
+        """
+        単一発話をPIVOT分類
 
-    def _classify_single(self, utterance: Utterance) -> Optional[PIVOTInsight]:
-        """単一発話をPIVOT分類"""
+        Args:
+            utterance: 発話
+            rules: 使用する辞書と品詞分解エンジン（None=現在の辞書）
+            budget: 処理予算（None=制限なし）
+            batch_exceeded: バッチの時間予算を超過しているか
+            morphology_result: 一括解析済みの品詞分解結果（None=この発話で解析）
+        """
         text = utterance.text or ""
         if not text.strip():
             return None
-
-        # 品詞分解による強化分類
-        morphology_result = None
+        lexicon, morphology_analyzer = rules or self._rules()
+        if self.regex_safety is not None:
+            reset_limited()
+
+        # 処理予算（文字数・バッチ時間で事前に決まる縮退）
+        degraded: List[str] = []
+        analyzed = text
+        started = 0.0
+        if budget is not None:
+            started = time.perf_counter()
+            degraded = budget.plan(len(text), batch_exceeded)
+            if "truncated" in degraded:
+                analyzed = budget.clip(text)
+
+        # 品詞分解による強化分類（時間予算を超えると予測される場合は省略）
         degree_factor = 1.0
         certainty = 1.0
-        reasoning = ""
 
-        if self.use_morphology and self.morphology_analyzer:
-            morphology_result = self.morphology_analyzer.analyze(text)
+        use_morphology = bool(self.use_morphology and morphology_analyzer and "no_morphology" not in degraded)
+        if use_morphology and morphology_result is None:
+            if self._over_budget(budget, started, "morphology", len(analyzed)):
+                degraded.append("no_morphology")
+                use_morphology = False
+        if use_morphology:
+            if morphology_result is None:
+                stage_started = time.perf_counter()
+                morphology_result = morphology_analyzer.analyze(analyzed)
+                self._record_stage(budget, "morphology", len(analyzed), stage_started)
             degree_factor = morphology_result.degree_factor
             certainty = morphology_result.certainty
-
-            # 品詞分解によるPIVOT推定を試みる
-            morph_pivot, morph_conf, morph_reason = infer_pivot_from_morphology(morphology_result)
-            if morph_pivot and morph_conf >= 0.6:
-                # 品詞分解による分類が高確信度の場合、それを採用
-                pivot_voice = morph_pivot
-                confidence = morph_conf
-                matched_keywords = [v.surface for v in morphology_result.verbs]
-                matched_keywords += [a.surface for a in morphology_result.adjectives]
-                matched_patterns = [morph_reason]
-                reasoning = morph_reason
-            else:
-                # フォールバック: キーワード/パターンベース分類
-                pivot_result = self._classify_pivot(text)
-                if not pivot_result:
-                    return None
-                pivot_voice, confidence, matched_keywords, matched_patterns = pivot_result
-                reasoning = "キーワード/パターンベース"
         else:
-            # 品詞分解なし: キーワード/パターンベース分類のみ
-            pivot_result = self._classify_pivot(text)
-            if not pivot_result:
-                return None
-            pivot_voice, confidence, matched_keywords, matched_patterns = pivot_result
-            reasoning = "キーワード/パターンベース"
-
-        # 対象軸（Layer）抽出
-        target_layers = self._extract_layers(text)
+            morphology_result = None
+
+        # キーワードのみの場合は事前にスコアを算出（通常は品詞分解で決まらない場合のみ算出）
+        if "keyword_only" not in degraded and self._over_budget(budget, started, "voice", len(analyzed)):
+            degraded.append("keyword_only")
+        pivot_scores = None
+        if "keyword_only" in degraded:
+            pivot_scores = self._score_pivots(analyzed, lexicon, use_patterns=False)
+        stage_started = time.perf_counter() if budget is not None else 0.0
+        decision = self._decide_voice(analyzed, morphology_result, pivot_scores, lexicon)
+        if not decision:
+            return None
+        pivot_voice, confidence, matched_keywords, matched_patterns, reasoning = decision
+        if "keyword_only" not in degraded:
+            self._record_stage(budget, "voice", len(analyzed), stage_started)
+
+        # 対象軸（Layer）抽出・正規化
+        if "keyword_only" not in degraded and self._over_budget(budget, started, "layers", len(analyzed)):
+            degraded.append("keyword_only")
+        stage_started = time.perf_counter() if budget is not None else 0.0
+        layer_surfaces = self._extract_layers(analyzed, lexicon, "keyword_only" not in degraded)
+        if "keyword_only" not in degraded:
+            self._record_stage(budget, "layers", len(analyzed), stage_started)
+        target_layers = layer_surfaces
+        if self.normalize_entities:
+            target_layers = lexicon.entity_normalizer.normalize_layers(layer_surfaces)
 
         # 温度感判定
-        temperature = self._detect_temperature(text)
+        temperature = self._detect_temperature(analyzed, lexicon)
+
+        # 安全モードで照合範囲を制限した場合も縮退として記録
+        if self.regex_safety is not None and was_limited() and "truncated" not in degraded:
+            degraded.append("truncated")
+        if degraded:
+            degraded.sort(key=_DEGRADATION_ORDER.index)
+            reasoning = _with_degradations(reasoning, degraded)
 
         # 強度スコア算出
         base_score = PIVOT.SCORES[pivot_voice]
-        intensity_score = base_score * degree_factor * certainty
+        intensity_score = calculate_intensity_score(base_score, degree_factor, certainty)
 
         return PIVOTInsight(
             id=str(uuid.uuid4()),
@@ -540,19 +887,179 @@ class PIVOTClassifier:
             degree_factor=degree_factor,
             certainty=certainty,
             reasoning=reasoning,
+            lexicon_version=lexicon.version_id,
+            layer_surfaces=layer_surfaces,
+            degraded=degraded,
         )
 
+    def _over_budget(
+        self,
+        budget: Optional[ClassificationBudget],
+        started: float,
+        stage: str,
+        chars: int,
+    ) -> bool:
+        """経過時間と段階の予測所要時間の合計が発話の時間予算を超えるか"""
+        if budget is None or budget.utterance_seconds is None:
+            return False
+        elapsed = time.perf_counter() - started
+        return elapsed + self._stage_costs.predict(stage, chars) > budget.utterance_seconds
+
+    def _record_stage(
+        self,
+        budget: Optional[ClassificationBudget],
+        stage: str,
+        chars: int,
+        stage_started: float,
+    ) -> None:
+        """段階の所要時間を記録（発話の時間予算がある場合のみ）"""
+        if budget is not None and budget.utterance_seconds is not None:
+            self._stage_costs.record(stage, chars, time.perf_counter() - stage_started)
+
+    def _decide_voice(
+        self,
+        text: str,
+        morphology_result: Optional[MorphologyResult],
+        pivot_scores: Optional[Dict[str, Tuple[float, List[str], List[str]]]] = None,
+        lexicon: Optional[Lexicon] = None,
+    ) -> Optional[Tuple[str, float, List[str], List[str], str]]:
+        """
+        Voiceを決定
+
+        Args:
+            text: 発話テキスト
+            morphology_result: 品詞分解結果（None=品詞分解なし）
+            pivot_scores: 算出済みの _score_pivots 結果（None=必要時に算出）
+            lexicon: 使用する辞書（None=現在の辞書）
+
+        Returns:
+            (pivot_voice, confidence, matched_keywords, matched_patterns, reasoning)
+        """
+        if morphology_result is not None:
+            # 品詞分解によるPIVOT推定を試みる
+            morph_pivot, morph_conf, morph_reason = infer_pivot_from_morphology(morphology_result)
+            if morph_pivot and morph_conf >= 0.6:
+                # 品詞分解による分類が高確信度の場合、それを採用
+                matched_keywords = [v.surface for v in morphology_result.verbs]
+                matched_keywords += [a.surface for a in morphology_result.adjectives]
+                return morph_pivot, morph_conf, matched_keywords, [morph_reason], morph_reason
+
+        # フォールバック: キーワード/パターンベース分類
+        if pivot_scores is not None:
+            pivot_result = self._best_pivot(pivot_scores)
+        elif self.short_circuit:
+            pivot_result = self._best_pivot_lazy(text, lexicon or self.lexicon)
+        else:
+            pivot_result = self._best_pivot(self._score_pivots(text, lexicon))
+        if not pivot_result:
+            return None
+        pivot_voice, confidence, matched_keywords, matched_patterns = pivot_result
+        return pivot_voice, confidence, matched_keywords, matched_patterns, "キーワード/パターンベース"
+
     def _classify_pivot(
         self,
         text: str,
     ) -> Optional[Tuple[str, float, List[str], List[str]]]:
         """PIVOT Voice分類"""
+        return self._best_pivot(self._score_pivots(text))
+
+    def _best_pivot(
+        self,
+        scores: Dict[str, Tuple[float, List[str], List[str]]],
+    ) -> Optional[Tuple[str, float, List[str], List[str]]]:
+        """最高スコアのVoiceを選択"""
+        if not scores:
+            return None
+
+        best_pivot = max(scores.keys(), key=lambda p: scores[p][0])
+        confidence, matched_keywords, matched_patterns = scores[best_pivot]
+
+        return best_pivot, confidence, matched_keywords, matched_patterns
+
+    def _best_pivot_lazy(
+        self,
+        text: str,
+        lexicon: Lexicon,
+    ) -> Optional[Tuple[str, float, List[str], List[str]]]:
+        """
+        _best_pivot(_score_pivots(text)) と同じ結果を、必要なパターンだけ実行して求める
+
+        スコアはキーワード分（最大0.6）＋パターン分（0.3×一致数、最大0.6）で、
+        キーワードの照合は安価なため先に全Voiceについて行い、パターン分を
+        満点とした上限値の高い順にVoiceを評価する。パターンは rule_order の順に試し
+        （必須リテラル compiled_pivot_literals が本文になければ実行せず不一致とする）、
+        一致数が2に達する（それ以上スコアが上がらない）か、残りが全て一致しても
+        暫定の最高スコアに届かなくなった時点で打ち切る。
+        最後に選ばれたVoiceのみ残りのパターンを実行し、一致したパターンを定義順で返す。
+        同点は PIVOT.ALL の順で先のVoiceを優先する（max と同じ）。
+        """
+        candidates = []
+        for rank, pivot in enumerate(PIVOT.ALL):
+            matched_kw = [kw for kw in lexicon.pivot_keywords[pivot]["keywords"] if kw in text]
+            kw_score = min(len(matched_kw) * 0.2, 0.6)
+            patterns = lexicon.compiled_pivot_patterns[pivot]
+            upper = min(kw_score + min(len(patterns) * 0.3, 0.6), 0.95)
+            if upper > 0:
+                candidates.append((upper, rank, pivot, kw_score, matched_kw, patterns))
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+
+        def matches(pivot: str, index: int) -> bool:
+            required = lexicon.compiled_pivot_literals[pivot][index]
+            if required is not None and not any(literal in text for literal in required):
+                return False
+            return lexicon.compiled_pivot_patterns[pivot][index].search(text) is not None
+
+        best = None  # (score, rank, pivot, matched_kw, patterns, hits)
+        for upper, rank, pivot, kw_score, matched_kw, patterns in candidates:
+            if best is not None and (upper < best[0] or (upper == best[0] and rank > best[1])):
+                continue
+            order = self.rule_order.get(pivot)
+            if order is None or len(order) != len(patterns):
+                order = range(len(patterns))
+            hits: Dict[int, bool] = {}
+            count = 0
+            remaining = len(patterns)
+            for index in order:
+                if count >= 2:
+                    break
+                if best is not None:
+                    reachable = min(kw_score + min((count + remaining) * 0.3, 0.6), 0.95)
+                    if reachable < best[0] or (reachable == best[0] and rank > best[1]):
+                        break
+                matched = matches(pivot, index)
+                hits[index] = matched
+                count += matched
+                remaining -= 1
+            score = min(kw_score + min(count * 0.3, 0.6), 0.95)
+            if score > 0 and (best is None or score > best[0] or (score == best[0] and rank < best[1])):
+                best = (score, rank, pivot, matched_kw, patterns, hits)
+
+        if best is None:
+            return None
+        score, _, pivot, matched_kw, patterns, hits = best
+        matched_pat = []
+        for index, pattern in enumerate(patterns):
+            matched = hits.get(index)
+            if matched is None:
+                matched = matches(pivot, index)
+            if matched:
+                matched_pat.append(pattern.pattern)
+        return pivot, score, matched_kw, matched_pat
+
+    def _score_pivots(
+        self,
+        text: str,
+        lexicon: Optional[Lexicon] = None,
+        use_patterns: bool = True,
+    ) -> Dict[str, Tuple[float, List[str], List[str]]]:
+        """Voice別のキーワード/パターンスコア（スコア0のVoiceは含まない、use_patterns=False でキーワードのみ）"""
+        lexicon = lexicon or self.lexicon
         scores: Dict[str, Tuple[float, List[str], List[str]]] = {}
 
         for pivot in PIVOT.ALL:
-            config = PIVOT_KEYWORDS[pivot]
+            config = lexicon.pivot_keywords[pivot]
             keywords = config["keywords"]
-            patterns = self.pivot_patterns[pivot]
+            patterns = lexicon.compiled_pivot_patterns[pivot] if use_patterns else ()
 
             # キーワードマッチング
             matched_kw = [kw for kw in keywords if kw in text]
@@ -571,49 +1078,55 @@ class PIVOTClassifier:
             if total_score > 0:
                 scores[pivot] = (total_score, matched_kw, matched_pat)
 
-        if not scores:
-            return None
-
-        # 最高スコアのPIVOTを選択
-        best_pivot = max(scores.keys(), key=lambda p: scores[p][0])
-        confidence, matched_keywords, matched_patterns = scores[best_pivot]
+        return scores
 
-        return best_pivot, confidence, matched_keywords, matched_patterns
+    def _extract_layers(
+        self,
+        text: str,
+        lexicon: Optional[Lexicon] = None,
+        use_patterns: bool = True,
+    ) -> Dict[str, Optional[str]]:
+        """
+        対象軸（Layer）を抽出
 
-    def _extract_layers(self, text: str) -> Dict[str, Optional[str]]:
-        """対象軸（Layer）を抽出"""
+        層ごとに、キーワードが1つでも含まれていれば抽出パターンを1度だけ実行し、
+        最初にマッチしたキャプチャを値とする（マッチしなければ定義順で最初のキーワード）。
+        キーワードの有無は層ごとの結合パターン1回で判定し、抽出パターンは
+        リテラルの出現位置の近傍だけを検索する（AnchoredPattern）。
+        use_patterns=False の場合は抽出パターンを実行せず、キーワードを値とする。
+        """
+        lexicon = lexicon or self.lexicon
         layers: Dict[str, Optional[str]] = {
             "process": None,
             "tool": None,
             "people": None,
         }
 
-        for layer, config in LAYER_PATTERNS.items():
-            # キーワードチェック
-            keywords = config["keywords"]
-            for kw in keywords:
-                if kw in text:
-                    # 抽出パターンで具体的な値を取得
-                    for pattern in self.layer_patterns[layer]["extraction"]:
-                        match = pattern.search(text)
-                        if match:
-                            layers[layer] = match.group(1)
-                            break
-                    if layers[layer]:
-                        break
-
-                    # キーワード自体を値として使用
-                    if not layers[layer]:
-                        layers[layer] = kw
-                        break
+        for layer, config in lexicon.layer_patterns.items():
+            # キーワードチェック（含まれる場合のみ、定義順で最初のキーワードを特定）
+            gate = lexicon.compiled_layer_keywords[layer]
+            if gate is None or gate.search(text) is None:
+                continue
+            hit = next(kw for kw in config["keywords"] if kw in text)
+
+            # 抽出パターンで具体的な値を取得、なければキーワード自体を値として使用
+            value = hit
+            extraction = lexicon.compiled_layer_patterns[layer]["extraction"] if use_patterns else ()
+            for pattern in extraction:
+                match = pattern.search(text)
+                if match:
+                    value = match.group(1) or hit
+                    break
+            layers[layer] = value
 
         return layers
 
-    def _detect_temperature(self, text: str) -> str:
+    def _detect_temperature(self, text: str, lexicon: Optional[Lexicon] = None) -> str:
         """温度感を判定"""
-        high_count = sum(1 for w in TEMPERATURE_INDICATORS["high"] if w in text)
-        medium_count = sum(1 for w in TEMPERATURE_INDICATORS["medium"] if w in text)
-        low_count = sum(1 for w in TEMPERATURE_INDICATORS["low"] if w in text)
+        indicators = (lexicon or self.lexicon).temperature_indicators
+        high_count = sum(1 for w in indicators["high"] if w in text)
+        medium_count = sum(1 for w in indicators["medium"] if w in text)
+        low_count = sum(1 for w in indicators["low"] if w in text)
 
         if high_count >= 1:
             return "high"
@@ -624,16 +1137,16 @@ class PIVOTClassifier:
         else:
             return "medium"  # デフォルト
 
+    def weighted_score(self, item: PIVOTInsight) -> float:
+        """ドメイン重み付きスコア（信頼度 × ドメイン重み）"""
+        return item.confidence * self.weights.get(item.pivot_voice, 1.0)
+
     def _apply_domain_weights(
         self,
         items: List[PIVOTInsight],
     ) -> List[PIVOTInsight]:
         """ドメイン重みを適用してソート"""
-        def weighted_score(item: PIVOTInsight) -> float:
-            weight = self.weights.get(item.pivot_voice, 1.0)
-            return item.confidence * weight
-
-        return sorted(items, key=weighted_score, reverse=True)
+        return sorted(items, key=self.weighted_score, reverse=True)
 
     def _truncate(self, text: str, max_len: int) -> str:
         """テキストを切り詰め"""
@@ -643,13 +1156,198 @@ class PIVOTClassifier:
         return text[:max_len] + "..."
 
 
+# ========================================
+# 集計
+# ========================================
+
+def aggregate_insights(
+    items: List[PIVOTInsight],
+    domain: Optional[str] = None,
+    weights: Optional[Dict[str, float]] = None,
+) -> PIVOTClassificationResult:
+    """
+    分類済みインサイトを集計（Voice別・Process/Tool別、ドメイン重みで並べ替え）
+
+    Args:
+        items: PIVOT分類済みインサイト（閾値適用済み・発話順）
+        domain: 業務ドメイン（stats に記録。weights 省略時は重みにも使用）
+        weights: Voice別の重み（None=ドメインの重み）
+
+    Returns:
+        PIVOTClassificationResult: 集計結果
+    """
+    if weights is None:
+        weights = DOMAIN_PIVOT_WEIGHTS.get(domain, {p: 1.0 for p in PIVOT.ALL})
+    by_pivot: Dict[str, List[PIVOTInsight]] = {p: [] for p in PIVOT.ALL}
+    by_process: Dict[str, Dict[str, int]] = {}
+    by_tool: Dict[str, Dict[str, int]] = {}
+
+    for classified in items:
+        by_pivot[classified.pivot_voice].append(classified)
+
+        # Process/Tool別集計
+        process = classified.target_layers.get("process")
+        tool = classified.target_layers.get("tool")
+
+        if process:
+            if process not in by_process:
+                by_process[process] = {p: 0 for p in PIVOT.ALL}
+            by_process[process][classified.pivot_voice] += 1
+
+        if tool:
+            if tool not in by_tool:
+                by_tool[tool] = {p: 0 for p in PIVOT.ALL}
+            by_tool[tool][classified.pivot_voice] += 1
+
+    # ドメイン重みを適用してソート
+    items = sorted(items, key=lambda i: i.confidence * weights.get(i.pivot_voice, 1.0), reverse=True)
+
+    # スコア算出
+    total_score = sum(item.pivot_score for item in items)
+    sentiment_index = total_score / len(items) if items else 0.0
+
+    # 統計情報
+    stats = {
+        "total": len(items),
+        "by_pivot": {p: len(lst) for p, lst in by_pivot.items()},
+        "domain": domain,
+        "total_score": total_score,
+        "sentiment_index": sentiment_index,
+        "lexicon_versions": list(dict.fromkeys(item.lexicon_version for item in items)),
+        "degraded": _degraded_counts(items),
+    }
+
+    return PIVOTClassificationResult(
+        items=items,
+        by_pivot=by_pivot,
+        by_process=by_process,
+        by_tool=by_tool,
+        total_score=total_score,
+        sentiment_index=sentiment_index,
+        stats=stats,
+    )
+
+
+def _degraded_counts(items: List[PIVOTInsight]) -> Dict[str, int]:
+    """縮退処理の件数（"total" は縮退したインサイトの件数）"""
+    counts = {"total": 0, **{kind: 0 for kind in DEGRADATIONS}}
+    for item in items:
+        if item.degraded:
+            counts["total"] += 1
+            for kind in item.degraded:
+                counts[kind] += 1
+    return counts
+
+
 # ========================================
 # マート生成
 # ========================================
 
+def _mart_speaker(insight: PIVOTInsight) -> Optional[Dict]:
+    source = insight.source
+    if not source:
+        return None
+    speaker = {}
+    if source.speaker_id:
+        speaker["respondent_id"] = source.speaker_id
+    if source.speaker_role:
+        speaker["role"] = source.speaker_role
+    if source.speaker_department:
+        speaker["department"] = source.speaker_department
+    return speaker if speaker else None
+
+
+def _mart_context(insight: PIVOTInsight) -> Optional[Dict]:
+    source = insight.source
+    if not source:
+        return None
+    context = {}
+    if source.question_no is not None:
+        context["question_no"] = source.question_no
+    if source.question_text:
+        context["question"] = source.question_text
+    if source.interview_id:
+        context["interview_id"] = source.interview_id
+    return context if context else None
+
+
+def _mart_source_ref(insight: PIVOTInsight) -> Dict:
+    source = insight.source
+    source_ref = {"doc_id": "", "section_path": ""}
+    if source:
+        if source.interview_id:
+            source_ref["doc_id"] = source.interview_id
+        if source.line_no:
+            source_ref["line_no"] = source.line_no
+    return source_ref
+
+
+# インサイトマートのフィールド → 値の生成関数 (insight, observed_at, frequency)（出力順）
+# フィールド指定時の生成に使う。全フィールドの生成（generate_pivot_insight_mart）と一致させること
+INSIGHT_MART_FIELDS = {
+    "id": lambda i, observed_at, frequency: f"pivot_{i.id}",
+    "mart_type": lambda i, observed_at, frequency: "pivot_insight",
+    "pivot_voice": lambda i, observed_at, frequency: i.pivot_voice,
+    "pivot_label": lambda i, observed_at, frequency: i.pivot_label,
+    "pivot_score": lambda i, observed_at, frequency: i.pivot_score,
+    "target_layers": lambda i, observed_at, frequency: i.target_layers,
+    "title": lambda i, observed_at, frequency: i.title,
+    "body": lambda i, observed_at, frequency: i.body,
+    "speaker": lambda i, observed_at, frequency: _mart_speaker(i),
+    "context": lambda i, observed_at, frequency: _mart_context(i),
+    "keywords": lambda i, observed_at, frequency: {
+        "surface": i.matched_keywords,
+        "normalized": [],
+        "entities": [v for v in i.target_layers.values() if v],
+    },
+    "temperature": lambda i, observed_at, frequency: i.temperature,
+    "frequency": lambda i, observed_at, frequency: frequency,
+    "source_ref": lambda i, observed_at, frequency: _mart_source_ref(i),
+    "source_time": lambda i, observed_at, frequency: {"observed_at": observed_at},
+    "confidence": lambda i, observed_at, frequency: i.confidence,
+    "extraction_method": lambda i, observed_at, frequency: (
+        "rule_based" if not i.reasoning.startswith("障害") else "morphology_based"
+    ),
+    "morphology": lambda i, observed_at, frequency: {
+        "intensity_score": round(i.intensity_score, 2),
+        "degree_factor": i.degree_factor,
+        "certainty": i.certainty,
+        "reasoning": i.reasoning,
+    },
+    "lexicon_version": lambda i, observed_at, frequency: i.lexicon_version,
+    "payload": lambda i, observed_at, frequency: {
+        "raw_utterance": i.body,
+        "matched_keywords": i.matched_keywords,
+        "matched_patterns": i.matched_patterns,
+        "layer_surfaces": i.layer_surfaces,
+        "degraded": i.degraded,
+    },
+}
+
+
+def mart_fields(fields: Optional[List[str]] = None) -> List[str]:
+    """
+    出力するフィールドを検証し、マートの出力順に並べる
+
+    Args:
+        fields: フィールド名（None=すべて）
+
+    Returns:
+        List[str]: フィールド名（INSIGHT_MART_FIELDS の順）
+    """
+    if fields is None:
+        return list(INSIGHT_MART_FIELDS)
+    unknown = set(fields) - set(INSIGHT_MART_FIELDS)
+    if unknown:
+        raise ValueError(f"未対応のマートフィールド: {', '.join(sorted(unknown))}")
+    return [name for name in INSIGHT_MART_FIELDS if name in fields]
+
+
 def generate_pivot_insight_mart(
     insight: PIVOTInsight,
     observed_at: Optional[str] = None,
+    frequency: int = 1,
+    fields: Optional[List[str]] = None,
 ) -> Dict:
     """
     PIVOTInsightからマートアイテムを生成
@@ -657,12 +1355,20 @@ def generate_pivot_insight_mart(
     Args:
         insight: PIVOT分類済みインサイト
         observed_at: 観測日 (ISO-8601)
+        frequency: 類似発話の出現回数（dedup.cluster_insights で算出）
+        fields: 出力するフィールド（None=すべて、指定外のフィールドは生成しない）
 
     Returns:
         Dict: マートアイテム (JSON出力用)
     """
     observed_at = observed_at or datetime.now().strftime("%Y-%m-%d")
 
+    if fields is not None:
+        return {
+            name: INSIGHT_MART_FIELDS[name](insight, observed_at, frequency)
+            for name in mart_fields(fields)
+        }
+
     source = insight.source
     speaker = {}
     context = {}
@@ -699,10 +1405,10 @@ def generate_pivot_insight_mart(
         "keywords": {
             "surface": insight.matched_keywords,
             "normalized": [],
-            "entities": [],
+            "entities": [v for v in insight.target_layers.values() if v],
         },
         "temperature": insight.temperature,
-        "frequency": 1,
+        "frequency": frequency,
         "source_ref": source_ref,
         "source_time": {
             "observed_at": observed_at,
@@ -715,10 +1421,13 @@ def generate_pivot_insight_mart(
             "certainty": insight.certainty,
             "reasoning": insight.reasoning,
         },
+        "lexicon_version": insight.lexicon_version,
         "payload": {
             "raw_utterance": insight.body,
             "matched_keywords": insight.matched_keywords,
             "matched_patterns": insight.matched_patterns,
+            "layer_surfaces": insight.layer_surfaces,
+            "degraded": insight.degraded,
         },
     }
 
@@ -728,6 +1437,7 @@ def generate_pivot_summary_mart(
     period_start: str,
     period_end: str,
     period_type: str = "monthly",
+    frequencies: Optional[Dict[str, int]] = None,
 ) -> Dict:
     """
     分類結果からサマリーマートを生成
@@ -737,6 +1447,8 @@ def generate_pivot_summary_mart(
         period_start: 期間開始日 (ISO-8601)
         period_end: 期間終了日 (ISO-8601)
         period_type: 期間タイプ (daily, weekly, monthly)
+        frequencies: 代表インサイトのID → 出現回数（dedup.cluster_frequencies）。
+                     指定時は上位アイテムを代表のみに絞る
 
     Returns:
         Dict: サマリーマートアイテム
@@ -766,10 +1478,16 @@ def generate_pivot_summary_mart(
     # 上位アイテム
     top_items = {}
     for pivot in PIVOT.ALL:
-        items = result.by_pivot[pivot][:5]
+        items = result.by_pivot[pivot]
+        if frequencies is not None:
+            items = [i for i in items if i.id in frequencies]
         top_items[pivot] = [
-            {"id": f"pivot_{i.id}", "title": i.title, "frequency": 1}
-            for i in items
+            {
+                "id": f"pivot_{i.id}",
+                "title": i.title,
+                "frequency": frequencies[i.id] if frequencies is not None else 1,
+            }
+            for i in items[:5]
         ]
 
     return {
@@ -792,11 +1510,16 @@ def generate_pivot_summary_mart(
 
 def _calculate_priority_matrix(result: PIVOTClassificationResult) -> Dict:
     """優先度マトリクスを算出"""
+    return _priority_matrix_from_counts(result.by_process)
+
+
+def _priority_matrix_from_counts(by_process: Dict[str, Dict[str, int]]) -> Dict:
+    """Process別PIVOT件数から優先度マトリクスを算出"""
     urgent = []  # P × I が重なる
     quick_win = []  # V × T が重なる
     watch = []  # O が強い
 
-    for process, counts in result.by_process.items():
+    for process, counts in by_process.items():
         p_count = counts.get("P", 0)
         i_count = counts.get("I", 0)
         v_count = counts.get("V", 0)
@@ -0,0 +1,266 @@
+"""
+PIVOT Category Codes - Voice・温度感・対象軸の整数コード表
+
+インサイト群を列指向の整数配列として保持し、集計・絞り込みを配列演算で行う。
+
+コード:
+    - Voice:   PIVOT.ALL のインデックス（P=0, I=1, V=2, O=3, T=4）を1バイトで保持
+    - 温度感:  TEMPERATURES のインデックス（low=0, medium=1, high=2）を1バイトで保持
+    - 対象軸:  Process / Tool / People ごとの記号表（SymbolTable）のIDを int32 で保持。
+               値なしは NO_SYMBOL (-1)。IDは初出順に振るため、IDの昇順が出現順になる
+    ラベルへの変換は VOICE_LABELS / TEMPERATURES / SymbolTable.name で行う。
+
+PIVOTInsight の文字列フィールド（pivot_voice・temperature・target_layers）は
+公開APIとしてそのまま残す。これらは定数・辞書キー・sys.intern された文字列を
+共有しており、インサイトごとの複製は生じない。整数コードは大量のインサイトを
+まとめて数える・絞り込む場面（Voice別集計、対象軸×Voiceのクロス集計、
+検索インデックスの条件判定）で使う。
+NumPy があれば集計を bincount で行う（結果は同一）。
+
+使用例:
+    from nlp.python.pivot.codes import InsightCodes
+
+    codes = InsightCodes.from_insights(result.items)
+    codes.voice_counts()             # [P, I, V, O, T] の件数
+    codes.layer_counts("process")    # result.by_process と同じ値
+    codes.select(voice="P", tool="Excel")  # 条件に合うインサイトの位置
+"""
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - オプション依存
+    np = None
+
+from .classifier import PIVOT, PIVOTInsight
+
+
+# Voice ↔ コード
+VOICE_LABELS = tuple(PIVOT.ALL)
+VOICE_CODES: Dict[str, int] = {voice: code for code, voice in enumerate(VOICE_LABELS)}
+
+# 温度感 ↔ コード（未知の値は medium として扱う）
+TEMPERATURES = ("low", "medium", "high")
+TEMPERATURE_CODES: Dict[str, int] = {t: code for code, t in enumerate(TEMPERATURES)}
+DEFAULT_TEMPERATURE = TEMPERATURE_CODES["medium"]
+
+# 対象軸の種類
+LAYER_KINDS = ("process", "tool", "people")
+
+# 記号表で「値なし」を表すID
+NO_SYMBOL = -1
+
+
+def voice_code(voice: str) -> int:
+    """Voice をコードに変換（不正な Voice は ValueError）"""
+    code = VOICE_CODES.get(voice)
+    if code is None:
+        raise ValueError(f"不正なVoice: {voice!r}")
+    return code
+
+
+def temperature_code(temperature: Optional[str]) -> int:
+    """温度感をコードに変換（未知の値は medium）"""
+    return TEMPERATURE_CODES.get(temperature, DEFAULT_TEMPERATURE)
+
+
+# ========================================
+# 記号表
+# ========================================
+
+class SymbolTable:
+    """文字列 ↔ 整数IDの対応表（IDは登録順に0から振る）"""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for name in names:
+            self.intern(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ids
+
+    def intern(self, name: Optional[str]) -> int:
+        """IDを取得（未登録なら登録する。空文字・None は NO_SYMBOL）"""
+        if not name:
+            return NO_SYMBOL
+        symbol = self._ids.get(name)
+        if symbol is None:
+            symbol = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return symbol
+
+    def get(self, name: Optional[str]) -> Optional[int]:
+        """登録済みのIDを取得（未登録なら None）"""
+        return self._ids.get(name)
+
+    def name(self, symbol: int) -> Optional[str]:
+        """IDを文字列に戻す（NO_SYMBOL は None）"""
+        return self.names[symbol] if symbol != NO_SYMBOL else None
+
+    def encode(self, names: Iterable[Optional[str]]) -> array:
+        """文字列の列をIDの配列（int32）に変換（未登録の文字列は登録する）"""
+        ids = self._ids
+        intern = self.intern
+        return array("i", [ids[n] if n in ids else intern(n) for n in names])
+
+
+# ========================================
+# 列指向のコード配列
+# ========================================
+
+@dataclass
+class InsightCodes:
+    """インサイト群のカテゴリを整数コードの配列で保持（列指向）"""
+    voices: bytearray = field(default_factory=bytearray)
+    temperatures: bytearray = field(default_factory=bytearray)
+    layers: Dict[str, array] = field(
+        default_factory=lambda: {kind: array("i") for kind in LAYER_KINDS}
+    )
+    symbols: Dict[str, SymbolTable] = field(
+        default_factory=lambda: {kind: SymbolTable() for kind in LAYER_KINDS}
+    )
+
+    def __len__(self) -> int:
+        return len(self.voices)
+
+    @classmethod
+    def from_insights(
+        cls,
+        items: Sequence[PIVOTInsight],
+        symbols: Optional[Dict[str, SymbolTable]] = None,
+    ) -> "InsightCodes":
+        """
+        PIVOTInsightのリストからコード配列を構築
+
+        Args:
+            items: インサイト
+            symbols: 共有する記号表（None=このインサイト群専用に作成）
+
+        Returns:
+            InsightCodes: コード配列
+        """
+        codes = cls() if symbols is None else cls(symbols=symbols)
+        codes.extend(items)
+        return codes
+
+    def extend(self, items: Sequence[PIVOTInsight]) -> None:
+        """インサイトを末尾に追加"""
+        try:
+            self.voices += bytes([VOICE_CODES[i.pivot_voice] for i in items])
+        except KeyError as e:
+            raise ValueError(f"不正なVoice: {e.args[0]!r}") from None
+        self.temperatures += bytes([temperature_code(i.temperature) for i in items])
+        layers = [i.target_layers for i in items]
+        for kind in LAYER_KINDS:
+            self.layers[kind] += self.symbols[kind].encode([l.get(kind) for l in layers])
+
+    # ----------------------------------------
+    # ラベルへの変換
+    # ----------------------------------------
+
+    def voice(self, index: int) -> str:
+        return VOICE_LABELS[self.voices[index]]
+
+    def temperature(self, index: int) -> str:
+        return TEMPERATURES[self.temperatures[index]]
+
+    def layer(self, kind: str, index: int) -> Optional[str]:
+        return self.symbols[kind].name(self.layers[kind][index])
+
+    # ----------------------------------------
+    # 集計
+    # ----------------------------------------
+
+    def voice_counts(self) -> List[int]:
+        """Voice別の件数（PIVOT.ALL 順）"""
+        if np is not None:
+            voices = np.frombuffer(bytes(self.voices), dtype=np.uint8)
+            return np.bincount(voices, minlength=len(VOICE_LABELS)).tolist()
+        counts = [0] * len(VOICE_LABELS)
+        for code in self.voices:
+            counts[code] += 1
+        return counts
+
+    def layer_counts(self, kind: str) -> Dict[str, Dict[str, int]]:
+        """
+        対象軸 × Voice の件数（PIVOTClassificationResult.by_process / by_tool と同形式）
+
+        Args:
+            kind: 対象軸（process / tool / people）
+
+        Returns:
+            Dict[str, Dict[str, int]]: {対象名: {Voice: 件数}}。
+                対象名は記号表のID順（専用の記号表なら出現順）、値なしのインサイトは数えない
+        """
+        table = self.symbols[kind]
+        width = len(VOICE_LABELS)
+        if np is not None:
+            ids = np.frombuffer(self.layers[kind].tobytes(), dtype=np.int32).astype(np.int64)
+            voices = np.frombuffer(bytes(self.voices), dtype=np.uint8)
+            present = ids != NO_SYMBOL
+            cells = ids[present] * width + voices[present]
+            counts = np.bincount(cells, minlength=len(table) * width).tolist()
+        else:
+            counts = [0] * (len(table) * width)
+            for symbol, code in zip(self.layers[kind], self.voices):
+                if symbol != NO_SYMBOL:
+                    counts[symbol * width + code] += 1
+        result = {}
+        for symbol, name in enumerate(table.names):
+            row = counts[symbol * width:(symbol + 1) * width]
+            if any(row):
+                result[name] = dict(zip(VOICE_LABELS, row))
+        return result
+
+    def select(
+        self,
+        voice=None,
+        temperature=None,
+        process: Optional[str] = None,
+        tool: Optional[str] = None,
+        people: Optional[str] = None,
+    ) -> List[int]:
+        """
+        条件に合うインサイトの位置を取得
+
+        Args:
+            voice: Voice（文字列 or リスト）
+            temperature: 温度感（文字列 or リスト）
+            process: Process名
+            tool: Tool名
+            people: People名
+
+        Returns:
+            List[int]: 位置（昇順）
+        """
+        checks = []
+        if voice is not None:
+            voices = [voice] if isinstance(voice, str) else voice
+            checks.append((self.voices, "u1", {voice_code(v) for v in voices}))
+        if temperature is not None:
+            temperatures = [temperature] if isinstance(temperature, str) else temperature
+            checks.append((self.temperatures, "u1", {temperature_code(t) for t in temperatures}))
+        for kind, name in (("process", process), ("tool", tool), ("people", people)):
+            if name is not None:
+                symbol = self.symbols[kind].get(name)
+                if symbol is None:
+                    return []
+                checks.append((self.layers[kind], "i4", {symbol}))
+
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            for values, dtype, allowed in checks:
+                column = np.frombuffer(bytes(values), dtype=dtype)
+                mask &= np.isin(column, list(allowed))
+            return np.flatnonzero(mask).tolist()
+        return [
+            index for index in range(len(self))
+            if all(values[index] in allowed for values, _, allowed in checks)
+        ]
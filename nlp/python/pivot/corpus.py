@@ -0,0 +1,613 @@
+"""
+Corpus Runner - インタビューコーパス一括処理
+
+ディレクトリまたはglobで指定したインタビューMarkdown群を
+ワーカープールで並列処理し、シャード化されたマートJSONLと
+統合サマリーマートを出力する。
+
+出力構成:
+    <output_dir>/
+    ├── shards/
+    │   ├── <source_key>.jsonl       # インサイトマート（1ファイル=1シャード）
+    │   └── <source_key>.meta.json   # 内容ハッシュ・集計値（再開判定用）
+    ├── insights.dedup.jsonl         # 類似発話を集約した代表マート（--dedup 指定時）
+    └── summary.json                 # 統合サマリーマート
+
+シャード名（source_key）:
+    --root 指定時はそのディレクトリからの相対パス、省略時は入力ファイルの絶対パスを
+    shard_key で変換した名前。入力の組み合わせによらず同じファイルは同じシャード名になる
+    （watch も同じ規則）。
+
+再開可能:
+    シャードとメタが存在し、入力ファイルの内容ハッシュ・設定・観測日の指定・辞書バージョンが
+    一致する場合は処理をスキップし、メタに保存済みの集計値をサマリーに合算する。
+
+使用例:
+    python -m nlp.python.pivot corpus interviews/ -o out/ --workers 8
+    python -m nlp.python.pivot corpus "data/**/*.md" -o out/ --domain biz_analysis
+    python -m nlp.python.pivot corpus interviews/2025-03/ -o out/ --root interviews/
+
+    # Pythonから
+    from nlp.python.pivot.corpus import CorpusRunner
+
+    runner = CorpusRunner("out/", domain="biz_analysis", workers=8)
+    report = runner.run(["interviews/"])
+    print(report.processed, report.skipped)
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, TextIO
+
+from .classifier import PIVOT
+from .dedup import dedup_marts
+from .engine import InsightInterviewEngine
+from .lexicon import Lexicon, default_lexicon
+from .projection import insight_mart_json
+from .summary import TOP_ITEMS_PER_PIVOT, SummaryBuilder
+
+
+# メタ情報のフォーマットバージョン（互換性のない変更時に更新）
+META_VERSION = 1
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+# ========================================
+# 型定義
+# ========================================
+
+@dataclass
+class CorpusTask:
+    """1ファイル分の処理タスク"""
+    source: str
+    source_key: str
+    content_hash: str
+    shard_path: str
+    meta_path: str
+
+
+@dataclass
+class CorpusReport:
+    """コーパス処理結果"""
+    output_dir: str
+    summary_path: str
+    total_files: int = 0
+    processed: int = 0
+    skipped: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+    insights: int = 0
+    utterances: int = 0
+    clusters: Optional[int] = None  # 類似発話の集約後の件数（dedup 時）
+    elapsed: float = 0.0
+
+    @property
+    def files_per_sec(self) -> float:
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def utterances_per_sec(self) -> float:
+        return self.utterances / self.elapsed if self.elapsed > 0 else 0.0
+
+
+# ========================================
+# 入力収集
+# ========================================
+
+def collect_inputs(
+    inputs: Iterable[str],
+    pattern: str = "*.md",
+) -> List[Path]:
+    """
+    入力指定をファイルリストに展開
+
+    Args:
+        inputs: ディレクトリ・ファイル・globパターンのリスト
+        pattern: ディレクトリ指定時のファイルパターン（再帰）
+
+    Returns:
+        List[Path]: 重複を除いたファイルリスト（パス順）
+    """
+    files = set()
+    for spec in inputs:
+        path = Path(spec)
+        if path.is_dir():
+            files.update(p for p in path.rglob(pattern) if p.is_file())
+        elif path.is_file():
+            files.add(path)
+        else:
+            files.update(
+                Path(p) for p in glob.glob(spec, recursive=True)
+                if os.path.isfile(p)
+            )
+    return sorted(p.resolve() for p in files)
+
+
+def shard_key(path: Path) -> str:
+    """
+    パスからシャード名を生成（ディレクトリ区切りは "__"、絶対パスはルートを除く）
+
+    区切りと紛れる部分（"%"、"__" を含む・"_" で始まるか終わるディレクトリ名／ファイル名）は
+    "%" エスケープするため、異なるパスが同じシャード名になることはない
+    （"a/b.md" → "a__b"、"a__b.md" → "a%5F%5Fb"）。それ以外の名前はそのまま使う。
+    """
+    parts = []
+    names = path.with_suffix("").parts
+    if path.is_absolute():
+        names = names[1:]
+    for part in names:
+        part = part.replace("%", "%25")
+        if "__" in part or part.startswith("_") or part.endswith("_"):
+            part = part.replace("_", "%5F")
+        parts.append(part)
+    return "__".join(parts)
+
+
+def _hash_file(path: Path) -> str:
+    """ファイル内容のSHA-256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, data: str) -> None:
+    """一時ファイル経由でアトミックに書き込み"""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# ========================================
+# ワーカー
+# ========================================
+
+# ワーカープロセスごとに1つのエンジンを保持
+_WORKER_ENGINE: Optional[InsightInterviewEngine] = None
+
+
+def _init_worker(config: Dict) -> None:
+    """ワーカープロセス初期化（エンジンを1度だけ構築）"""
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = InsightInterviewEngine(**config)
+
+
+def _process_task(task: CorpusTask, config: Dict, observed_at: Optional[str]) -> Dict:
+    """1ファイルを処理してシャードとメタを書き出す"""
+    engine = _WORKER_ENGINE
+    if engine is None:
+        _init_worker(config)
+        engine = _WORKER_ENGINE
+
+    started = time.perf_counter()
+    text = Path(task.source).read_text(encoding="utf-8")
+    result = engine.process(text)
+
+    date = result.interview.metadata.date
+    item_observed_at = observed_at or (
+        date if _ISO_DATE.match(date) else datetime.now().strftime("%Y-%m-%d")
+    )
+
+    lines = [insight_mart_json(item, item_observed_at) + "\n" for item in result.items]
+    by_pivot = {p: len(result.by_pivot[p]) for p in PIVOT.ALL}
+    # サマリーの上位アイテムは by_pivot の先頭（発話順）
+    top = {
+        p: [
+            {"id": f"pivot_{item.id}", "title": item.title}
+            for item in result.by_pivot[p][:TOP_ITEMS_PER_PIVOT]
+        ]
+        for p in PIVOT.ALL
+    }
+
+    meta = {
+        "meta_version": META_VERSION,
+        "source": task.source,
+        "content_hash": task.content_hash,
+        "config": config,
+        "lexicon_version": engine.classifier.lexicon.version_id,
+        "interview_id": result.interview.metadata.interview_id,
+        "observed_at": item_observed_at,
+        "observed_at_option": observed_at,  # 指定された観測日（再開判定用、None=未指定）
+        "utterances": len(result.utterances),
+        "insights": len(result.items),
+        "by_pivot": by_pivot,
+        "by_process": result.by_process,
+        "by_tool": result.classification.by_tool,
+        "total_score": result.total_score,
+        "top_items": top,
+        "elapsed": time.perf_counter() - started,
+    }
+
+    # シャード → メタの順に書き込む（メタの存在＝シャード完成）
+    _write_atomic(Path(task.shard_path), "".join(lines))
+    _write_atomic(Path(task.meta_path), json.dumps(meta, ensure_ascii=False))
+    return meta
+
+
+# ========================================
+# サマリー統合
+# ========================================
+
+def merge_summary(
+    metas: List[Dict],
+    period_start: str,
+    period_end: str,
+    period_type: str = "monthly",
+    top_items: Optional[Dict[str, List[Dict]]] = None,
+) -> Dict:
+    """
+    シャードメタの集計値を統合サマリーマートに合算
+
+    Args:
+        metas: シャードメタのリスト（入力順）
+        period_start: 期間開始日 (ISO-8601)
+        period_end: 期間終了日 (ISO-8601)
+        period_type: 期間タイプ
+        top_items: 上位アイテム（None=各メタの上位アイテムを入力順に合算）
+
+    Returns:
+        Dict: generate_pivot_summary_mart と同形式のサマリーマート
+    """
+    builder = SummaryBuilder()
+    for meta in metas:
+        builder.add_shard(
+            meta["by_pivot"],
+            meta["by_process"],
+            meta["by_tool"],
+            meta["top_items"] if top_items is None else None,
+        )
+    if top_items is not None:
+        builder.top_items = top_items
+    return builder.build(period_start, period_end, period_type)
+
+
+# ========================================
+# コーパスランナー
+# ========================================
+
+class CorpusRunner:
+    """インタビューコーパス一括処理"""
+
+    def __init__(
+        self,
+        output_dir: str,
+        domain: Optional[str] = None,
+        min_confidence: float = 0.3,
+        use_morphology: bool = True,
+        morphology_backend: Optional[str] = None,
+        lexicon: Optional[str] = None,
+        workers: Optional[int] = None,
+        observed_at: Optional[str] = None,
+        force: bool = False,
+        progress: Optional[TextIO] = None,
+        dedup: bool = False,
+        dedup_threshold: float = 0.6,
+        regex_safety: bool = False,
+        root: Optional[str] = None,
+    ):
+        """
+        Args:
+            output_dir: 出力ディレクトリ
+            domain: 業務ドメイン
+            min_confidence: 最小信頼度
+            use_morphology: 品詞分解を使用するか
+            morphology_backend: 品詞抽出バックエンド名（None=ルールベース）
+            lexicon: 辞書ファイルのパス（None=組み込み辞書）
+            workers: ワーカー数（None=CPU数, 1=プロセス内で逐次処理）
+            observed_at: 観測日（None=メタデータのdate、なければ当日）
+            force: 既存シャードを無視して再処理するか
+            progress: 進捗出力先（None=出力しない）
+            dedup: 全シャードの類似発話を集約し、代表マートと frequency を出力するか
+            dedup_threshold: 同一とみなす類似度（Jaccard 推定値）
+            regex_safety: 正規表現の安全モード（長い発話で高コストなパターンの入力長を制限）
+            root: シャード名の基準ディレクトリ（None=入力ファイルの絶対パスから決定）
+        """
+        self.output_dir = Path(output_dir)
+        self.root = Path(root).resolve() if root else None
+        self.config = {
+            "domain": domain,
+            "min_confidence": min_confidence,
+            "use_morphology": use_morphology,
+            "morphology_backend": morphology_backend,
+            "lexicon": lexicon,
+            "regex_safety": regex_safety,
+        }
+        # 辞書ファイルの内容が変わった場合も再処理する
+        self.lexicon_version = (Lexicon.load(lexicon) if lexicon else default_lexicon()).version_id
+        self.workers = workers or os.cpu_count() or 1
+        self.observed_at = observed_at
+        self.force = force
+        self.progress = progress
+        self.dedup = dedup
+        self.dedup_threshold = dedup_threshold
+
+    def source_key(self, path: Path) -> str:
+        """
+        ファイルのシャード名（root からの相対パス、root 未指定時は絶対パスから生成）
+
+        Raises:
+            ValueError: root の外にあるファイル
+        """
+        path = path.resolve()
+        if self.root is None:
+            return shard_key(path)
+        try:
+            return shard_key(path.relative_to(self.root))
+        except ValueError:
+            raise ValueError(f"ルートディレクトリ {self.root} の外にあるファイル: {path}") from None
+
+    def plan(self, files: List[Path]) -> List[CorpusTask]:
+        """ファイルリストからタスクを生成"""
+        shard_dir = self.output_dir / "shards"
+        tasks = []
+        for f in files:
+            key = self.source_key(f)
+            tasks.append(CorpusTask(
+                source=str(f),
+                source_key=key,
+                content_hash=_hash_file(f),
+                shard_path=str(shard_dir / f"{key}.jsonl"),
+                meta_path=str(shard_dir / f"{key}.meta.json"),
+            ))
+        return tasks
+
+    def _load_valid_meta(self, task: CorpusTask) -> Optional[Dict]:
+        """再利用可能な既存メタを取得"""
+        if self.force or not os.path.exists(task.shard_path):
+            return None
+        try:
+            with open(task.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (meta.get("meta_version") != META_VERSION
+                or meta.get("content_hash") != task.content_hash
+                or meta.get("config") != self.config
+                or meta.get("observed_at_option") != self.observed_at
+                or meta.get("lexicon_version") != self.lexicon_version):
+            return None
+        return meta
+
+    def run(
+        self,
+        inputs: Iterable[str],
+        pattern: str = "*.md",
+        period_start: Optional[str] = None,
+        period_end: Optional[str] = None,
+        period_type: str = "monthly",
+    ) -> CorpusReport:
+        """
+        コーパスを処理
+
+        Args:
+            inputs: ディレクトリ・ファイル・globパターンのリスト
+            pattern: ディレクトリ指定時のファイルパターン
+            period_start: サマリー期間開始日（None=観測日の最小値）
+            period_end: サマリー期間終了日（None=観測日の最大値）
+            period_type: サマリー期間タイプ
+
+        Returns:
+            CorpusReport: 処理結果
+        """
+        started = time.perf_counter()
+        (self.output_dir / "shards").mkdir(parents=True, exist_ok=True)
+
+        tasks = self.plan(collect_inputs(inputs, pattern))
+        report = CorpusReport(
+            output_dir=str(self.output_dir),
+            summary_path=str(self.output_dir / "summary.json"),
+            total_files=len(tasks),
+        )
+
+        metas: Dict[str, Dict] = {}
+        pending = []
+        for task in tasks:
+            meta = self._load_valid_meta(task)
+            if meta is not None:
+                metas[task.source] = meta
+                report.skipped += 1
+            else:
+                pending.append(task)
+
+        self._log(f"{len(tasks)} files: {report.skipped} up to date, {len(pending)} to process")
+
+        for task, meta, error in self._execute(pending):
+            if error:
+                report.failed[task.source] = error
+                self._log(f"FAILED {task.source_key}: {error}")
+            else:
+                metas[task.source] = meta
+                report.processed += 1
+                report.insights += meta["insights"]
+                report.utterances += meta["utterances"]
+            self._report_progress(report, started, task, meta)
+
+        # 統合サマリー（入力順で合算）
+        ordered = [metas[t.source] for t in tasks if t.source in metas]
+        dates = sorted(m["observed_at"] for m in ordered) or [datetime.now().strftime("%Y-%m-%d")]
+        top_items = None
+        if self.dedup:
+            done = [t for t in tasks if t.source in metas]
+            top_items = self._write_dedup(done, report)
+        summary = merge_summary(
+            ordered,
+            period_start or dates[0],
+            period_end or dates[-1],
+            period_type,
+            top_items=top_items,
+        )
+        _write_atomic(
+            Path(report.summary_path),
+            json.dumps(summary, ensure_ascii=False, indent=2),
+        )
+
+        report.elapsed = time.perf_counter() - started
+        self._log(
+            f"done: {report.processed} processed, {report.skipped} skipped, "
+            f"{len(report.failed)} failed, {report.insights} insights "
+            f"in {report.elapsed:.1f}s ({report.files_per_sec:.1f} files/s, "
+            f"{report.utterances_per_sec:.0f} utterances/s)"
+        )
+        return report
+
+    def _write_dedup(self, tasks: List[CorpusTask], report: CorpusReport) -> Dict[str, List[Dict]]:
+        """
+        全シャードの類似発話を集約して代表マートを書き出す
+
+        Returns:
+            Dict[str, List[Dict]]: Voice別の上位アイテム（代表の出現順、frequency 付き）
+        """
+        def marts():
+            for task in tasks:
+                with open(task.shard_path, encoding="utf-8") as f:
+                    for line in f:
+                        yield json.loads(line)
+
+        top_items: Dict[str, List[Dict]] = {p: [] for p in PIVOT.ALL}
+        path = self.output_dir / "insights.dedup.jsonl"
+        tmp = path.with_name(path.name + ".tmp")
+        count = 0
+        with open(tmp, "w", encoding="utf-8") as f:
+            for mart in dedup_marts(marts(), threshold=self.dedup_threshold):
+                f.write(json.dumps(mart, ensure_ascii=False) + "\n")
+                count += 1
+                top = top_items[mart["pivot_voice"]]
+                if len(top) < TOP_ITEMS_PER_PIVOT:
+                    top.append({"id": mart["id"], "title": mart["title"], "frequency": mart["frequency"]})
+        os.replace(tmp, path)
+
+        report.clusters = count
+        self._log(f"dedup: {count} clusters")
+        return top_items
+
+    def _execute(self, tasks: List[CorpusTask]):
+        """タスクを実行して (task, meta, error) を完了順に返す"""
+        if not tasks:
+            return
+        if self.workers <= 1:
+            for task in tasks:
+                try:
+                    yield task, _process_task(task, self.config, self.observed_at), None
+                except Exception as e:  # noqa: BLE001 - 1ファイルの失敗で全体を止めない
+                    yield task, None, f"{type(e).__name__}: {e}"
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(tasks)),
+            initializer=_init_worker,
+            initargs=(self.config,),
+        ) as pool:
+            futures = {
+                pool.submit(_process_task, task, self.config, self.observed_at): task
+                for task in tasks
+            }
+            for future in as_completed(futures):
+                task = futures[future]
+                try:
+                    yield task, future.result(), None
+                except Exception as e:  # noqa: BLE001
+                    yield task, None, f"{type(e).__name__}: {e}"
+
+    def _report_progress(
+        self,
+        report: CorpusReport,
+        started: float,
+        task: CorpusTask,
+        meta: Optional[Dict],
+    ) -> None:
+        """進捗とスループットを出力"""
+        done = report.processed + len(report.failed)
+        todo = report.total_files - report.skipped
+        elapsed = time.perf_counter() - started
+        rate = report.processed / elapsed if elapsed > 0 else 0.0
+        utt_rate = report.utterances / elapsed if elapsed > 0 else 0.0
+        insights = meta["insights"] if meta else 0
+        self._log(
+            f"[{done}/{todo}] {task.source_key}: {insights} insights "
+            f"({rate:.1f} files/s, {utt_rate:.0f} utterances/s)"
+        )
+
+    def _log(self, message: str) -> None:
+        if self.progress is not None:
+            print(message, file=self.progress, flush=True)
+
+
+# ========================================
+# CLI
+# ========================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """corpus サブコマンドの引数定義"""
+    parser = argparse.ArgumentParser(
+        prog="python -m nlp.python.pivot corpus",
+        description="インタビューMarkdown群をPIVOT分類してマートを出力",
+    )
+    parser.add_argument("inputs", nargs="+", help="ディレクトリ・ファイル・globパターン")
+    parser.add_argument("-o", "--output", required=True, help="出力ディレクトリ")
+    parser.add_argument("-d", "--domain", default=None, help="業務ドメイン")
+    parser.add_argument("--min-confidence", type=float, default=0.3, help="最小信頼度")
+    parser.add_argument("--no-morphology", action="store_true", help="品詞分解を使用しない")
+    parser.add_argument("--morphology-backend", default=None,
+                        choices=["rule", "fugashi", "sudachi", "auto"],
+                        help="品詞抽出バックエンド（既定: rule）")
+    parser.add_argument("--lexicon", default=None, help="辞書ファイル（既定: 組み込み辞書）")
+    parser.add_argument("--regex-safety", action="store_true",
+                        help="正規表現の安全モード（長い発話で高コストなパターンの入力長を制限）")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="ワーカー数（既定: CPU数）")
+    parser.add_argument("--pattern", default="*.md", help="ディレクトリ指定時のファイルパターン")
+    parser.add_argument("--root", default=None,
+                        help="シャード名の基準ディレクトリ（既定: 入力ファイルの絶対パスから決定）")
+    parser.add_argument("--observed-at", default=None, help="観測日（既定: メタデータのdate）")
+    parser.add_argument("--period-start", default=None, help="サマリー期間開始日")
+    parser.add_argument("--period-end", default=None, help="サマリー期間終了日")
+    parser.add_argument("--period-type", default="monthly", help="サマリー期間タイプ")
+    parser.add_argument("--force", action="store_true", help="既存シャードを無視して再処理")
+    parser.add_argument("--dedup", action="store_true", help="類似発話を集約して frequency を算出")
+    parser.add_argument("--dedup-threshold", type=float, default=0.6, help="類似発話とみなす類似度")
+    parser.add_argument("-q", "--quiet", action="store_true", help="進捗を出力しない")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLIエントリポイント"""
+    args = build_parser().parse_args(argv)
+    runner = CorpusRunner(
+        args.output,
+        domain=args.domain,
+        min_confidence=args.min_confidence,
+        use_morphology=not args.no_morphology,
+        morphology_backend=args.morphology_backend,
+        lexicon=args.lexicon,
+        regex_safety=args.regex_safety,
+        workers=args.workers,
+        observed_at=args.observed_at,
+        force=args.force,
+        progress=None if args.quiet else sys.stderr,
+        dedup=args.dedup,
+        dedup_threshold=args.dedup_threshold,
+        root=args.root,
+    )
+    try:
+        report = runner.run(
+            args.inputs,
+            pattern=args.pattern,
+            period_start=args.period_start,
+            period_end=args.period_end,
+            period_type=args.period_type,
+        )
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 1 if report.failed else 0
@@ -0,0 +1,279 @@
+"""
+PIVOT Near-duplicate Clustering - 類似発話の集約とfrequency算出
+
+多数のインタビューで同じ課題が言い回しを変えて繰り返し現れるため、
+文字n-gramの MinHash と LSH（Locality Sensitive Hashing）で
+ほぼ同一のインサイトを集約し、代表1件と出現回数（frequency）を出力する。
+
+集約の単位:
+    同じ Voice かつ同じ Process（target_layers["process"]）のインサイトのみを
+    同一クラスタの候補とする。
+
+アルゴリズム:
+    1. テキストを正規化（NFKC・空白/句読点除去・小文字化）し文字n-gramに分解
+    2. num_perm 個のハッシュ関数で MinHash シグネチャを算出
+    3. シグネチャを bands 個の帯に分け、(集約単位, 帯番号, 帯の値) をバケットキーとする
+    4. バケットに登録済みのメンバーとシグネチャ一致率（Jaccard推定値）を比較し、
+       閾値以上なら同じクラスタに追加、なければ新しいクラスタを作る
+
+    各インサイトは高々 bands 個のバケットを参照するだけなので、
+    処理量は件数にほぼ比例する（全ペア比較は行わない）。
+    代表は各クラスタで最初に現れたインサイト。
+
+NumPy があればシグネチャ算出をベクトル化する（結果は同一）。
+
+使用例:
+    from nlp.python.pivot.dedup import cluster_insights
+
+    clusters = cluster_insights(result.items)
+    for cluster in clusters:
+        print(cluster.frequency, cluster.representative.title)
+
+    # マート出力（代表のみ、frequency に出現回数）
+    engine.save_marts(result, "marts.jsonl", dedup=True)
+"""
+
+import random
+import re
+import unicodedata
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - オプション依存
+    np = None
+
+from .classifier import PIVOT, PIVOTClassificationResult, PIVOTInsight
+
+
+# MinHash の法（メルセンヌ素数 2^31-1。係数×ハッシュ値が uint64 に収まる）
+_PRIME = (1 << 31) - 1
+
+# 正規化で除去する文字（空白・句読点・括弧）
+_STRIP = re.compile(r"[\s、。，．,.!?！？「」『』（）()【】\[\]・…]+")
+
+# 集約単位: (Voice, Process)
+GroupKey = Tuple[str, Optional[str]]
+
+
+# ========================================
+# MinHash / LSH
+# ========================================
+
+def normalize_text(text: str) -> str:
+    """比較用にテキストを正規化"""
+    return _STRIP.sub("", unicodedata.normalize("NFKC", text)).lower()
+
+
+def shingles(text: str, ngram: int = 3) -> List[str]:
+    """文字n-gram（重複なし、n未満の短文は全体を1つとする）"""
+    if len(text) <= ngram:
+        return [text] if text else []
+    return list(dict.fromkeys(text[i:i + ngram] for i in range(len(text) - ngram + 1)))
+
+
+class NearDuplicateClusterer:
+    """MinHash/LSH による逐次型の類似クラスタリング"""
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        num_perm: int = 64,
+        bands: int = 16,
+        ngram: int = 3,
+        seed: int = 1,
+    ):
+        """
+        Args:
+            threshold: 同一クラスタとみなす Jaccard 類似度（推定値）
+            num_perm: MinHash のハッシュ関数の数
+            bands: LSH の帯の数（num_perm を割り切ること）
+            ngram: 文字n-gramの長さ
+            seed: ハッシュ関数の係数を決める乱数シード
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) は bands ({bands}) で割り切れる必要があります")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+
+        rng = random.Random(seed)
+        self._a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+        if np is not None:
+            self._a_vec = np.array(self._a, dtype=np.uint64)[:, None]
+            self._b_vec = np.array(self._b, dtype=np.uint64)[:, None]
+
+        # バケットキー → (クラスタ番号, シグネチャ)
+        self._buckets: Dict[Tuple, Tuple[int, Tuple[int, ...]]] = {}
+        self.sizes: List[int] = []
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """MinHash シグネチャを算出"""
+        grams = shingles(normalize_text(text), self.ngram)
+        if not grams:
+            return (_PRIME,) * self.num_perm
+        hashes = [zlib.crc32(g.encode("utf-8")) for g in grams]
+
+        if np is not None:
+            h = np.array(hashes, dtype=np.uint64)[None, :]
+            return tuple(((self._a_vec * h + self._b_vec) % _PRIME).min(axis=1).tolist())
+
+        return tuple(
+            min((a * h + b) % _PRIME for h in hashes)
+            for a, b in zip(self._a, self._b)
+        )
+
+    def similarity(self, sig1: Sequence[int], sig2: Sequence[int]) -> float:
+        """シグネチャ一致率（Jaccard 類似度の推定値）"""
+        return sum(1 for x, y in zip(sig1, sig2) if x == y) / self.num_perm
+
+    def add(self, text: str, group: Hashable = None) -> int:
+        """
+        テキストを追加し、所属するクラスタ番号を返す
+
+        Args:
+            text: テキスト
+            group: 集約単位（異なる group 同士は集約しない）
+
+        Returns:
+            int: クラスタ番号（追加順に 0, 1, ...）
+        """
+        sig = self.signature(text)
+        keys = [
+            (group, band, sig[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+        cluster = None
+        checked = set()
+        for key in keys:
+            entry = self._buckets.get(key)
+            if entry is None or entry[0] in checked:
+                continue
+            checked.add(entry[0])
+            if self.similarity(sig, entry[1]) >= self.threshold:
+                cluster = entry[0]
+                break
+
+        if cluster is None:
+            cluster = len(self.sizes)
+            self.sizes.append(0)
+        self.sizes[cluster] += 1
+
+        # 空きバケットに登録（表記揺れの連鎖を拾えるようメンバーも登録する）
+        for key in keys:
+            if key not in self._buckets:
+                self._buckets[key] = (cluster, sig)
+        return cluster
+
+
+# ========================================
+# インサイトの集約
+# ========================================
+
+@dataclass
+class InsightCluster:
+    """類似インサイトのクラスタ"""
+    representative: PIVOTInsight
+    members: List[PIVOTInsight] = field(default_factory=list)
+
+    @property
+    def frequency(self) -> int:
+        return len(self.members)
+
+    @property
+    def pivot_voice(self) -> str:
+        return self.representative.pivot_voice
+
+    @property
+    def process(self) -> Optional[str]:
+        return self.representative.target_layers.get("process")
+
+
+def _group_key(insight: PIVOTInsight) -> GroupKey:
+    return insight.pivot_voice, insight.target_layers.get("process")
+
+
+def cluster_insights(
+    items: Iterable[PIVOTInsight],
+    threshold: float = 0.6,
+    **options,
+) -> List[InsightCluster]:
+    """
+    インサイトを類似クラスタに集約
+
+    Args:
+        items: インサイト（代表は各クラスタで最初に現れたもの）
+        threshold: 同一クラスタとみなす Jaccard 類似度
+        **options: NearDuplicateClusterer の引数（num_perm, bands, ngram, seed）
+
+    Returns:
+        List[InsightCluster]: クラスタ（代表の出現順）
+    """
+    clusterer = NearDuplicateClusterer(threshold=threshold, **options)
+    clusters: List[InsightCluster] = []
+    for item in items:
+        index = clusterer.add(item.body, _group_key(item))
+        if index == len(clusters):
+            clusters.append(InsightCluster(representative=item))
+        clusters[index].members.append(item)
+    return clusters
+
+
+def cluster_result(
+    result: PIVOTClassificationResult,
+    threshold: float = 0.6,
+    **options,
+) -> List[InsightCluster]:
+    """
+    分類結果を類似クラスタに集約（Voice別・発話順に走査）
+
+    代表が発話順で最初のインサイトになるため、サマリーの上位アイテム
+    （by_pivot の先頭）と整合する。
+    """
+    items = [item for p in PIVOT.ALL for item in result.by_pivot[p]]
+    return cluster_insights(items, threshold, **options)
+
+
+def cluster_frequencies(clusters: Iterable[InsightCluster]) -> Dict[str, int]:
+    """代表インサイトのID → 出現回数"""
+    return {c.representative.id: c.frequency for c in clusters}
+
+
+def dedup_marts(
+    marts: Iterable[Dict],
+    threshold: float = 0.6,
+    **options,
+) -> Iterator[Dict]:
+    """
+    インサイトマートを集約し、代表のマートを出現順に返す
+
+    代表の "frequency" に出現回数、"duplicate_ids" に集約したマートのIDを設定する。
+    後から現れたマートが既存の代表に集約されうるため、入力をすべて読み終えてから
+    代表を返す（逐次出力ではない）。保持するのは代表のマート・集約した全マートのID・
+    LSHのバケット（1件につき最大 bands 個）で、メモリ使用量は入力の件数に比例する。
+
+    Args:
+        marts: generate_pivot_insight_mart 形式のマート
+        threshold: 同一クラスタとみなす Jaccard 類似度
+        **options: NearDuplicateClusterer の引数
+
+    Yields:
+        Dict: 代表マート
+    """
+    clusterer = NearDuplicateClusterer(threshold=threshold, **options)
+    representatives: List[Dict] = []
+    for mart in marts:
+        process = (mart.get("target_layers") or {}).get("process")
+        index = clusterer.add(mart["body"], (mart["pivot_voice"], process))
+        if index == len(representatives):
+            representatives.append({**mart, "frequency": 0, "duplicate_ids": []})
+        else:
+            representatives[index]["duplicate_ids"].append(mart["id"])
+        representatives[index]["frequency"] += 1
+    yield from representatives
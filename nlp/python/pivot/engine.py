@@ -25,6 +25,9 @@ InsightInterview Engine - インタビュー分析のコアエンジン
 
     # マートとして保存
     engine.save_marts(result, "output/marts.jsonl")
+
+    # 編集後のテキストで差分更新（回答が変わったセクションのみ再分類）
+    result = engine.update(result, edited_text)
 """
 
 import re
@@ -44,8 +47,11 @@ from .classifier import (
     PIVOT,
     generate_pivot_insight_mart,
     generate_pivot_summary_mart,
+    mart_fields,
 )
 from .morphology import MorphologyAnalyzer, MorphologyResult
+from .dedup import cluster_frequencies, cluster_result
+from .projection import InsightMartView, write_insight_marts
 
 
 # ========================================
@@ -96,6 +102,9 @@ class InsightInterviewResult:
     # PIVOT分類結果
     classification: PIVOTClassificationResult
 
+    # Q&Aセクションごとの発話数（interview.qa_sections と同順、差分更新に使用）
+    section_sizes: List[int] = field(default_factory=list)
+
     # 便利なアクセサ
     @property
     def items(self) -> List[PIVOTInsight]:
@@ -443,6 +452,13 @@ class InsightInterviewEngine:
         use_morphology: bool = True,
         split_by_sentence: bool = True,
         split_by_conjunction: bool = True,
+        morphology_backend=None,
+        lexicon=None,
+        normalize_entities: bool = False,
+        regex_safety=None,
+        budget=None,
+        short_circuit: bool = True,
+        rule_order=None,
     ):
         """
         Args:
@@ -451,6 +467,13 @@ class InsightInterviewEngine:
             use_morphology: 品詞分解を使用するか
             split_by_sentence: 句点で発言を分割するか
             split_by_conjunction: 接続詞で発言を分割するか
+            morphology_backend: 品詞抽出バックエンド（None=ルールベース）
+            lexicon: 辞書（None=組み込み辞書、Lexicon / 辞書ファイルのパス / LexiconStore）
+            normalize_entities: 対象軸の抽出値を正規名に変換するか（既定: 抽出値のまま）
+            regex_safety: 正規表現の安全モード（True / RegexSafety / None）
+            budget: 発話・バッチごとの処理予算（ClassificationBudget、None=制限なし）
+            short_circuit: キーワード/パターン判定で不要なパターンの実行を省略するか
+            rule_order: Voice別のパターンを試す順序（RuleProfiler.pivot_pattern_order()）
         """
         self.domain = domain
         self.min_confidence = min_confidence
@@ -465,6 +488,13 @@ class InsightInterviewEngine:
             domain=domain,
             min_confidence=min_confidence,
             use_morphology=use_morphology,
+            morphology_backend=morphology_backend,
+            lexicon=lexicon,
+            normalize_entities=normalize_entities,
+            regex_safety=regex_safety,
+            budget=budget,
+            short_circuit=short_circuit,
+            rule_order=rule_order,
         )
 
     def process(
@@ -486,9 +516,13 @@ class InsightInterviewEngine:
 
         # Step 1: パース
         interview = self.parser.parse(text)
+        return self._process_interview(interview)
 
-        # Step 2: 発言分割
-        utterances = self._extract_utterances(interview)
+    def _process_interview(self, interview: ParsedInterview) -> InsightInterviewResult:
+        """パース済みインタビューを発言分割・分類"""
+        # Step 2: 発言分割（セクションごと）
+        sections = [self._split_section(qa, interview.metadata) for qa in interview.qa_sections]
+        utterances = [u for utts in sections for u in utts]
 
         # Step 3: PIVOT分類
         classification = self.classifier.classify(utterances)
@@ -497,8 +531,92 @@ class InsightInterviewEngine:
             interview=interview,
             utterances=utterances,
             classification=classification,
+            section_sizes=[len(utts) for utts in sections],
         )
 
+    def update(
+        self,
+        previous: InsightInterviewResult,
+        text: str,
+    ) -> InsightInterviewResult:
+        """
+        編集後のインタビューテキストで処理結果を差分更新
+
+        新旧の Q&A セクションを回答文で対応付け、回答が変わった（追加された）
+        セクションだけを発言分割・分類し、削除・変更前のインサイトとの差分で
+        集計を更新する。回答が同じセクションは、質問番号・質問文・行番号・
+        メタデータが変わっていれば発話の属性だけを更新し、分類結果を再利用する。
+
+        previous を更新して返す（インサイトID・発話IDは再利用分で維持される）。
+        previous が差分情報を持たない場合や、分類時と辞書が異なる場合は全体を再処理する。
+
+        Args:
+            previous: 前回の process / update の結果
+            text: 編集後のインタビューテキスト
+
+        Returns:
+            InsightInterviewResult: 更新した処理結果
+        """
+        interview = self.parser.parse(text)
+        old = previous.interview
+        # interview_id が本文にない（自動採番）場合は前回のIDを引き継ぐ
+        if interview.metadata.interview_id not in text:
+            interview.metadata.interview_id = old.metadata.interview_id
+
+        versions = previous.classification.stats.get("lexicon_versions", [])
+        if (len(previous.section_sizes) != len(old.qa_sections)
+                or sum(previous.section_sizes) != len(previous.utterances)
+                or any(v != self.classifier.lexicon.version_id for v in versions)):
+            return self._process_interview(interview)
+
+        # 前回のセクション（回答文 → (セクション, 発話リスト)、同じ回答は出現順）
+        pool: Dict[str, List[Tuple[QASection, List[Utterance]]]] = {}
+        pos = 0
+        for qa, size in zip(old.qa_sections, previous.section_sizes):
+            pool.setdefault(qa.answer, []).append((qa, previous.utterances[pos:pos + size]))
+            pos += size
+        by_source = {id(item.source): item for item in previous.items}
+
+        # 新しいセクションを前回の発話で埋め、変わったセクションだけを分割
+        sections: List[List[Utterance]] = []
+        changed: List[Utterance] = []
+        changed_sections = 0
+        for qa in interview.qa_sections:
+            candidates = pool.get(qa.answer)
+            if candidates:
+                old_qa, utts = candidates.pop(0)
+                self._sync_section(utts, old_qa, qa, interview.metadata)
+            else:
+                utts = self._split_section(qa, interview.metadata)
+                changed.extend(utts)
+                changed_sections += 1
+            sections.append(utts)
+
+        # 変わったセクションの発話をまとめて分類
+        added = self.classifier.classify_items(changed)
+        new_items = {id(item.source): item for item in added}
+        new_items.update(by_source)
+        removed = [
+            by_source[id(u)]
+            for left in pool.values() for _, utts in left for u in utts
+            if id(u) in by_source
+        ]
+
+        utterances = [u for utts in sections for u in utts]
+        items = [new_items[id(u)] for u in utterances if id(u) in new_items]
+        self.classifier.patch(previous.classification, items, removed, added)
+        previous.classification.stats["incremental"] = {
+            "reclassified_sections": changed_sections,
+            "reclassified_utterances": len(changed),
+            "removed_items": len(removed),
+            "added_items": len(added),
+        }
+
+        previous.interview = interview
+        previous.utterances = utterances
+        previous.section_sizes = [len(utts) for utts in sections]
+        return previous
+
     def process_qa(
         self,
         question: str,
@@ -569,41 +687,65 @@ class InsightInterviewEngine:
         metadata = interview.metadata
 
         for qa in interview.qa_sections:
-            utts = self.splitter.split(
-                qa.answer,
-                speaker_id=metadata.respondent,
-                speaker_role=metadata.role,
-                question_no=qa.question_no,
-                question_text=qa.question,
-                interview_id=metadata.interview_id,
-                base_line_no=qa.line_no,
-            )
-            utterances.extend(utts)
+            utterances.extend(self._split_section(qa, metadata))
 
         return utterances
 
+    def _split_section(self, qa: QASection, metadata: InterviewMetadata) -> List[Utterance]:
+        """Q&Aセクションの回答を発言分割"""
+        return self.splitter.split(
+            qa.answer,
+            speaker_id=metadata.respondent,
+            speaker_role=metadata.role,
+            question_no=qa.question_no,
+            question_text=qa.question,
+            interview_id=metadata.interview_id,
+            base_line_no=qa.line_no,
+        )
+
+    def _sync_section(
+        self,
+        utterances: List[Utterance],
+        old_qa: QASection,
+        qa: QASection,
+        metadata: InterviewMetadata,
+    ) -> None:
+        """再利用する発話の属性を新しいセクション・メタデータに合わせる（_split_section と同じ値）"""
+        shift = qa.line_no - old_qa.line_no
+        for u in utterances:
+            u.speaker_id = metadata.respondent
+            u.speaker_role = metadata.role
+            u.question_no = qa.question_no
+            u.question_text = qa.question
+            u.interview_id = metadata.interview_id
+            u.line_no += shift
+
     def save_marts(
         self,
         result: InsightInterviewResult,
         output_path: str,
         observed_at: Optional[str] = None,
+        dedup: bool = False,
+        fields: Optional[List[str]] = None,
     ) -> None:
         """
-        マートをJSONL形式で保存
+        マートをJSONL形式で保存（マートの dict を組み立てずに直接書き出す）
 
         Args:
             result: 処理結果
             output_path: 出力パス
             observed_at: 観測日
+            dedup: 類似発話を集約し、代表のみを frequency 付きで出力するか
+            fields: 出力するフィールド（None=すべて）
         """
-        observed_at = observed_at or datetime.now().strftime("%Y-%m-%d")
         path = Path(output_path)
         path.parent.mkdir(parents=True, exist_ok=True)
 
+        frequencies = None
+        if dedup:
+            frequencies = cluster_frequencies(cluster_result(result.classification))
         with open(path, "w", encoding="utf-8") as f:
-            for item in result.items:
-                mart = generate_pivot_insight_mart(item, observed_at)
-                f.write(json.dumps(mart, ensure_ascii=False) + "\n")
+            write_insight_marts(f, result.items, observed_at, frequencies, fields)
 
     def save_summary_mart(
         self,
@@ -612,6 +754,7 @@ class InsightInterviewEngine:
         period_start: str,
         period_end: str,
         period_type: str = "daily",
+        dedup: bool = False,
     ) -> None:
         """
         サマリーマートを保存
@@ -622,24 +765,84 @@ class InsightInterviewEngine:
             period_start: 期間開始日
             period_end: 期間終了日
             period_type: 期間タイプ
+            dedup: 上位アイテムを類似発話の代表に絞り、frequency を付与するか
         """
         path = Path(output_path)
         path.parent.mkdir(parents=True, exist_ok=True)
 
+        frequencies = None
+        if dedup:
+            frequencies = cluster_frequencies(cluster_result(result.classification))
+
         summary = generate_pivot_summary_mart(
             result.classification,
             period_start,
             period_end,
             period_type,
+            frequencies=frequencies,
         )
 
         with open(path, "w", encoding="utf-8") as f:
             json.dump(summary, f, ensure_ascii=False, indent=2)
 
+    def save_to_store(
+        self,
+        result: InsightInterviewResult,
+        store,
+        observed_at: Optional[str] = None,
+        dedup: bool = False,
+    ) -> int:
+        """
+        マートをマートストア（観測日・Voiceで分割）に追記
+
+        Args:
+            result: 処理結果
+            store: MartStore またはストアのディレクトリ
+            observed_at: 観測日
+            dedup: 類似発話を集約し、代表のみを frequency 付きで出力するか
+
+        Returns:
+            int: 追記した件数
+        """
+        from .store import MartStore
+
+        if not isinstance(store, MartStore):
+            store = MartStore(store)
+        return store.write(self.iter_marts(result, observed_at, dedup=dedup))
+
+    def save_to_repository(
+        self,
+        result: InsightInterviewResult,
+        repository,
+        observed_at: Optional[str] = None,
+        dedup: bool = False,
+    ) -> int:
+        """
+        マートを SQLite リポジトリに保存（同じ id のマートは置き換え）
+
+        Args:
+            result: 処理結果
+            repository: InsightRepository またはデータベースファイルのパス
+            observed_at: 観測日
+            dedup: 類似発話を集約し、代表のみを frequency 付きで出力するか
+
+        Returns:
+            int: 保存した件数
+        """
+        from .repository import InsightRepository
+
+        if not isinstance(repository, InsightRepository):
+            with InsightRepository(repository) as repo:
+                return repo.upsert_marts(self.iter_marts(result, observed_at, dedup=dedup))
+        return repository.upsert_marts(self.iter_marts(result, observed_at, dedup=dedup))
+
     def iter_marts(
         self,
         result: InsightInterviewResult,
         observed_at: Optional[str] = None,
+        dedup: bool = False,
+        fields: Optional[List[str]] = None,
+        lazy: bool = False,
     ) -> Iterator[Dict]:
         """
         マートをイテレート
@@ -647,14 +850,27 @@ class InsightInterviewEngine:
         Args:
             result: 処理結果
             observed_at: 観測日
+            dedup: 類似発話を集約し、代表のみを frequency 付きで出力するか
+            fields: 出力するフィールド（None=すべて）
+            lazy: dict の代わりに InsightMartView（アクセス時にフィールドを生成）を返すか
 
         Yields:
             Dict: マートアイテム
         """
         observed_at = observed_at or datetime.now().strftime("%Y-%m-%d")
+        if fields is not None:
+            fields = mart_fields(fields)
+        build = InsightMartView if lazy else generate_pivot_insight_mart
+
+        if not dedup:
+            for item in result.items:
+                yield build(item, observed_at, 1, fields)
+            return
 
+        frequencies = cluster_frequencies(cluster_result(result.classification))
         for item in result.items:
-            yield generate_pivot_insight_mart(item, observed_at)
+            if item.id in frequencies:
+                yield build(item, observed_at, frequencies[item.id], fields)
 
 
 # ========================================
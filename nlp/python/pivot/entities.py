@@ -0,0 +1,260 @@
+"""
+PIVOT Entity Normalization - 対象軸（Process / Tool / People）の正規化
+
+_extract_layers の抽出値は正規表現のキャプチャそのままのため、
+「工程管理」「の工程管理」「Excelでの工程管理」が別のキーとして集計される。
+本モジュールは抽出値を正規名（canonical）に変換し、集計キーを統一する。
+
+正規化の手順:
+    1. NFKC 正規化、句読点・空白で区切られた最後の断片の採用、記号の除去
+       例: "そうですね、生産管理" → "生産管理"
+    2. 別名テーブルの照合（接尾辞一致の最長マッチ。一致箇所の直前が
+       助詞・記号の境界か文頭の場合のみ採用）
+       例: "Excelでの工程管理" → "工程管理"、"エクセル" → "Excel"
+    3. 別名に一致しない場合は、先頭の助詞と、最後の格助詞（「での」「で」「を」等。
+       直後が漢字・カタカナ・英数字）までを除去し、「その」「この」等の連体詞を除去
+       名詞句を作る「の」は文中では区切らない
+       連体修飾（「〜た」「〜る」）も除去
+       例: "の在庫管理" → "在庫管理"、"Excelで工程管理" → "工程管理"、
+           "Excelを使った工程管理" → "工程管理"、
+           "その棚卸作業" → "棚卸作業"、"請求書の発行処理" → そのまま
+    4. 正規名を sys.intern で共有（全集計で同一の文字列オブジェクトを使う）
+
+PIVOTClassifier / InsightInterviewEngine では normalize_entities=True で有効になる
+（既定は無効。有効にすると target_layers・by_process・by_tool のキーが正規名になる）。
+正規名の整数IDによる集計は codes.InsightCodes（対象軸ごとの SymbolTable）で行う。
+
+別名テーブルには同じものを指すことが確実な表記だけを載せる。「担当」（担当業務・担当部署）や
+「外注先」（委託先の組織）のように、正規名と意味がずれうる語は載せない。
+
+別名テーブルは辞書（Lexicon）の "entity_aliases" で管理する:
+    {"tool": {"Excel": ["エクセル", "excel"], ...}, "process": {...}}
+
+使用例:
+    from nlp.python.pivot import PIVOTClassifier
+    from nlp.python.pivot.codes import InsightCodes
+    from nlp.python.pivot.entities import EntityNormalizer
+
+    normalizer = EntityNormalizer()
+    normalizer.normalize("process", "Excelでの工程管理")   # => "工程管理"
+
+    classifier = PIVOTClassifier(normalize_entities=True)
+    codes = InsightCodes.from_insights(classifier.classify(utterances).items)
+    codes.symbols["tool"].get("Excel")   # => 正規名 "Excel" の整数ID
+"""
+
+import re
+import sys
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+
+# 組み込みの別名テーブル（層 → 正規名 → 別名）
+ENTITY_ALIASES: Dict[str, Dict[str, List[str]]] = {
+    "process": {
+        "棚卸": ["棚卸し", "たな卸", "棚おろし"],
+        "勤怠管理": ["勤怠の管理"],
+        "在庫管理": ["在庫の管理"],
+        "工程管理": ["工程の管理"],
+    },
+    "tool": {
+        "Excel": ["エクセル", "excel", "EXCEL"],
+        "Word": ["ワード", "word"],
+        "PowerPoint": ["パワポ", "パワーポイント", "powerpoint"],
+        "Googleスプレッドシート": ["グーグルスプレッドシート", "Google Sheets"],
+        "kintone": ["キントーン", "Kintone"],
+        "Salesforce": ["セールスフォース", "salesforce"],
+        "Slack": ["スラック", "slack"],
+        "Teams": ["チームズ", "MS Teams", "Microsoft Teams"],
+        "Zoom": ["ズーム", "zoom"],
+        "メール": ["Eメール", "電子メール", "e-mail", "Email", "email"],
+        "FAX": ["ファックス", "ファクス", "fax", "Fax"],
+    },
+    "people": {
+        "担当者": ["担当の方"],
+        "外注": ["外部委託"],
+    },
+}
+
+# 文の区切り（キャプチャが文をまたいだ場合は最後の断片を採用）
+_BREAK = re.compile(r"[\s。、，．,.!?！？:：;；]+")
+
+# 除去する空白・記号
+_STRIP = re.compile(r"[\s「」『』（）()【】\[\]<>＜＞\"'“”‘’。、，．,.!?！？:：;；]+")
+
+# 境界とみなす助詞（長いものから照合）
+_PARTICLES = (
+    "における", "について", "に関する", "からの", "までの", "での", "への", "との",
+    "の", "で", "を", "が", "は", "に", "と", "や", "も", "へ",
+)
+
+# 文中で区切らない助詞（名詞句「請求書の発行」を分断しない）
+_PHRASE_PARTICLES = ("の",)
+
+# 連体形の語尾（「使った工程管理」「管理する帳票」の修飾部を除去）
+_ATTRIBUTIVE_ENDINGS = ("た", "る")
+
+# 文中で区切る場合に残す最小文字数（「在庫を管理」→「管理」のような過剰な切り詰めを防ぐ）
+_MIN_TAIL = 3
+
+# 先頭から除去する連体詞・指示語
+_PREFIXES = ("いわゆる", "この", "その", "あの", "どの", "例の")
+
+_HIRAGANA = re.compile(r"[ぁ-ゟ]")
+
+# 正規化結果キャッシュの上限件数（超えたら破棄）
+_CACHE_LIMIT = 100_000
+_MISSING = object()
+
+
+def _is_hiragana(ch: str) -> bool:
+    return bool(_HIRAGANA.match(ch))
+
+
+# ========================================
+# 接尾辞トライ
+# ========================================
+
+class SuffixTrie:
+    """別名を逆順に格納したトライ（接尾辞の最長一致用）"""
+
+    _END = ""  # 終端キー（値は正規名）
+
+    def __init__(self):
+        self._root: Dict[str, Dict] = {}
+        self.size = 0
+
+    def insert(self, alias: str, canonical: str) -> None:
+        node = self._root
+        for ch in reversed(alias):
+            node = node.setdefault(ch, {})
+        if self._END not in node:
+            self.size += 1
+        node[self._END] = canonical
+
+    def suffix_matches(self, text: str) -> List[Tuple[int, str]]:
+        """text の接尾辞に一致する別名を (開始位置, 正規名) で長い順に返す"""
+        matches = []
+        node = self._root
+        for i in range(len(text) - 1, -1, -1):
+            node = node.get(text[i])
+            if node is None:
+                break
+            if self._END in node:
+                matches.append((i, node[self._END]))
+        matches.reverse()
+        return matches
+
+
+# ========================================
+# 正規化
+# ========================================
+
+class EntityNormalizer:
+    """対象軸の抽出値を正規名に変換"""
+
+    LAYERS = ("process", "tool", "people")
+
+    def __init__(self, aliases: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        """
+        Args:
+            aliases: 別名テーブル（層 → 正規名 → 別名、None=組み込みテーブル）
+        """
+        self.aliases = ENTITY_ALIASES if aliases is None else aliases
+        self._tries: Dict[str, SuffixTrie] = {}
+        for layer, table in self.aliases.items():
+            trie = SuffixTrie()
+            for canonical, names in table.items():
+                trie.insert(self._clean(canonical), canonical)
+                for name in names:
+                    trie.insert(self._clean(name), canonical)
+            self._tries[layer] = trie
+        self._cache: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def normalize(self, layer: str, value: Optional[str]) -> Optional[str]:
+        """
+        抽出値を正規名に変換
+
+        Args:
+            layer: "process" / "tool" / "people"
+            value: 抽出値（None=未抽出）
+
+        Returns:
+            Optional[str]: 正規名（intern 済み）。空になった場合は None
+        """
+        if not value:
+            return None
+        # 複数スレッドから呼ばれるため、キャッシュは取得した参照に対してのみ操作する
+        # （他スレッドが上限到達で差し替えても、判定と取得の間に消えない）
+        key = (layer, value)
+        cache = self._cache
+        canonical = cache.get(key, _MISSING)
+        if canonical is not _MISSING:
+            return canonical
+        canonical = self._normalize(layer, value)
+        if canonical is not None:
+            canonical = sys.intern(canonical)
+        if len(cache) >= _CACHE_LIMIT:
+            cache = self._cache = {}
+        cache[key] = canonical
+        return canonical
+
+    def normalize_layers(self, layers: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+        """対象軸の辞書をまとめて正規化"""
+        return {layer: self.normalize(layer, value) for layer, value in layers.items()}
+
+    def _clean(self, text: str) -> str:
+        return _STRIP.sub("", unicodedata.normalize("NFKC", text))
+
+    def _normalize(self, layer: str, value: str) -> Optional[str]:
+        fragments = [f for f in _BREAK.split(unicodedata.normalize("NFKC", value)) if f]
+        text = self._clean(fragments[-1]) if fragments else ""
+        if len(text) < 2:
+            text = self._clean(value)
+        if not text:
+            return None
+
+        # 別名テーブル（境界で始まる最長の接尾辞）
+        trie = self._tries.get(layer)
+        if trie is not None:
+            for start, canonical in trie.suffix_matches(text):
+                if start == 0 or text[:start].endswith(_PARTICLES):
+                    return canonical
+
+        text = self._strip_leading(text)
+        if trie is not None:
+            matches = trie.suffix_matches(text)
+            if matches and matches[0][0] == 0:
+                return matches[0][1]
+        return text or None
+
+    def _strip_leading(self, text: str) -> str:
+        """先頭の助詞・最後の格助詞までと、先頭の連体詞を除去"""
+        # 先頭の助詞（キャプチャが助詞から始まる場合）
+        for particle in _PARTICLES:
+            rest = text[len(particle):]
+            if text.startswith(particle) and len(rest) >= 2 and not _is_hiragana(rest[0]):
+                text = rest
+                break
+
+        # 文中の最後の格助詞
+        cut = 0
+        for i in range(1, len(text) - _MIN_TAIL + 1):
+            if _is_hiragana(text[i]):
+                continue
+            if text[i - 1] in _ATTRIBUTIVE_ENDINGS and i > 1:
+                cut = i
+                continue
+            for particle in _PARTICLES:
+                if particle in _PHRASE_PARTICLES:
+                    continue
+                if text.startswith(particle, i - len(particle)) and i - len(particle) > 0:
+                    cut = i
+                    break
+        text = text[cut:]
+
+        for prefix in _PREFIXES:
+            if text.startswith(prefix) and len(text) - len(prefix) >= 2:
+                text = text[len(prefix):]
+                break
+        return text
@@ -0,0 +1,290 @@
+"""
+PIVOT Feature Export - 品詞分解・キーワード信号の特徴量行列化
+
+MorphologyAnalyzer と PIVOTClassifier が発話ごとに算出する信号
+（動詞カテゴリ・センチメント件数・程度/頻度係数・語尾タイプ・
+Voice別キーワード/パターンヒット）を、固定の列スキーマを持つ
+数値行列として一括出力する。ルールエンジンの判定結果をラベルとして
+同時に出力するため、再トークナイズなしでオフライン学習・評価に使える。
+
+列スキーマ:
+    dense ブロック  … 集計値（件数・係数・one-hot）
+    lexicon ブロック … 辞書エントリごとのヒット（疎）
+        verb:<語>, adj:<語>, adv:<語>, kw:<Voice>:<語>, pat:<Voice>:<番号>
+
+    列の並びは辞書定義順で決まり、schema_id（列名のハッシュ）で
+    互換性を確認できる。
+
+NumPy はオプション依存（pip install numpy）。scipy があれば
+to_scipy() で scipy.sparse.csr_matrix に変換できる。
+
+使用例:
+    from nlp.python.pivot.features import FeatureExtractor
+
+    extractor = FeatureExtractor()
+    fm = extractor.extract(texts)
+
+    X = fm.to_dense()         # (N, n_features)
+    y = fm.labels             # ルールエンジンのVoice（PIVOT.ALL のインデックス, -1=判定なし）
+    fm.save("features.npz")
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .classifier import PIVOT, PIVOTClassifier
+from .lexicon import Lexicon
+from .morphology import (
+    MorphologyResult,
+    Sentiment,
+    VerbCategory,
+    infer_pivot_from_morphology,
+)
+from .scoring import _require_numpy, np
+
+
+# 特徴量スキーマのバージョン（列の意味を変更した場合に更新）
+FEATURE_SCHEMA_VERSION = 1
+
+_VERB_CATEGORIES = [c for c in VerbCategory if c != VerbCategory.NEUTRAL]
+_SENTIMENTS = [Sentiment.POSITIVE, Sentiment.NEGATIVE, Sentiment.ANXIETY]
+
+
+def _dense_columns(lexicon: Lexicon) -> List[str]:
+    """集計値ブロックの列名"""
+    columns = [f"verb_cat:{c.name}" for c in _VERB_CATEGORIES]
+    columns += [f"sent:{s.value}" for s in _SENTIMENTS]
+    columns += ["sentiment_score", "degree_factor", "frequency_factor", "certainty"]
+    columns += ["tail:none"] + [f"tail:{t}" for t in dict.fromkeys(tp.type for tp in lexicon.tail_patterns)]
+    columns += [f"tail_pivot:{p}" for p in PIVOT.ALL]
+    columns += [f"kw_hits:{p}" for p in PIVOT.ALL]
+    columns += [f"pat_hits:{p}" for p in PIVOT.ALL]
+    columns += [f"pivot_score:{p}" for p in PIVOT.ALL]
+    columns += [f"morph_pivot:{p}" for p in PIVOT.ALL]
+    columns += ["morph_confidence", "length"]
+    return columns
+
+
+def _lexicon_columns(lexicon: Lexicon) -> List[str]:
+    """辞書エントリブロックの列名"""
+    columns = [f"verb:{w}" for w in lexicon.verb_to_category]
+    columns += [f"adj:{w}" for w in lexicon.adjective_to_sentiment]
+    columns += [f"adv:{w}" for w in dict.fromkeys([*lexicon.adverb_to_degree, *lexicon.adverb_to_frequency])]
+    for p in PIVOT.ALL:
+        columns += [f"kw:{p}:{w}" for w in lexicon.pivot_keywords[p]["keywords"]]
+    for p in PIVOT.ALL:
+        columns += [f"pat:{p}:{i}" for i in range(len(lexicon.pivot_keywords[p]["patterns"]))]
+    return columns
+
+
+# ========================================
+# 型定義
+# ========================================
+
+@dataclass
+class FeatureMatrix:
+    """特徴量行列（CSR形式）"""
+    columns: List[str]
+    indptr: "np.ndarray"       # int64, shape (N+1,)
+    indices: "np.ndarray"      # int32
+    values: "np.ndarray"       # float32
+    labels: "np.ndarray"       # int8: ルールエンジンのVoice（-1=判定なし）
+    label_confidence: "np.ndarray"  # float32
+    schema_id: str
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.indptr) - 1, len(self.columns)
+
+    def to_dense(self) -> "np.ndarray":
+        """密行列に変換"""
+        _np = _require_numpy()
+        n_rows, n_cols = self.shape
+        dense = _np.zeros((n_rows, n_cols), dtype=_np.float32)
+        rows = _np.repeat(_np.arange(n_rows), _np.diff(self.indptr))
+        dense[rows, self.indices] = self.values
+        return dense
+
+    def to_scipy(self):
+        """scipy.sparse.csr_matrix に変換（scipy が必要）"""
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.values, self.indices, self.indptr), shape=self.shape)
+
+    def save(self, path: str) -> None:
+        """npz形式で保存"""
+        _np = _require_numpy()
+        _np.savez_compressed(
+            path,
+            columns=_np.array(self.columns),
+            indptr=self.indptr,
+            indices=self.indices,
+            values=self.values,
+            labels=self.labels,
+            label_confidence=self.label_confidence,
+            schema_id=_np.array(self.schema_id),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureMatrix":
+        """npz形式から読み込み"""
+        _np = _require_numpy()
+        with _np.load(path) as data:
+            return cls(
+                columns=data["columns"].tolist(),
+                indptr=data["indptr"],
+                indices=data["indices"],
+                values=data["values"],
+                labels=data["labels"],
+                label_confidence=data["label_confidence"],
+                schema_id=str(data["schema_id"]),
+            )
+
+
+# ========================================
+# 特徴量抽出
+# ========================================
+
+class FeatureExtractor:
+    """発話テキストから特徴量行列を一括抽出"""
+
+    def __init__(self, classifier: Optional[PIVOTClassifier] = None):
+        """
+        Args:
+            classifier: 使用する分類器（None=品詞分解ありの既定設定）
+        """
+        self.classifier = classifier or PIVOTClassifier()
+        # 列スキーマは辞書に依存するため、抽出器の生成時点の辞書に固定する
+        self.lexicon, self.analyzer = self.classifier._rules()
+
+        self.dense_columns = _dense_columns(self.lexicon)
+        self.lexicon_columns = _lexicon_columns(self.lexicon)
+        self.columns = self.dense_columns + self.lexicon_columns
+        self.column_index: Dict[str, int] = {c: i for i, c in enumerate(self.columns)}
+        self.schema_id = hashlib.sha1(
+            "\n".join([str(FEATURE_SCHEMA_VERSION), *self.columns]).encode("utf-8")
+        ).hexdigest()[:12]
+
+        # パターン文字列 → 列インデックス
+        self._pattern_index = {
+            (p, pattern): self.column_index[f"pat:{p}:{i}"]
+            for p in PIVOT.ALL
+            for i, pattern in enumerate(self.lexicon.pivot_keywords[p]["patterns"])
+        }
+
+    def extract(self, texts: Iterable[str]) -> FeatureMatrix:
+        """
+        テキスト群の特徴量行列を生成
+
+        Args:
+            texts: 発話テキスト
+
+        Returns:
+            FeatureMatrix: 特徴量行列とルールエンジンのラベル
+        """
+        _np = _require_numpy()
+        indptr = [0]
+        indices: List[int] = []
+        values: List[float] = []
+        labels: List[int] = []
+        label_conf: List[float] = []
+
+        for text in texts:
+            row, label, confidence = self.extract_row(text or "")
+            for col in sorted(row):
+                indices.append(col)
+                values.append(row[col])
+            indptr.append(len(indices))
+            labels.append(label)
+            label_conf.append(confidence)
+
+        return FeatureMatrix(
+            columns=list(self.columns),
+            indptr=_np.array(indptr, dtype=_np.int64),
+            indices=_np.array(indices, dtype=_np.int32),
+            values=_np.array(values, dtype=_np.float32),
+            labels=_np.array(labels, dtype=_np.int8),
+            label_confidence=_np.array(label_conf, dtype=_np.float32),
+            schema_id=self.schema_id,
+        )
+
+    def extract_row(self, text: str) -> Tuple[Dict[int, float], int, float]:
+        """
+        1発話の特徴量（非ゼロ列のみ）とルールエンジンの判定を算出
+
+        Returns:
+            ({列インデックス: 値}, ラベル, 信頼度)
+        """
+        col = self.column_index
+        row: Dict[int, float] = {}
+
+        def put(name: str, value: float) -> None:
+            if value:
+                row[col[name]] = float(value)
+
+        morphology: Optional[MorphologyResult] = None
+        if self.analyzer is not None and text.strip():
+            morphology = self.analyzer.analyze(text)
+            self._put_morphology(morphology, put)
+
+        pivot_scores = self.classifier._score_pivots(text, self.lexicon) if text.strip() else {}
+        for p, (score, matched_kw, matched_pat) in pivot_scores.items():
+            put(f"pivot_score:{p}", score)
+            put(f"kw_hits:{p}", len(matched_kw))
+            put(f"pat_hits:{p}", len(matched_pat))
+            for kw in matched_kw:
+                put(f"kw:{p}:{kw}", 1)
+            for pattern in matched_pat:
+                row[self._pattern_index[(p, pattern)]] = 1.0
+        put("length", len(text))
+
+        label, confidence = -1, 0.0
+        if text.strip():
+            decision = self.classifier._decide_voice(text, morphology, pivot_scores, self.lexicon)
+            if decision:
+                label, confidence = PIVOT.ALL.index(decision[0]), decision[1]
+
+        return row, label, confidence
+
+    def _put_morphology(self, result: MorphologyResult, put) -> None:
+        """品詞分解の信号を格納"""
+        for category in result.verb_categories:
+            put(f"verb_cat:{category.name}", result.verb_categories.count(category))
+        for sentiment in _SENTIMENTS:
+            put(f"sent:{sentiment.value}", sum(1 for a in result.adjectives if a.sentiment == sentiment))
+        put("sentiment_score", result.sentiment_score)
+        put("degree_factor", result.degree_factor)
+        put("frequency_factor", result.frequency_factor)
+        put("certainty", result.certainty)
+        put(f"tail:{result.tail.type}" if result.tail else "tail:none", 1)
+        if result.pivot_tendency:
+            put(f"tail_pivot:{result.pivot_tendency}", 1)
+
+        for verb in result.verbs:
+            put(f"verb:{verb.base}", 1)
+        for adj in result.adjectives:
+            put(f"adj:{adj.base or adj.surface}", 1)
+        for adv in result.adverbs:
+            put(f"adv:{adv.base or adv.surface}", 1)
+
+        morph_pivot, morph_conf, _ = infer_pivot_from_morphology(result)
+        if morph_pivot:
+            put(f"morph_pivot:{morph_pivot}", 1)
+            put("morph_confidence", morph_conf)
+
+
+def extract_features(
+    texts: Iterable[str],
+    domain: Optional[str] = None,
+) -> FeatureMatrix:
+    """
+    シンプルなインターフェース
+
+    Args:
+        texts: 発話テキスト
+        domain: 業務ドメイン
+
+    Returns:
+        FeatureMatrix: 特徴量行列
+    """
+    return FeatureExtractor(PIVOTClassifier(domain=domain)).extract(texts)
@@ -0,0 +1,488 @@
+"""
+PIVOT Lexicon Store - バージョン付き辞書とホットスワップ
+
+品詞分解・PIVOT分類で使用する辞書群
+（VERB_CATEGORY_DICT, ADJECTIVE_SENTIMENT_DICT, DEGREE_ADVERBS, FREQUENCY_ADVERBS,
+TAIL_PATTERNS, PIVOT_KEYWORDS, LAYER_PATTERNS, TEMPERATURE_INDICATORS）を
+外部のJSONファイルとして管理し、照合用の構造（逆引き辞書・コンパイル済み正規表現）に
+変換する。
+
+辞書ファイル形式 (JSON / .json.gz):
+    {
+      "version": "2025.03.1",
+      "description": "...",
+      "verbs": {"OBSTACLE": ["止まる", ...], ...},          # VerbCategory 名
+      "adjectives": {"negative": ["遅い", ...], ...},       # Sentiment 値
+      "degree_adverbs": {"1.5": ["非常に", ...], ...},      # 係数 → 副詞
+      "frequency_adverbs": {"1.5": ["いつも", ...], ...},
+      "tail_patterns": [{"pattern": "...", "certainty": 1.0,
+                         "type": "assertion", "pivot_tendency": "P"}, ...],
+      "pivot_keywords": {"P": {"keywords": [...], "patterns": [...]}, ...},
+      "layer_patterns": {"process": {"keywords": [...], "patterns": [...],
+                                     "extraction_patterns": [...]}, ...},
+      "temperature_indicators": {"high": [...], "medium": [...], "low": [...]},
+      "entity_aliases": {"tool": {"Excel": ["エクセル", ...]}, ...}   # 省略可
+    }
+
+ホットスワップ:
+    LexiconStore は現在の Lexicon への参照を保持する。新しい辞書は読み込み・
+    コンパイルを終えてから参照を差し替えるため、処理中のバッチは開始時に取得した
+    辞書のまま完了し、以降のバッチから新しい辞書が使われる。
+    分類結果には辞書の version_id（バージョン+内容ハッシュ）が記録される。
+
+使用例:
+    from nlp.python.pivot import PIVOTClassifier
+    from nlp.python.pivot.lexicon import Lexicon, LexiconStore
+
+    Lexicon.builtin().save("lexicon/pivot-lexicon.json")   # 組み込み辞書を書き出し
+
+    store = LexiconStore("lexicon/pivot-lexicon.json")
+    classifier = PIVOTClassifier(lexicon=store)
+    store.start_watching(interval=5.0)   # ファイル更新を検知して自動で差し替え
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .entities import ENTITY_ALIASES, EntityNormalizer
+from .regex_safety import RegexSafety, required_literals
+from .morphology import (
+    ADJECTIVE_SENTIMENT_DICT,
+    DEGREE_ADVERBS,
+    FREQUENCY_ADVERBS,
+    TAIL_PATTERNS,
+    VERB_CATEGORY_DICT,
+    Sentiment,
+    TailPattern,
+    VerbCategory,
+)
+
+
+# 組み込み辞書のバージョン名
+BUILTIN_VERSION = "builtin"
+
+
+# ========================================
+# 辞書
+# ========================================
+
+@dataclass
+class Lexicon:
+    """バージョン付き辞書（構築時に照合用構造へコンパイル）"""
+    version: str
+    verbs: Dict[VerbCategory, List[str]]
+    adjectives: Dict[Sentiment, List[str]]
+    degree_adverbs: Dict[float, List[str]]
+    frequency_adverbs: Dict[float, List[str]]
+    tail_patterns: List[TailPattern]
+    pivot_keywords: Dict[str, Dict[str, List[str]]]
+    layer_patterns: Dict[str, Dict[str, List[str]]]
+    temperature_indicators: Dict[str, List[str]]
+    description: str = ""
+    entity_aliases: Dict[str, Dict[str, List[str]]] = field(default_factory=dict)
+    # 正規表現の安全モード（辞書の内容には含めない。guarded() で指定）
+    regex_safety: Optional[RegexSafety] = field(default=None, repr=False, compare=False)
+
+    # コンパイル済み構造（__post_init__ で生成）
+    checksum: str = field(init=False, default="")
+    verb_to_category: Dict[str, VerbCategory] = field(init=False, repr=False, default_factory=dict)
+    adjective_to_sentiment: Dict[str, Sentiment] = field(init=False, repr=False, default_factory=dict)
+    adverb_to_degree: Dict[str, float] = field(init=False, repr=False, default_factory=dict)
+    adverb_to_frequency: Dict[str, float] = field(init=False, repr=False, default_factory=dict)
+    compiled_tail_patterns: List[Tuple[re.Pattern, TailPattern]] = field(init=False, repr=False, default_factory=list)
+    compiled_tail_literals: List[Optional[Tuple[str, ...]]] = field(init=False, repr=False, default_factory=list)
+    compiled_pivot_patterns: Dict[str, List[re.Pattern]] = field(init=False, repr=False, default_factory=dict)
+    # パターンがマッチするために本文に含まれている必要があるリテラル（いずれか1つ、None=不明）
+    compiled_pivot_literals: Dict[str, List[Optional[Tuple[str, ...]]]] = field(
+        init=False, repr=False, default_factory=dict
+    )
+    compiled_layer_patterns: Dict[str, Dict[str, List]] = field(init=False, repr=False, default_factory=dict)
+    compiled_layer_keywords: Dict[str, Optional[re.Pattern]] = field(init=False, repr=False, default_factory=dict)
+    compiled_mention_pattern: Optional[re.Pattern] = field(init=False, repr=False, default=None)
+    # 見出し → その見出しの中に現れる見出し（自身を含む）と開始位置（全出現）
+    compiled_mention_nested: Dict[str, Tuple[Tuple[str, int], ...]] = field(
+        init=False, repr=False, default_factory=dict
+    )
+    # 見出し → マッチ後に走査を再開する見出し内の位置（重なる見出しがなければ見出しの長さ）
+    compiled_mention_resume: Dict[str, int] = field(init=False, repr=False, default_factory=dict)
+    # 品詞（verb / adjective / adverb）ごとの見出しの定義順
+    compiled_word_ranks: Dict[str, Dict[str, int]] = field(init=False, repr=False, default_factory=dict)
+    entity_normalizer: Optional[EntityNormalizer] = field(init=False, repr=False, default=None)
+    _guarded: Dict[RegexSafety, "Lexicon"] = field(init=False, repr=False, compare=False, default_factory=dict)
+
+    def __post_init__(self):
+        self.checksum = hashlib.sha256(
+            json.dumps(self.to_dict(), ensure_ascii=False, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        self._compile()
+
+    @property
+    def version_id(self) -> str:
+        """出力に記録する識別子（バージョン+内容ハッシュ）"""
+        return f"{self.version}+{self.checksum[:8]}"
+
+    def _compile(self) -> None:
+        """逆引き辞書と正規表現を構築"""
+        for category, verbs in self.verbs.items():
+            for verb in verbs:
+                self.verb_to_category[verb] = category
+        for sentiment, adjectives in self.adjectives.items():
+            for adj in adjectives:
+                self.adjective_to_sentiment[adj] = sentiment
+        for factor, adverbs in self.degree_adverbs.items():
+            for adv in adverbs:
+                self.adverb_to_degree[adv] = factor
+        for factor, adverbs in self.frequency_adverbs.items():
+            for adv in adverbs:
+                self.adverb_to_frequency[adv] = factor
+
+        self.compiled_tail_patterns = [
+            (self._rule(tp.pattern, "tail_patterns"), tp) for tp in self.tail_patterns
+        ]
+        self.compiled_tail_literals = [required_literals(tp.pattern) for tp in self.tail_patterns]
+        self.compiled_pivot_patterns = {
+            pivot: [self._rule(p, f"pivot_keywords.{pivot}") for p in config.get("patterns", [])]
+            for pivot, config in self.pivot_keywords.items()
+        }
+        self.compiled_pivot_literals = {
+            pivot: [required_literals(p) for p in config.get("patterns", [])]
+            for pivot, config in self.pivot_keywords.items()
+        }
+        self.compiled_layer_patterns = {
+            layer: {
+                "patterns": [self._rule(p, f"layer_patterns.{layer}") for p in config.get("patterns", [])],
+                "extraction": [
+                    AnchoredPattern.compile(self._rule(p, f"layer_patterns.{layer}"))
+                    for p in config.get("extraction_patterns", [])
+                ],
+            }
+            for layer, config in self.layer_patterns.items()
+        }
+        # 層ごとのキーワード有無判定（1回の走査で全キーワードを照合）
+        self.compiled_layer_keywords = {
+            layer: re.compile("|".join(map(re.escape, config["keywords"]))) if config.get("keywords") else None
+            for layer, config in self.layer_patterns.items()
+        }
+        # 動詞・形容詞・副詞の出現位置（1回の走査で最長一致。長い見出しを先に試す）
+        words = sorted(
+            {w for table in (self.verb_to_category, self.adjective_to_sentiment,
+                             self.adverb_to_degree, self.adverb_to_frequency) for w in table if w},
+            key=lambda w: (-len(w), w),
+        )
+        self.compiled_mention_pattern = re.compile("|".join(map(re.escape, words))) if words else None
+        self.compiled_mention_nested = {
+            word: tuple(
+                (other, i) for other in words if other in word
+                for i in range(len(word) - len(other) + 1) if word.startswith(other, i)
+            )
+            for word in words
+        }
+        # 見出しの途中から始まり、見出しの外へ続く別の見出しがありうる最初の位置
+        prefixes = {w[:i] for w in words for i in range(1, len(w))}
+        self.compiled_mention_resume = {
+            word: next((i for i in range(1, len(word)) if word[i:] in prefixes), len(word))
+            for word in words
+        }
+        self.compiled_word_ranks = {
+            kind: {w: rank for rank, w in enumerate(table)}
+            for kind, table in (
+                ("verb", self.verb_to_category),
+                ("adjective", self.adjective_to_sentiment),
+                ("adverb", dict.fromkeys([*self.adverb_to_degree, *self.adverb_to_frequency])),
+            )
+        }
+        self.entity_normalizer = EntityNormalizer(self.entity_aliases)
+
+    def _rule(self, pattern: str, where: str):
+        """ルールの正規表現をコンパイル（安全モードでは高コストなパターンを保護）"""
+        regex = _compile(pattern, where)
+        if self.regex_safety is not None:
+            return self.regex_safety.guard(regex)
+        return regex
+
+    def guarded(self, safety: Optional[RegexSafety]) -> "Lexicon":
+        """
+        同じ内容で正規表現の安全モードを適用した辞書（設定ごとに1度だけ構築）
+
+        Args:
+            safety: 安全モード設定（None=この辞書そのもの）
+        """
+        if safety is None or safety == self.regex_safety:
+            return self
+        lexicon = self._guarded.get(safety)
+        if lexicon is None:
+            # 同時に構築した場合も setdefault で先に登録した方に揃える
+            lexicon = self._guarded.setdefault(safety, replace(self, regex_safety=safety))
+        return lexicon
+
+    # ----------------------------------------
+    # 生成・入出力
+    # ----------------------------------------
+
+    @classmethod
+    def builtin(cls) -> "Lexicon":
+        """モジュール定義の組み込み辞書"""
+        from .classifier import LAYER_PATTERNS, PIVOT_KEYWORDS, TEMPERATURE_INDICATORS
+        return cls(
+            version=BUILTIN_VERSION,
+            description="組み込み辞書",
+            verbs=VERB_CATEGORY_DICT,
+            adjectives=ADJECTIVE_SENTIMENT_DICT,
+            degree_adverbs=DEGREE_ADVERBS,
+            frequency_adverbs=FREQUENCY_ADVERBS,
+            tail_patterns=TAIL_PATTERNS,
+            pivot_keywords=PIVOT_KEYWORDS,
+            layer_patterns=LAYER_PATTERNS,
+            temperature_indicators=TEMPERATURE_INDICATORS,
+            entity_aliases=ENTITY_ALIASES,
+        )
+
+    def to_dict(self) -> Dict:
+        """辞書ファイル形式に変換"""
+        return {
+            "version": self.version,
+            "description": self.description,
+            "verbs": {c.name: list(v) for c, v in self.verbs.items()},
+            "adjectives": {s.value: list(v) for s, v in self.adjectives.items()},
+            "degree_adverbs": {str(f): list(v) for f, v in self.degree_adverbs.items()},
+            "frequency_adverbs": {str(f): list(v) for f, v in self.frequency_adverbs.items()},
+            "tail_patterns": [
+                {
+                    "pattern": tp.pattern,
+                    "certainty": tp.certainty,
+                    "type": tp.type,
+                    "pivot_tendency": tp.pivot_tendency,
+                }
+                for tp in self.tail_patterns
+            ],
+            "pivot_keywords": self.pivot_keywords,
+            "layer_patterns": self.layer_patterns,
+            "temperature_indicators": self.temperature_indicators,
+            "entity_aliases": self.entity_aliases,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Lexicon":
+        """
+        辞書ファイル形式から構築
+
+        Raises:
+            ValueError: 形式が不正（未知のカテゴリ・正規表現エラー等）
+        """
+        try:
+            return cls(
+                version=str(data["version"]),
+                description=data.get("description", ""),
+                verbs={VerbCategory[k]: list(v) for k, v in data["verbs"].items()},
+                adjectives={Sentiment(k): list(v) for k, v in data["adjectives"].items()},
+                degree_adverbs={float(k): list(v) for k, v in data["degree_adverbs"].items()},
+                frequency_adverbs={float(k): list(v) for k, v in data["frequency_adverbs"].items()},
+                tail_patterns=[
+                    TailPattern(
+                        pattern=tp["pattern"],
+                        certainty=float(tp["certainty"]),
+                        type=tp["type"],
+                        pivot_tendency=tp["pivot_tendency"],
+                    )
+                    for tp in data["tail_patterns"]
+                ],
+                pivot_keywords=data["pivot_keywords"],
+                layer_patterns=data["layer_patterns"],
+                temperature_indicators=data["temperature_indicators"],
+                entity_aliases=data.get("entity_aliases", {}),
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"辞書ファイルの形式が不正です: {e!r}") from e
+
+    @classmethod
+    def load(cls, path: str) -> "Lexicon":
+        """辞書ファイル（.json / .json.gz）を読み込み"""
+        opener = gzip.open if str(path).endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path: str) -> None:
+        """辞書ファイル（.json / .json.gz）に書き出し"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        opener = gzip.open if str(path).endswith(".gz") else open
+        with opener(path, "wt", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+def _compile(pattern: str, where: str) -> re.Pattern:
+    """正規表現をコンパイル（エラー位置を明示）"""
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"{where}: 正規表現が不正です: {pattern!r} ({e})") from e
+
+
+# 前置部＋リテラル形の抽出パターン: "(.{m,n}リテラル)"
+_ANCHORABLE = re.compile(r"^\(\.\{(\d+),(\d+)\}([^\\.\[\](){}*+?|^$]+)\)$")
+
+
+class AnchoredPattern:
+    """
+    リテラル出現位置の近傍だけを検索する抽出パターン（re.Pattern 互換の search / pattern）
+
+    "(.{2,15}管理)" はリテラル「管理」を含まない限りマッチせず、マッチの開始位置は
+    最初の出現位置の高々 15 文字手前、終了位置は最後の出現位置の直後までに収まる。
+    その範囲に限って正規表現を実行するため、長い発話の全位置で前置部の
+    バックトラックが起きない。最左マッチは通常の search と同一。
+    """
+
+    def __init__(self, regex: re.Pattern, literal: str, max_prefix: int):
+        self.regex = regex
+        self.pattern = regex.pattern
+        self.literal = literal
+        self.max_prefix = max_prefix
+
+    @classmethod
+    def compile(cls, regex: re.Pattern):
+        """前置部＋リテラル形なら AnchoredPattern、それ以外はそのまま返す"""
+        m = _ANCHORABLE.match(regex.pattern)
+        if not m:
+            return regex
+        return cls(regex, m.group(3), int(m.group(2)))
+
+    def search(self, text: str):
+        first = text.find(self.literal)
+        if first < 0:
+            return None
+        end = text.rfind(self.literal) + len(self.literal)
+        return self.regex.search(text, max(0, first - self.max_prefix), end)
+
+
+_default_lexicon: Optional[Lexicon] = None
+_default_lock = threading.Lock()
+
+
+def default_lexicon() -> Lexicon:
+    """組み込み辞書（プロセス内で共有、複数スレッドから同時に呼んでも1度だけ構築）"""
+    global _default_lexicon
+    if _default_lexicon is None:
+        with _default_lock:
+            if _default_lexicon is None:
+                _default_lexicon = Lexicon.builtin()
+    return _default_lexicon
+
+
+# ========================================
+# ホットスワップ可能な辞書ストア
+# ========================================
+
+class LexiconStore:
+    """現在の辞書を保持し、アトミックに差し替えるストア"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        lexicon: Optional[Lexicon] = None,
+    ):
+        """
+        Args:
+            path: 辞書ファイルのパス（None=組み込み辞書のみ）
+            lexicon: 初期辞書（None=path から読み込み、なければ組み込み辞書）
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Lexicon], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._file_state: Optional[Tuple[float, int]] = None
+
+        if lexicon is None:
+            lexicon = self._read(path) if path else default_lexicon()
+        self._current = lexicon
+        self.history: List[str] = [lexicon.version_id]
+
+    @property
+    def current(self) -> Lexicon:
+        """現在の辞書（取得したインスタンスは差し替え後も不変）"""
+        return self._current
+
+    def swap(self, lexicon: Lexicon) -> Lexicon:
+        """
+        辞書を差し替え
+
+        Returns:
+            Lexicon: 差し替え前の辞書
+        """
+        with self._lock:
+            previous = self._current
+            self._current = lexicon
+            if lexicon.version_id != previous.version_id:
+                self.history.append(lexicon.version_id)
+        for listener in list(self._listeners):
+            listener(lexicon)
+        return previous
+
+    def load(self, path: Optional[str] = None) -> Lexicon:
+        """
+        辞書ファイルを読み込んで差し替え（読み込み失敗時は差し替えない）
+
+        Raises:
+            ValueError / OSError: 読み込み・コンパイル失敗
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("辞書ファイルのパスが指定されていません")
+        lexicon = self._read(path)
+        self.path = path
+        self.swap(lexicon)
+        return lexicon
+
+    def reload_if_changed(self) -> bool:
+        """辞書ファイルが更新されていれば差し替え"""
+        if not self.path:
+            return False
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        if (stat.st_mtime, stat.st_size) == self._file_state:
+            return False
+        self.load()
+        return True
+
+    def on_swap(self, listener: Callable[[Lexicon], None]) -> None:
+        """差し替え時のコールバックを登録"""
+        self._listeners.append(listener)
+
+    def start_watching(self, interval: float = 5.0, on_error: Optional[Callable[[Exception], None]] = None) -> None:
+        """辞書ファイルの更新監視を開始（バックグラウンドスレッド）"""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except (OSError, ValueError) as e:
+                    # 不正な辞書は適用せず、現行の辞書で処理を継続
+                    if on_error:
+                        on_error(e)
+
+        self._watcher = threading.Thread(target=watch, name="lexicon-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """更新監視を停止"""
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
+
+    def _read(self, path: str) -> Lexicon:
+        """ファイルを読み込み、更新判定用の状態を記録"""
+        stat = os.stat(path)
+        lexicon = Lexicon.load(path)
+        self._file_state = (stat.st_mtime, stat.st_size)
+        return lexicon
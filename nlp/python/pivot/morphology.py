@@ -19,11 +19,20 @@ PIVOT Morphology Engine - 品詞分解エンジン
     print(result.verbs)          # 動詞リスト
     print(result.degree_factor)  # 副詞による強度係数
     print(result.certainty)      # 語尾による確信度
+    print(result.mentions)       # 辞書見出しの出現（文字位置付き、重なりは最長優先）
+
+    # 複数テキストを一括解析（列指向の集計値付き）
+    batch = analyzer.analyze_many(texts)
+    batch.degree_factor          # array("d")。np.frombuffer で複製なしに参照できる
+    batch[0]                     # 1件目の MorphologyResult
 """
 
-import re
+import threading
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Sequence, Tuple
 from enum import Enum
 
 
@@ -214,6 +223,9 @@ class TailPattern:
     pivot_tendency: str  # P, I, V, O, T
 
 
+# 語尾の種類（MorphologyBatch.tail_type のコード順）
+TAIL_TYPES = ("assertion", "experience", "speculation", "hearsay", "desire", "negative_desire")
+
 # 語尾パターン定義
 TAIL_PATTERNS = [
     # 断定 (確信度 1.0) - Pain / Traction
@@ -255,12 +267,22 @@ TAIL_PATTERNS = [
 # 型定義
 # ========================================
 
+@dataclass
+class Mention:
+    """辞書見出しの出現（テキスト中の文字位置）"""
+    word: str          # 辞書見出し
+    surface: str       # 表層形（text[start:end]）
+    start: int
+    end: int
+
+
 @dataclass
 class VerbInfo:
     """動詞情報"""
     surface: str       # 表層形
     base: str          # 基本形（原形）
     category: VerbCategory
+    start: int = -1    # 初出の文字位置（-1=不明）
 
 
 @dataclass
@@ -268,6 +290,8 @@ class AdjectiveInfo:
     """形容詞情報"""
     surface: str       # 表層形
     sentiment: Sentiment
+    base: str = ""     # 辞書見出し（空=表層形と同じ）
+    start: int = -1    # 初出の文字位置（-1=不明）
 
 
 @dataclass
@@ -276,6 +300,8 @@ class AdverbInfo:
     surface: str       # 表層形
     degree_factor: float   # 程度係数
     frequency_factor: float  # 頻度係数
+    base: str = ""     # 辞書見出し（空=表層形と同じ）
+    start: int = -1    # 初出の文字位置（-1=不明）
 
 
 @dataclass
@@ -298,6 +324,7 @@ class MorphologyResult:
     verbs: List[VerbInfo] = field(default_factory=list)
     adjectives: List[AdjectiveInfo] = field(default_factory=list)
     adverbs: List[AdverbInfo] = field(default_factory=list)
+    mentions: List[Mention] = field(default_factory=list)  # 重ならない出現（出現順）
     tail: Optional[TailInfo] = None
 
     # 集計スコア
@@ -315,16 +342,187 @@ class MorphologyResult:
 # 形態素解析エンジン
 # ========================================
 
+@dataclass
+class LexicalMatches:
+    """
+    バックエンドによる品詞抽出結果
+
+    verbs / adjectives / adverbs は見出しごとに1件、mentions は重なる出現を
+    最長の区間で解消した出現を出現順に保持する。
+    """
+    verbs: List[VerbInfo] = field(default_factory=list)
+    adjectives: List[AdjectiveInfo] = field(default_factory=list)
+    adverbs: List[AdverbInfo] = field(default_factory=list)
+    mentions: List[Mention] = field(default_factory=list)
+
+
+class MorphologyBackend:
+    """
+    品詞抽出バックエンドのインターフェース
+
+    動詞・形容詞・副詞の抽出を担当する。語尾パターン検出と
+    スコア集計は MorphologyAnalyzer 側で共通に行う。
+    照合に使う辞書（Lexicon）は呼び出しごとに渡される。
+    """
+
+    name = "base"
+
+    def extract(self, text: str, lexicon=None) -> LexicalMatches:
+        """1テキストから品詞情報を抽出"""
+        return self.extract_many([text], lexicon)[0]
+
+    def extract_many(self, texts: List[str], lexicon=None) -> List[LexicalMatches]:
+        """
+        複数テキストから品詞情報を一括抽出
+
+        Args:
+            texts: 入力テキスト
+            lexicon: 照合に使う辞書（None=組み込み辞書）
+        """
+        raise NotImplementedError
+
+
+def _resolve_lexicon(lexicon):
+    """None を組み込み辞書に解決"""
+    if lexicon is None:
+        from .lexicon import default_lexicon
+        lexicon = default_lexicon()
+    return lexicon
+
+
+class RuleBackend(MorphologyBackend):
+    """
+    辞書見出しの文字列照合によるルールベース抽出（既定）
+
+    全見出しを1つの正規表現（長い見出しが先）にまとめ、テキストを1回走査する。
+    マッチの途中から始まって外へ続く見出しがありうる場合だけ、その位置から
+    走査を再開するため、重なる出現も取りこぼさない。
+
+    - verbs / adjectives / adverbs: テキストのどこかに現れる見出しすべて
+      （「非常に」の中の「常に」のように他の見出しに含まれるものも数える）。
+      並びは辞書の定義順で、複数カテゴリに属する動詞（「抜ける」）は
+      辞書で最後に定義されたカテゴリ（verb_to_category）で判定する
+    - mentions: 重なる出現を最長の区間から順に採用し、残った区間を出現順に並べる
+      （同じ長さなら左を優先）
+    """
+
+    name = "rule"
+
+    def extract(self, text: str, lexicon=None) -> LexicalMatches:
+        return self._match(text, _resolve_lexicon(lexicon))
+
+    def extract_many(self, texts: List[str], lexicon=None) -> List[LexicalMatches]:
+        lexicon = _resolve_lexicon(lexicon)
+        match = self._match
+        return [match(text, lexicon) for text in texts]
+
+    def _match(self, text: str, lexicon) -> LexicalMatches:
+        """見出しの出現を走査し、見出しごとの品詞情報と出現区間にまとめる"""
+        matches = LexicalMatches()
+        pattern = lexicon.compiled_mention_pattern
+        if pattern is None:
+            return matches
+
+        # 最長一致で走査し、マッチの途中から始まる別の見出しがありうる位置で再開する
+        search = pattern.search
+        resume = lexicon.compiled_mention_resume
+        hits: List[Tuple[int, str]] = []
+        m = search(text)
+        while m is not None:
+            start = m.start()
+            word = m.group()
+            hits.append((start, word))
+            m = search(text, start + resume[word])
+        if not hits:
+            return matches
+
+        # 見出しごとの初出位置と出現区間の候補（最長の見出しに含まれる短い見出しも数える）
+        nested = lexicon.compiled_mention_nested
+        first: Dict[str, int] = {}
+        candidates = set()
+        for start, word in hits:
+            for inner, offset in nested[word]:
+                position = start + offset
+                candidates.add((position, inner))
+                if first.get(inner, position + 1) > position:
+                    first[inner] = position
+
+        _add_words(matches, lexicon, first)
+        matches.mentions = _longest_spans([
+            Mention(word=word, surface=word, start=start, end=start + len(word))
+            for start, word in candidates
+        ])
+        return matches
+
+
+def _longest_spans(mentions: List[Mention]) -> List[Mention]:
+    """重なる出現を長い区間から順に採用（同じ長さなら左優先）し、出現順に返す"""
+    starts: List[int] = []
+    chosen: List[Mention] = []
+    for mention in sorted(mentions, key=lambda m: (m.start - m.end, m.start)):
+        i = bisect_right(starts, mention.start)
+        if i > 0 and chosen[i - 1].end > mention.start:
+            continue
+        if i < len(starts) and starts[i] < mention.end:
+            continue
+        starts.insert(i, mention.start)
+        chosen.insert(i, mention)
+    return chosen
+
+
+def _add_words(matches: LexicalMatches, lexicon, first: Dict[str, int]) -> None:
+    """出現した見出しを品詞ごとに辞書の定義順で追加（1語が複数の品詞に該当しうる）"""
+    ranks = lexicon.compiled_word_ranks
+    for kind in ("verb", "adjective", "adverb"):
+        rank = ranks[kind]
+        for word in sorted((w for w in first if w in rank), key=rank.__getitem__):
+            start = first[word]
+            if kind == "verb":
+                matches.verbs.append(VerbInfo(
+                    surface=word,
+                    base=word,
+                    category=lexicon.verb_to_category[word],
+                    start=start,
+                ))
+            elif kind == "adjective":
+                matches.adjectives.append(AdjectiveInfo(
+                    surface=word,
+                    sentiment=lexicon.adjective_to_sentiment[word],
+                    start=start,
+                ))
+            else:
+                # 程度・頻度の両方に載る副詞は1件にまとめる
+                matches.adverbs.append(AdverbInfo(
+                    surface=word,
+                    degree_factor=lexicon.adverb_to_degree.get(word, 1.0),
+                    frequency_factor=lexicon.adverb_to_frequency.get(word, 1.0),
+                    start=start,
+                ))
+
+
+# analyze_many でスレッドに割り当てるテキストの単位
+ANALYZE_CHUNK_SIZE = 256
+
+
 class MorphologyAnalyzer:
-    """品詞分解エンジン（ルールベース簡易版）"""
-
-    def __init__(self):
-        """初期化"""
-        # 語尾パターンをコンパイル
-        self.tail_patterns = [
-            (re.compile(tp.pattern), tp)
-            for tp in TAIL_PATTERNS
-        ]
+    """品詞分解エンジン（既定はルールベース簡易版）"""
+
+    def __init__(self, backend=None, lexicon=None):
+        """
+        Args:
+            backend: 品詞抽出バックエンド（MorphologyBackend または
+                     "rule" / "fugashi" / "sudachi" / "auto"。None=ルールベース）
+            lexicon: 使用する辞書（Lexicon、None=組み込み辞書）
+        """
+        if backend is None or isinstance(backend, str):
+            from .backends import get_backend
+            backend = get_backend(backend or "rule")
+        self.backend: MorphologyBackend = backend
+        self.lexicon = _resolve_lexicon(lexicon)
+
+        # 語尾パターン（辞書構築時にコンパイル済み）と、マッチに必要なリテラル
+        self.tail_patterns = self.lexicon.compiled_tail_patterns
+        self.tail_literals = self.lexicon.compiled_tail_literals
 
     def analyze(self, text: str) -> MorphologyResult:
         """
@@ -337,21 +535,60 @@ class MorphologyAnalyzer:
             MorphologyResult: 解析結果
 
         Note:
-            この実装は簡易版であり、完全な形態素解析器（MeCab等）の
+            既定のルールベースバックエンドは完全な形態素解析器（MeCab等）の
             代替ではありません。キーワードベースの抽出を行います。
+            backend="fugashi" / "sudachi" で形態素解析器を使用できます。
+        """
+        return self._build_result(text, self.backend.extract(text, self.lexicon))
+
+    def analyze_many(
+        self,
+        texts: Sequence[str],
+        workers: Optional[int] = None,
+        chunk_size: int = ANALYZE_CHUNK_SIZE,
+    ) -> "MorphologyBatch":
         """
+        複数テキストを一括で形態素解析
+
+        辞書の解決・バックエンドの準備（形態素解析器・辞書索引）は1バッチにつき1度で、
+        品詞抽出はバックエンドの extract_many にまとめて渡す。結果は analyze と同一。
+
+        Args:
+            texts: 入力テキスト
+            workers: 並行して解析するスレッド数（None / 1=呼び出し元のスレッドのみ）
+            chunk_size: スレッドに割り当てるテキストの単位
+
+        Returns:
+            MorphologyBatch: 解析結果（入力順、列指向の集計値付き）
+        """
+        texts = list(texts)
+        if workers is None or workers <= 1 or len(texts) <= chunk_size:
+            return MorphologyBatch.from_results(self._analyze_chunk(texts))
+
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pivot-morphology") as executor:
+            parts = list(executor.map(self._analyze_chunk, chunks))
+        return MorphologyBatch.from_results([result for part in parts for result in part])
+
+    def _analyze_chunk(self, texts: List[str]) -> List[MorphologyResult]:
+        """テキストを一括抽出し、語尾検出・スコア集計を行う"""
+        build = self._build_result
+        return [
+            build(text, matches)
+            for text, matches in zip(texts, self.backend.extract_many(texts, self.lexicon))
+        ]
+
+    def _build_result(self, text: str, matches: LexicalMatches) -> MorphologyResult:
+        """抽出結果から語尾検出・スコア集計を行う"""
         result = MorphologyResult(raw_text=text)
 
-        # 動詞抽出
-        result.verbs = self._extract_verbs(text)
+        # 動詞・形容詞・副詞
+        result.verbs = matches.verbs
         result.verb_categories = [v.category for v in result.verbs
                                   if v.category != VerbCategory.NEUTRAL]
-
-        # 形容詞抽出
-        result.adjectives = self._extract_adjectives(text)
-
-        # 副詞抽出
-        result.adverbs = self._extract_adverbs(text)
+        result.adjectives = matches.adjectives
+        result.adverbs = matches.adverbs
+        result.mentions = matches.mentions
 
         # 語尾パターン検出
         result.tail = self._detect_tail_pattern(text)
@@ -372,66 +609,12 @@ class MorphologyAnalyzer:
 
         return result
 
-    def _extract_verbs(self, text: str) -> List[VerbInfo]:
-        """動詞を抽出"""
-        verbs = []
-
-        for verb, category in VERB_TO_CATEGORY.items():
-            if verb in text:
-                verbs.append(VerbInfo(
-                    surface=verb,
-                    base=verb,
-                    category=category,
-                ))
-
-        return verbs
-
-    def _extract_adjectives(self, text: str) -> List[AdjectiveInfo]:
-        """形容詞を抽出"""
-        adjectives = []
-
-        for adj, sentiment in ADJECTIVE_TO_SENTIMENT.items():
-            if adj in text:
-                adjectives.append(AdjectiveInfo(
-                    surface=adj,
-                    sentiment=sentiment,
-                ))
-
-        return adjectives
-
-    def _extract_adverbs(self, text: str) -> List[AdverbInfo]:
-        """副詞を抽出"""
-        adverbs = []
-
-        # 程度副詞
-        for adv, factor in ADVERB_TO_DEGREE.items():
-            if adv in text:
-                adverbs.append(AdverbInfo(
-                    surface=adv,
-                    degree_factor=factor,
-                    frequency_factor=1.0,
-                ))
-
-        # 頻度副詞
-        for adv, factor in ADVERB_TO_FREQUENCY.items():
-            if adv in text:
-                # 既に追加されているか確認
-                existing = next((a for a in adverbs if a.surface == adv), None)
-                if existing:
-                    existing.frequency_factor = factor
-                else:
-                    adverbs.append(AdverbInfo(
-                        surface=adv,
-                        degree_factor=1.0,
-                        frequency_factor=factor,
-                    ))
-
-        return adverbs
-
     def _detect_tail_pattern(self, text: str) -> Optional[TailInfo]:
         """語尾パターンを検出"""
-        # 文末から検索（優先度順）
-        for pattern, tail_pattern in self.tail_patterns:
+        # 文末から検索（優先度順）。必要なリテラルが本文になければ検索しない
+        for (pattern, tail_pattern), required in zip(self.tail_patterns, self.tail_literals):
+            if required is not None and not any(literal in text for literal in required):
+                continue
             if pattern.search(text):
                 return TailInfo(
                     pattern=tail_pattern.pattern,
@@ -476,6 +659,71 @@ class MorphologyAnalyzer:
         return max(-1.0, min(1.0, score))
 
 
+# ========================================
+# 一括解析結果（列指向）
+# ========================================
+
+# 語尾なしを表す tail_type のコード
+NO_TAIL = -1
+
+
+@dataclass
+class MorphologyBatch:
+    """
+    複数テキストの形態素解析結果
+
+    results に MorphologyResult を入力順で保持し、集計スコアを列ごとの配列
+    （array）でも保持する。配列はバッファプロトコルに対応しており、
+    NumPy があれば np.frombuffer で複製せずに参照できる。
+    tail_type は tail_types のインデックス（語尾なしは NO_TAIL）。
+    """
+    results: List[MorphologyResult] = field(default_factory=list)
+    degree_factor: array = field(default_factory=lambda: array("d"))
+    frequency_factor: array = field(default_factory=lambda: array("d"))
+    certainty: array = field(default_factory=lambda: array("d"))
+    sentiment_score: array = field(default_factory=lambda: array("d"))
+    tail_type: array = field(default_factory=lambda: array("h"))
+    tail_types: List[str] = field(default_factory=lambda: list(TAIL_TYPES))
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __getitem__(self, index: int) -> MorphologyResult:
+        return self.results[index]
+
+    def __iter__(self):
+        return iter(self.results)
+
+    @classmethod
+    def from_results(cls, results: List[MorphologyResult]) -> "MorphologyBatch":
+        """MorphologyResult のリストから構築"""
+        batch = cls(results=results)
+        batch.degree_factor = array("d", [r.degree_factor for r in results])
+        batch.frequency_factor = array("d", [r.frequency_factor for r in results])
+        batch.certainty = array("d", [r.certainty for r in results])
+        batch.sentiment_score = array("d", [r.sentiment_score for r in results])
+
+        # 辞書で追加された語尾の種類は末尾にコードを振る
+        codes = {t: code for code, t in enumerate(batch.tail_types)}
+        tail_type = []
+        for r in results:
+            if r.tail is None:
+                tail_type.append(NO_TAIL)
+                continue
+            code = codes.get(r.tail.type)
+            if code is None:
+                code = codes[r.tail.type] = len(batch.tail_types)
+                batch.tail_types.append(r.tail.type)
+            tail_type.append(code)
+        batch.tail_type = array("h", tail_type)
+        return batch
+
+    def tail_name(self, index: int) -> Optional[str]:
+        """index 件目の語尾の種類（語尾なしは None）"""
+        code = self.tail_type[index]
+        return self.tail_types[code] if code != NO_TAIL else None
+
+
 # ========================================
 # PIVOT判定ヘルパー
 # ========================================
@@ -616,8 +864,21 @@ def analyze_text(text: str) -> MorphologyResult:
         print(result.degree_factor)    # 1.5
         print(result.sentiment_score)  # -1.0
     """
-    analyzer = MorphologyAnalyzer()
-    return analyzer.analyze(text)
+    return _default_analyzer().analyze(text)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def _default_analyzer() -> MorphologyAnalyzer:
+    """組み込み辞書・ルールベースの共有エンジン（初回呼び出し時に構築）"""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = MorphologyAnalyzer()
+    return _default
 
 
 def get_verb_category(verb: str) -> VerbCategory:
@@ -0,0 +1,224 @@
+"""
+PIVOT Engine Pool - 設定ごとのエンジンを共有するLRUプール
+
+顧客ごとに業務ドメイン・最小信頼度の異なるAPIでは、リクエストごとに
+InsightInterviewEngine を構築するとルールの準備を繰り返し、顧客ごとに
+手元でキャッシュすると上限なく増え続ける。EnginePool は設定をキーに
+エンジンを保持し、上限を超えたら最も長く使われていないものから破棄する。
+
+共有:
+    - ドメイン・最小信頼度が変えるのは重み付け（並び順）と閾値のみで、
+      辞書のコンパイル済みパターン・品詞分解の索引は全エンジンで共有する
+      （組み込み辞書・バックエンドはプロセス内で共有済み）
+    - 辞書ファイルのパスを指定した場合は、パスごとに1つの LexiconStore を
+      プール内で共有する（読み込み・コンパイルは1度、差し替えは全エンジンに反映）
+    - regex_safety=True はプールで1つの RegexSafety に解決する
+    - プールから破棄したエンジンも、取得済みの呼び出し元はそのまま使い続けられる
+
+スレッドセーフ（取得・破棄はロックで保護）。エンジンの処理は呼び出しごとの
+状態を持たないため、取得したエンジンは複数スレッドから同時に使用できる。
+
+使用例:
+    from nlp.python.pivot.pool import EnginePool
+
+    pool = EnginePool(max_size=32, lexicon="lexicon.json")
+
+    engine = pool.get(domain="hr_evaluation", min_confidence=0.5)
+    result = engine.process(text)
+
+    pool.stats()   # {"size": 1, "hits": 0, "misses": 1, "evictions": 0, ...}
+"""
+
+import dataclasses
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from .classifier import DOMAIN_PIVOT_WEIGHTS
+from .engine import InsightInterviewEngine
+from .lexicon import LexiconStore
+from .regex_safety import RegexSafety
+
+
+# 既定のプールサイズ（保持するエンジンの最大数）
+DEFAULT_MAX_SIZE = 32
+
+# InsightInterviewEngine の引数（プールのキーに使用）
+ENGINE_OPTIONS = (
+    "domain",
+    "min_confidence",
+    "use_morphology",
+    "split_by_sentence",
+    "split_by_conjunction",
+    "morphology_backend",
+    "lexicon",
+    "normalize_entities",
+    "regex_safety",
+    "budget",
+    "short_circuit",
+    "rule_order",
+)
+
+
+def engine_options(engine: InsightInterviewEngine) -> Dict:
+    """
+    構築済みエンジンの設定を InsightInterviewEngine の引数として取得
+
+    Args:
+        engine: エンジン
+
+    Returns:
+        Dict: 引数名 → 値（辞書はストア指定時はストア、それ以外は辞書そのもの）
+    """
+    classifier = engine.classifier
+    return {
+        "domain": engine.domain,
+        "min_confidence": engine.min_confidence,
+        "use_morphology": classifier.use_morphology,
+        "split_by_sentence": engine.splitter.split_by_sentence,
+        "split_by_conjunction": engine.splitter.split_by_conjunction,
+        "morphology_backend": classifier.morphology_backend,
+        "lexicon": classifier.lexicon_store or classifier._fixed_lexicon,
+        "normalize_entities": classifier.normalize_entities,
+        "regex_safety": classifier.regex_safety,
+        "budget": classifier.budget,
+        "short_circuit": classifier.short_circuit,
+        "rule_order": dict(classifier.rule_order),
+    }
+
+
+def _freeze(name: str, value) -> Hashable:
+    """引数の値をキーに使える形に変換（辞書オブジェクト・変更可能なオブジェクトは同一性で区別）"""
+    if name == "lexicon" and value is not None and not isinstance(value, str):
+        # プール内のエンジンが参照を保持するため、保持中に id が再利用されることはない
+        return ("id", id(value))
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return (type(value).__name__, dataclasses.astuple(value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(name, v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(name, v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return ("id", id(value))
+    return value
+
+
+class EnginePool:
+    """設定ごとの InsightInterviewEngine を保持するLRUプール"""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, **defaults):
+        """
+        Args:
+            max_size: 保持するエンジンの最大数
+            **defaults: 全エンジンに共通の InsightInterviewEngine の引数
+                        （get で上書き可能）
+
+        Raises:
+            ValueError: max_size が1未満、または未知の引数
+        """
+        if max_size < 1:
+            raise ValueError("max_size は1以上を指定してください")
+        _check_options(defaults)
+        self.max_size = max_size
+        self.defaults = defaults
+        self._lock = threading.Lock()
+        self._engines: "OrderedDict[Tuple, InsightInterviewEngine]" = OrderedDict()
+        self._stores: Dict[str, LexiconStore] = {}
+        self._safety = RegexSafety()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    def get(
+        self,
+        domain: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        **options,
+    ) -> InsightInterviewEngine:
+        """
+        設定に対応するエンジンを取得（なければ構築してプールに追加）
+
+        Args:
+            domain: 業務ドメイン（None=プールの既定値）
+            min_confidence: 最小信頼度（None=プールの既定値）
+            **options: その他の InsightInterviewEngine の引数（プールの既定値を上書き）
+
+        Returns:
+            InsightInterviewEngine: エンジン
+
+        Raises:
+            ValueError: 未知の業務ドメイン・引数
+        """
+        _check_options(options)
+        config = {**self.defaults, **options}
+        if domain is not None:
+            if domain not in DOMAIN_PIVOT_WEIGHTS:
+                raise ValueError(f"未知の業務ドメイン: {domain}")
+            config["domain"] = domain
+        if min_confidence is not None:
+            config["min_confidence"] = min_confidence
+
+        key = tuple((name, _freeze(name, config[name])) for name in ENGINE_OPTIONS if name in config)
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is not None:
+                self._engines.move_to_end(key)
+                self.hits += 1
+                return engine
+
+            self.misses += 1
+            engine = InsightInterviewEngine(**self._shared(config))
+            self._engines[key] = engine
+            while len(self._engines) > self.max_size:
+                self._engines.popitem(last=False)
+                self.evictions += 1
+            self._release_stores()
+            return engine
+
+    def clear(self) -> None:
+        """プールを空にする"""
+        with self._lock:
+            self._engines.clear()
+            self._release_stores()
+
+    def stats(self) -> Dict:
+        """プールの統計"""
+        with self._lock:
+            return {
+                "size": len(self._engines),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "lexicon_stores": len(self._stores),
+            }
+
+    def _shared(self, config: Dict) -> Dict:
+        """辞書のパス・安全モードをプールで共有するインスタンスに置き換え"""
+        config = dict(config)
+        lexicon = config.get("lexicon")
+        if isinstance(lexicon, str):
+            store = self._stores.get(lexicon)
+            if store is None:
+                store = self._stores[lexicon] = LexiconStore(lexicon)
+            config["lexicon"] = store
+        if config.get("regex_safety") is True:
+            config["regex_safety"] = self._safety
+        return config
+
+    def _release_stores(self) -> None:
+        """どのエンジンからも使われなくなった辞書ストアを解放"""
+        used = {id(engine.classifier.lexicon_store) for engine in self._engines.values()}
+        for path in [path for path, store in self._stores.items() if id(store) not in used]:
+            del self._stores[path]
+
+
+def _check_options(options: Dict) -> None:
+    unknown = sorted(set(options) - set(ENGINE_OPTIONS))
+    if unknown:
+        raise ValueError(f"未知のエンジン引数: {', '.join(unknown)}")
@@ -0,0 +1,288 @@
+"""
+PIVOT Rule Profiler - ルール（正規表現）ごとの処理時間計測
+
+辞書の全パターン（PIVOT判定・対象軸・文末表現）をコーパスの発話に対して
+1件ずつ実行し、パターンごとの累計・最大時間を計測して遅いものを報告する。
+辞書を追加・変更した際に、長い発話で2乗の時間がかかるパターンを見つけるために使う。
+
+計測は分類時と同じコンパイル済みパターン（安全モード指定時は保護付き）に対して行う。
+分類時はキーワードの有無で実行を省略するパターンもあるため、
+計測値は分類時の処理時間の上限の目安となる。
+
+使用例:
+    python -m nlp.python.pivot profile interviews/ --top 10
+    python -m nlp.python.pivot profile interviews/ --safe --max-length 1000
+    python -m nlp.python.pivot profile interviews/ --pivot-order rule_order.json
+
+    # 一致率順のパターン順序で分類（結果は定義順と同一）
+    PIVOTClassifier(rule_order=json.load(open("rule_order.json")))
+
+    # Pythonから
+    from nlp.python.pivot.profiler import RuleProfiler
+
+    profiler = RuleProfiler()
+    profiler.profile(texts)
+    print(profiler.format_report(top=10))
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .lexicon import Lexicon, default_lexicon
+from .regex_safety import RegexSafety, is_expensive
+
+
+# 並べ替えに使える指標
+SORT_KEYS = ("total", "max", "mean")
+
+
+# ========================================
+# 型定義
+# ========================================
+
+@dataclass
+class PatternStats:
+    """パターン1件の計測値"""
+    rule: str           # ルールの位置（"pivot_keywords.P[0]" 等）
+    pattern: str
+    expensive: bool     # 無制限の繰り返しを含むか
+    engine: str = "re"  # "re" / "re2" / "re+cap"
+    calls: int = 0
+    hits: int = 0
+    total: float = 0.0  # 累計時間（秒）
+    max: float = 0.0    # 1回あたりの最大時間（秒）
+    max_length: int = 0  # 最大時間を記録した発話の文字数
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> Dict:
+        """JSON出力用"""
+        return {
+            "rule": self.rule,
+            "pattern": self.pattern,
+            "expensive": self.expensive,
+            "engine": self.engine,
+            "calls": self.calls,
+            "hits": self.hits,
+            "total": self.total,
+            "max": self.max,
+            "mean": self.mean,
+            "max_length": self.max_length,
+        }
+
+
+# ========================================
+# プロファイラ
+# ========================================
+
+class RuleProfiler:
+    """辞書の全パターンの処理時間を計測"""
+
+    def __init__(
+        self,
+        lexicon: Optional[Lexicon] = None,
+        regex_safety: Optional[RegexSafety] = None,
+    ):
+        """
+        Args:
+            lexicon: 計測する辞書（None=組み込み辞書）
+            regex_safety: 安全モード設定（None=無効、分類時と同じ設定で計測する）
+        """
+        self.lexicon = (lexicon or default_lexicon()).guarded(regex_safety)
+        self.rules: List[Tuple[str, object]] = list(self._iter_rules(self.lexicon))
+        self.stats: List[PatternStats] = [
+            PatternStats(
+                rule=name,
+                pattern=regex.pattern,
+                expensive=is_expensive(regex.pattern),
+                engine=getattr(regex, "engine", "re"),
+            )
+            for name, regex in self.rules
+        ]
+        self.texts = 0
+        self.chars = 0
+
+    @staticmethod
+    def _iter_rules(lexicon: Lexicon):
+        """(ルールの位置, コンパイル済みパターン)"""
+        for pivot, patterns in lexicon.compiled_pivot_patterns.items():
+            for i, regex in enumerate(patterns):
+                yield f"pivot_keywords.{pivot}[{i}]", regex
+        for layer, compiled in lexicon.compiled_layer_patterns.items():
+            for kind in ("patterns", "extraction"):
+                for i, regex in enumerate(compiled[kind]):
+                    yield f"layer_patterns.{layer}.{kind}[{i}]", regex
+        for i, (regex, _) in enumerate(lexicon.compiled_tail_patterns):
+            yield f"tail_patterns[{i}]", regex
+
+    def profile(self, texts: Iterable[str]) -> "RuleProfiler":
+        """
+        発話群に全パターンを実行して計測値を加算
+
+        Args:
+            texts: 発話テキスト
+
+        Returns:
+            RuleProfiler: self（連続呼び出し用）
+        """
+        clock = time.perf_counter
+        pairs = list(zip(self.stats, (regex for _, regex in self.rules)))
+        for text in texts:
+            self.texts += 1
+            self.chars += len(text)
+            for stats, regex in pairs:
+                started = clock()
+                match = regex.search(text)
+                elapsed = clock() - started
+                stats.calls += 1
+                stats.total += elapsed
+                if match is not None:
+                    stats.hits += 1
+                if elapsed > stats.max:
+                    stats.max = elapsed
+                    stats.max_length = len(text)
+        return self
+
+    def worst(self, top: int = 10, sort: str = "total") -> List[PatternStats]:
+        """
+        遅いパターンを返す
+
+        Args:
+            top: 件数
+            sort: 並べ替えの指標（"total" / "max" / "mean"）
+
+        Returns:
+            List[PatternStats]: 指標の降順
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"未知の並べ替え指標: {sort}")
+        return sorted(self.stats, key=lambda s: getattr(s, sort), reverse=True)[:top]
+
+    def pivot_pattern_order(self) -> Dict[str, List[int]]:
+        """
+        Voice別のパターンを試す順序（PIVOTClassifier の rule_order に指定する）
+
+        一致率の高い順（同率は平均時間の短い順、次に定義順）。一致しやすいパターンを
+        先に試すと、短絡評価でスコアが早く確定し、残りのパターンを省略できる。
+
+        Returns:
+            Dict[str, List[int]]: Voice → パターン番号の列
+        """
+        order: Dict[str, List[int]] = {}
+        for pivot in self.lexicon.compiled_pivot_patterns:
+            stats = [s for s in self.stats if s.rule.startswith(f"pivot_keywords.{pivot}[")]
+            order[pivot] = sorted(
+                range(len(stats)),
+                key=lambda i: (-(stats[i].hits / stats[i].calls if stats[i].calls else 0.0), stats[i].mean, i),
+            )
+        return order
+
+    def format_report(self, top: int = 10, sort: str = "total") -> str:
+        """遅いパターンの一覧（テキスト表形式）"""
+        total = sum(s.total for s in self.stats)
+        lines = [
+            f"lexicon {self.lexicon.version_id}: {len(self.rules)} patterns, "
+            f"{self.texts} utterances ({self.chars} chars), total {total * 1000:.1f} ms",
+            f"{'total ms':>10} {'max ms':>9} {'mean us':>8} {'max len':>8} {'hits':>6}  "
+            f"{'engine':<7} rule / pattern",
+        ]
+        for s in self.worst(top, sort):
+            mark = "*" if s.expensive else " "
+            lines.append(
+                f"{s.total * 1000:>10.2f} {s.max * 1000:>9.3f} {s.mean * 1e6:>8.1f} "
+                f"{s.max_length:>8} {s.hits:>6}  {s.engine:<7}{mark}{s.rule}  {s.pattern}"
+            )
+        lines.append("(* = 無制限の繰り返しを含むパターン)")
+        return "\n".join(lines)
+
+    def to_dict(self, top: Optional[int] = None, sort: str = "total") -> Dict:
+        """JSON出力用"""
+        return {
+            "lexicon_version": self.lexicon.version_id,
+            "utterances": self.texts,
+            "chars": self.chars,
+            "patterns": [s.to_dict() for s in self.worst(top or len(self.stats), sort)],
+        }
+
+
+# ========================================
+# 入力
+# ========================================
+
+def iter_utterances(files: Iterable[Path], lines: bool = False) -> Iterable[str]:
+    """
+    ファイル群から発話テキストを取得
+
+    Args:
+        files: 入力ファイル
+        lines: True=1行を1発話とする（False=インタビューMarkdownとしてパース）
+    """
+    engine = None
+    for path in files:
+        text = Path(path).read_text(encoding="utf-8")
+        if lines:
+            yield from (line for line in text.splitlines() if line.strip())
+            continue
+        if engine is None:
+            from .engine import InsightInterviewEngine
+            engine = InsightInterviewEngine(use_morphology=False)
+        interview = engine.parser.parse(text)
+        yield from (u.text for u in engine._extract_utterances(interview))
+
+
+# ========================================
+# CLI
+# ========================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """profile サブコマンドの引数定義"""
+    parser = argparse.ArgumentParser(
+        prog="python -m nlp.python.pivot profile",
+        description="辞書の正規表現パターンごとの処理時間を計測",
+    )
+    parser.add_argument("inputs", nargs="+", help="ディレクトリ・ファイル・globパターン")
+    parser.add_argument("--pattern", default="*.md", help="ディレクトリ指定時のファイルパターン")
+    parser.add_argument("--lines", action="store_true", help="1行を1発話として読む（テキストファイル用）")
+    parser.add_argument("--lexicon", default=None, help="辞書ファイル（既定: 組み込み辞書）")
+    parser.add_argument("--top", type=int, default=10, help="表示件数")
+    parser.add_argument("--sort", default="total", choices=SORT_KEYS, help="並べ替えの指標")
+    parser.add_argument("--safe", action="store_true", help="安全モードで計測")
+    parser.add_argument("--max-length", type=int, default=None, help="安全モードの入力長上限")
+    parser.add_argument("--json", action="store_true", help="JSONで出力")
+    parser.add_argument("--pivot-order", default=None, metavar="PATH",
+                        help="Voice別のパターンを試す順序（一致率順）をJSONで書き出す"
+                             "（PIVOTClassifier の rule_order に指定）")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLIエントリポイント"""
+    from .corpus import collect_inputs
+
+    args = build_parser().parse_args(argv)
+    files = collect_inputs(args.inputs, args.pattern)
+    if not files:
+        print("入力ファイルがありません", file=sys.stderr)
+        return 1
+
+    safety = None
+    if args.safe or args.max_length:
+        safety = RegexSafety(max_length=args.max_length) if args.max_length else RegexSafety()
+    lexicon = Lexicon.load(args.lexicon) if args.lexicon else None
+
+    profiler = RuleProfiler(lexicon, safety).profile(iter_utterances(files, args.lines))
+    if args.pivot_order:
+        with open(args.pivot_order, "w", encoding="utf-8") as f:
+            json.dump(profiler.pivot_pattern_order(), f, ensure_ascii=False, indent=2)
+    if args.json:
+        print(json.dumps(profiler.to_dict(args.top, args.sort), ensure_ascii=False, indent=2))
+    else:
+        print(profiler.format_report(args.top, args.sort))
+    return 0
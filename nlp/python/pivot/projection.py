@@ -0,0 +1,323 @@
+"""
+PIVOT Mart Projection - インサイトマートの射影・遅延生成・ストリーミング出力
+
+generate_pivot_insight_mart はインサイト1件ごとに入れ子の dict を組み立てるため、
+一部のフィールドしか使わない利用者や、大量のマートを JSONL に書き出す処理でも
+全フィールドの dict とその JSON 文字列の両方を生成していた。
+本モジュールはフィールド単位の生成関数（classifier.INSIGHT_MART_FIELDS）を使い、
+以下の3つの出力形態を提供する。
+
+- InsightMartView: アクセスされたフィールドだけをその都度生成する Mapping
+- insight_mart_json: dict を経由せずにフィールドごとの JSON 断片を連結した文字列
+  （json.dumps(generate_pivot_insight_mart(...), ensure_ascii=False) と同一の出力）
+- write_insight_marts: JSONL へのストリーミング書き出し
+
+fields を指定すると、指定外のフィールドは生成もシリアライズもしない
+（出力順は常にマートのフィールド順）。
+
+使用例:
+    from nlp.python.pivot.projection import InsightMartView, write_insight_marts
+
+    # 必要なフィールドのみ
+    for item in result.items:
+        view = InsightMartView(item, "2025-03-14", fields=["id", "pivot_voice", "body"])
+        print(view["id"], view["body"])
+
+    with open("marts.jsonl", "w", encoding="utf-8") as f:
+        write_insight_marts(f, result.items, "2025-03-14")
+
+    engine.save_marts(result, "marts.jsonl", fields=["id", "pivot_voice", "target_layers", "body"])
+"""
+
+import json
+import math
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from .classifier import INSIGHT_MART_FIELDS, PIVOTInsight, mart_fields
+
+
+# 1回の write で書き出す行数
+WRITE_CHUNK = 256
+
+_encode_str = json.encoder.encode_basestring
+_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+# フィールド名 → JSON のキー部分（'"id": '）
+_KEYS = {name: _encode_str(name) + ": " for name in INSIGHT_MART_FIELDS}
+
+
+def _encode(value) -> str:
+    """
+    マートの値を JSON に変換（json.dumps(ensure_ascii=False) と同一の出力）
+
+    マートに現れる型（str / None / int / 有限の float / list / str キーの dict）は
+    直接変換し、それ以外は json.JSONEncoder に任せる。
+    """
+    kind = type(value)
+    if kind is str:
+        return _encode_str(value)
+    if value is None:
+        return "null"
+    if kind is int or (kind is float and math.isfinite(value)):
+        return repr(value)
+    if kind is list:
+        return "[" + ", ".join(map(_encode, value)) + "]"
+    if kind is dict and all(type(key) is str for key in value):
+        return "{" + ", ".join(_encode_str(key) + ": " + _encode(v) for key, v in value.items()) + "}"
+    return _ENCODER.encode(value)
+
+
+def _str_list(values: List[str]) -> str:
+    return "[" + ", ".join(map(_encode_str, values)) + "]"
+
+
+def _str_dict(values: Dict[str, Optional[str]]) -> str:
+    """値が str / None の dict（target_layers / layer_surfaces）"""
+    if not all(type(v) is str or v is None for v in values.values()):
+        return _encode(values)
+    return "{" + ", ".join([
+        _encode_str(key) + ": " + (_encode_str(v) if v is not None else "null")
+        for key, v in values.items()
+    ]) + "}"
+
+
+def _speaker_json(i: PIVOTInsight, observed_at: str, frequency: int) -> str:
+    source = i.source
+    if not source:
+        return "null"
+    parts = []
+    if source.speaker_id:
+        parts.append('"respondent_id": ' + _encode_str(source.speaker_id))
+    if source.speaker_role:
+        parts.append('"role": ' + _encode_str(source.speaker_role))
+    if source.speaker_department:
+        parts.append('"department": ' + _encode_str(source.speaker_department))
+    return "{" + ", ".join(parts) + "}" if parts else "null"
+
+
+def _context_json(i: PIVOTInsight, observed_at: str, frequency: int) -> str:
+    source = i.source
+    if not source:
+        return "null"
+    parts = []
+    if source.question_no is not None:
+        parts.append('"question_no": ' + _encode(source.question_no))
+    if source.question_text:
+        parts.append('"question": ' + _encode_str(source.question_text))
+    if source.interview_id:
+        parts.append('"interview_id": ' + _encode_str(source.interview_id))
+    return "{" + ", ".join(parts) + "}" if parts else "null"
+
+
+def _source_ref_json(i: PIVOTInsight, observed_at: str, frequency: int) -> str:
+    source = i.source
+    if not source:
+        return '{"doc_id": "", "section_path": ""}'
+    doc_id = _encode_str(source.interview_id) if source.interview_id else '""'
+    line_no = ', "line_no": ' + _encode(source.line_no) if source.line_no else ""
+    return '{"doc_id": ' + doc_id + ', "section_path": ""' + line_no + "}"
+
+
+def _keywords_json(i: PIVOTInsight, observed_at: str, frequency: int) -> str:
+    entities = [v for v in i.target_layers.values() if v]
+    return (
+        '{"surface": ' + _str_list(i.matched_keywords)
+        + ', "normalized": [], "entities": ' + _str_list(entities) + "}"
+    )
+
+
+def _morphology_json(i: PIVOTInsight, observed_at: str, frequency: int) -> str:
+    return (
+        '{"intensity_score": ' + _encode(round(i.intensity_score, 2))
+        + ', "degree_factor": ' + _encode(i.degree_factor)
+        + ', "certainty": ' + _encode(i.certainty)
+        + ', "reasoning": ' + _encode_str(i.reasoning) + "}"
+    )
+
+
+def _payload_json(i: PIVOTInsight, observed_at: str, frequency: int) -> str:
+    return (
+        '{"raw_utterance": ' + _encode_str(i.body)
+        + ', "matched_keywords": ' + _str_list(i.matched_keywords)
+        + ', "matched_patterns": ' + _str_list(i.matched_patterns)
+        + ', "layer_surfaces": ' + _str_dict(i.layer_surfaces)
+        + ', "degraded": ' + _str_list(i.degraded) + "}"
+    )
+
+
+# フィールド → JSON 断片の生成関数（構造が決まっているフィールドは値を組み立てずに
+# 直接変換し、それ以外は INSIGHT_MART_FIELDS の値を _encode で変換する）
+_JSON_FIELDS = {
+    name: (lambda render: lambda i, observed_at, frequency: _encode(render(i, observed_at, frequency)))(render)
+    for name, render in INSIGHT_MART_FIELDS.items()
+}
+_JSON_FIELDS.update({
+    "id": lambda i, observed_at, frequency: _encode_str(f"pivot_{i.id}"),
+    "mart_type": lambda i, observed_at, frequency: '"pivot_insight"',
+    "pivot_voice": lambda i, observed_at, frequency: _encode_str(i.pivot_voice),
+    "pivot_label": lambda i, observed_at, frequency: _encode_str(i.pivot_label),
+    "title": lambda i, observed_at, frequency: _encode_str(i.title),
+    "target_layers": lambda i, observed_at, frequency: _str_dict(i.target_layers),
+    "body": lambda i, observed_at, frequency: _encode_str(i.body),
+    "speaker": _speaker_json,
+    "context": _context_json,
+    "source_ref": _source_ref_json,
+    "keywords": _keywords_json,
+    "temperature": lambda i, observed_at, frequency: _encode_str(i.temperature),
+    "source_time": lambda i, observed_at, frequency: '{"observed_at": ' + _encode_str(observed_at) + "}",
+    "extraction_method": lambda i, observed_at, frequency: (
+        '"rule_based"' if not i.reasoning.startswith("障害") else '"morphology_based"'
+    ),
+    "morphology": _morphology_json,
+    "lexicon_version": lambda i, observed_at, frequency: _encode_str(i.lexicon_version),
+    "payload": _payload_json,
+})
+
+
+def _full_mart_json(i: PIVOTInsight, observed_at: str, frequency: int) -> str:
+    """全フィールドの JSON（_JSON_FIELDS の連結と同じ、関数呼び出しを減らした版）"""
+    return "".join([
+        '{"id": ', _encode_str(f"pivot_{i.id}"),
+        ', "mart_type": "pivot_insight", "pivot_voice": ', _encode_str(i.pivot_voice),
+        ', "pivot_label": ', _encode_str(i.pivot_label),
+        ', "pivot_score": ', _encode(i.pivot_score),
+        ', "target_layers": ', _str_dict(i.target_layers),
+        ', "title": ', _encode_str(i.title),
+        ', "body": ', _encode_str(i.body),
+        ', "speaker": ', _speaker_json(i, observed_at, frequency),
+        ', "context": ', _context_json(i, observed_at, frequency),
+        ', "keywords": ', _keywords_json(i, observed_at, frequency),
+        ', "temperature": ', _encode_str(i.temperature),
+        ', "frequency": ', _encode(frequency),
+        ', "source_ref": ', _source_ref_json(i, observed_at, frequency),
+        ', "source_time": {"observed_at": ', _encode_str(observed_at),
+        '}, "confidence": ', _encode(i.confidence),
+        ', "extraction_method": ', '"rule_based"' if not i.reasoning.startswith("障害") else '"morphology_based"',
+        ', "morphology": ', _morphology_json(i, observed_at, frequency),
+        ', "lexicon_version": ', _encode_str(i.lexicon_version),
+        ', "payload": ', _payload_json(i, observed_at, frequency),
+        "}",
+    ])
+
+
+def insight_mart_json(
+    insight: PIVOTInsight,
+    observed_at: Optional[str] = None,
+    frequency: int = 1,
+    fields: Optional[List[str]] = None,
+) -> str:
+    """
+    インサイトマートの JSON 文字列を生成（dict を組み立てない）
+
+    Args:
+        insight: PIVOT分類済みインサイト
+        observed_at: 観測日 (ISO-8601)
+        frequency: 類似発話の出現回数
+        fields: 出力するフィールド（None=すべて）
+
+    Returns:
+        str: JSON（改行なし）
+    """
+    observed_at = observed_at or datetime.now().strftime("%Y-%m-%d")
+    if fields is None:
+        return _full_mart_json(insight, observed_at, frequency)
+    names = mart_fields(fields)
+    return "{" + ", ".join(
+        _KEYS[name] + _JSON_FIELDS[name](insight, observed_at, frequency) for name in names
+    ) + "}"
+
+
+def write_insight_marts(
+    fp: TextIO,
+    items: Iterable[PIVOTInsight],
+    observed_at: Optional[str] = None,
+    frequencies: Optional[Dict[str, int]] = None,
+    fields: Optional[List[str]] = None,
+) -> int:
+    """
+    インサイトマートを JSONL としてストリーミング出力
+
+    Args:
+        fp: 出力先（テキストモード）
+        items: インサイト
+        observed_at: 観測日
+        frequencies: 代表インサイトのID → 出現回数（指定時は代表のみ出力）
+        fields: 出力するフィールド（None=すべて）
+
+    Returns:
+        int: 書き出した件数
+    """
+    observed_at = observed_at or datetime.now().strftime("%Y-%m-%d")
+    names = None if fields is None else mart_fields(fields)
+    count = 0
+    lines: List[str] = []
+    for item in items:
+        if frequencies is None:
+            frequency = 1
+        elif item.id in frequencies:
+            frequency = frequencies[item.id]
+        else:
+            continue
+        lines.append(insight_mart_json(item, observed_at, frequency, names))
+        if len(lines) >= WRITE_CHUNK:
+            fp.write("\n".join(lines) + "\n")
+            count += len(lines)
+            lines = []
+    if lines:
+        fp.write("\n".join(lines) + "\n")
+        count += len(lines)
+    return count
+
+
+class InsightMartView(Mapping):
+    """
+    インサイトマートの読み取り専用ビュー（フィールドはアクセス時に生成）
+
+    generate_pivot_insight_mart の dict と同じキー・値を返すが、値は保持せず
+    アクセスのたびに PIVOTInsight から生成する。
+    """
+
+    __slots__ = ("insight", "observed_at", "frequency", "fields")
+
+    def __init__(
+        self,
+        insight: PIVOTInsight,
+        observed_at: Optional[str] = None,
+        frequency: int = 1,
+        fields: Optional[List[str]] = None,
+    ):
+        """
+        Args:
+            insight: PIVOT分類済みインサイト
+            observed_at: 観測日 (ISO-8601)
+            frequency: 類似発話の出現回数
+            fields: 公開するフィールド（None=すべて）
+        """
+        self.insight = insight
+        self.observed_at = observed_at or datetime.now().strftime("%Y-%m-%d")
+        self.frequency = frequency
+        self.fields = tuple(INSIGHT_MART_FIELDS) if fields is None else tuple(mart_fields(fields))
+
+    def __getitem__(self, name: str):
+        if name not in self.fields:
+            raise KeyError(name)
+        return INSIGHT_MART_FIELDS[name](self.insight, self.observed_at, self.frequency)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __repr__(self) -> str:
+        return f"InsightMartView(id={self.insight.id!r}, fields={list(self.fields)!r})"
+
+    def to_dict(self) -> Dict:
+        """dict に変換（generate_pivot_insight_mart と同じ）"""
+        return {name: self[name] for name in self.fields}
+
+    def to_json(self) -> str:
+        """JSON 文字列に変換（insight_mart_json と同じ）"""
+        return insight_mart_json(self.insight, self.observed_at, self.frequency, list(self.fields))
@@ -0,0 +1,228 @@
+"""
+PIVOT Regex Safety - 正規表現のバックトラック対策
+
+PIVOT_KEYWORDS の "(.+?)(?:で|に)困っている" のように、先頭に無制限の
+量指定子を持つパターンは、句読点・改行のない長い行に対して
+開始位置ごとに末尾まで走査するため、入力長の2乗の時間がかかる。
+50KB の発話1件でワーカーが停止しないよう、安全モードでは
+このような高コストなパターンを次のいずれかで実行する。
+
+- 線形時間の正規表現エンジン（re2 モジュールがインストールされていれば使用。
+  google-re2 / pyre2。非対応の構文は下記の入力長制限にフォールバック）
+- 照合範囲の制限（入力が max_length 文字を超える場合、パターンに必須の
+  リテラルの出現位置の前後 max_length 文字ずつの範囲のみを照合する。
+  必須のリテラルが求められないパターンは先頭 max_length 文字のみ）
+  範囲を制限した発話は PIVOTInsight.degraded に "truncated" として記録される。
+
+判定は静的に行い、"(.{2,15}管理)" のような上限付きの繰り返しや
+末尾アンカーのみのパターンはそのまま標準の re で実行する。
+
+使用例:
+    from nlp.python.pivot import PIVOTClassifier
+    from nlp.python.pivot.regex_safety import RegexSafety
+
+    classifier = PIVOTClassifier(regex_safety=True)                   # 既定設定
+    classifier = PIVOTClassifier(regex_safety=RegexSafety(max_length=500, use_re2=False))
+"""
+
+import re
+import sys
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+try:
+    from re import _constants as _sre, _parser as _sre_parse
+except ImportError:  # Python 3.10 以前
+    import sre_constants as _sre
+    import sre_parse as _sre_parse
+
+try:
+    import re2
+except ImportError:  # pragma: no cover - オプション依存
+    re2 = None
+
+
+# 無制限の繰り返し（.+ / .* / \S+ / [...]* 等）
+_UNBOUNDED = re.compile(r"(?<!\\)(?:\.|\\[sSwWdD]|\])(?:[*+]|\{\d+,\})")
+
+
+def is_expensive(pattern: str) -> bool:
+    """入力長の2乗の時間がかかりうるパターンか（無制限の繰り返しを含むか）"""
+    return bool(_UNBOUNDED.search(pattern))
+
+
+def required_literals(pattern: str) -> Optional[Tuple[str, ...]]:
+    """
+    パターンがマッチするなら本文に必ず含まれるリテラルの組（いずれか1つが含まれる）
+
+    "(.+?)(?:に|は)(?:満足|問題ない)" → ("満足", "問題ない")。
+    連続するリテラル・リテラルの選択・1回以上の繰り返しの中身から
+    必須の組を求め、最短のリテラルが最も長い組を返す（照合で絞り込める度合いが高い）。
+    大文字小文字を区別しないパターン等、求められない場合は None。
+
+    Args:
+        pattern: 正規表現
+
+    Returns:
+        Optional[Tuple[str, ...]]: リテラルの組（None=不明）
+    """
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except Exception:  # noqa: BLE001 - コンパイル時にエラーを報告する
+        return None
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+    return _required_group(list(parsed))
+
+
+_REPEATS = tuple(
+    op for op in (_sre.MAX_REPEAT, _sre.MIN_REPEAT, getattr(_sre, "POSSESSIVE_REPEAT", None)) if op is not None
+)
+
+
+def _required_group(items) -> Optional[Tuple[str, ...]]:
+    """解析済みパターンの並びから必須のリテラルの組を求める"""
+    groups: List[Tuple[str, ...]] = []
+    run: List[str] = []
+    for op, av in items:
+        if op is _sre.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            groups.append(("".join(run),))
+            run = []
+        if op is _sre.SUBPATTERN:
+            _, add_flags, _, sub = av
+            group = None if add_flags & re.IGNORECASE else _required_group(list(sub))
+        elif op is _sre.BRANCH:
+            alternatives = [_required_group(list(branch)) for branch in av[1]]
+            group = None
+            if alternatives and all(alternatives):
+                group = tuple(dict.fromkeys(lit for alt in alternatives for lit in alt))
+        elif op in _REPEATS and av[0] >= 1:
+            group = _required_group(list(av[2]))
+        else:
+            group = None
+        if group:
+            groups.append(group)
+    if run:
+        groups.append(("".join(run),))
+    if not groups:
+        return None
+    return max(groups, key=lambda g: (min(map(len, g)), -len(g)))
+
+
+# 照合範囲を制限したかどうか（スレッドごと、reset_limited / was_limited で参照）
+_limited = threading.local()
+
+
+def reset_limited() -> None:
+    """このスレッドの「照合範囲を制限した」記録を消去"""
+    _limited.value = False
+
+
+def was_limited() -> bool:
+    """reset_limited 以降、このスレッドで照合範囲を制限したか"""
+    return getattr(_limited, "value", False)
+
+
+@dataclass(frozen=True)
+class RegexSafety:
+    """正規表現の安全モード設定"""
+    max_length: int = 1000   # 高コストなパターンに渡す最大文字数
+    use_re2: bool = True     # re2 がインストールされていれば使用
+
+    def guard(self, regex: re.Pattern):
+        """
+        高コストなパターンを保護付きパターンに置き換える
+
+        Args:
+            regex: コンパイル済みパターン
+
+        Returns:
+            GuardedPattern（高コストな場合）または regex そのもの
+        """
+        if not is_expensive(regex.pattern):
+            return regex
+        linear = None
+        if self.use_re2 and re2 is not None:
+            try:
+                linear = re2.compile(regex.pattern)
+            except Exception:  # re2 非対応の構文（後方参照・先読み等）
+                linear = None
+        return GuardedPattern(regex, self.max_length, linear)
+
+
+class GuardedPattern:
+    """高コストなパターンの保護付き実行（re.Pattern 互換の search / pattern）"""
+
+    def __init__(self, regex: re.Pattern, max_length: int, linear=None):
+        """
+        Args:
+            regex: 標準 re のパターン
+            max_length: 1回の照合に渡す最大文字数（linear が None の場合に適用）
+            linear: 線形時間エンジンのパターン（re2）
+        """
+        self.regex = regex
+        self.pattern = regex.pattern
+        self.max_length = max_length
+        self.linear = linear
+        # マッチに必須のリテラル（いずれか1つ、None=不明）
+        self.literals = required_literals(regex.pattern)
+        self.truncated = 0  # 照合範囲を制限した回数
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self) -> str:
+        return "re2" if self.linear is not None else "re+cap"
+
+    def search(self, text: str, pos: int = 0, endpos: Optional[int] = None):
+        end = len(text) if endpos is None else min(endpos, len(text))
+        if self.linear is not None:
+            return self.linear.search(text, pos, end)
+        if end - pos <= self.max_length:
+            return self.regex.search(text, pos, end)
+
+        _limited.value = True
+        with self._lock:
+            self.truncated += 1
+        if self.literals is None:
+            return self.regex.search(text, pos, pos + self.max_length)
+        for start, stop in self._windows(text, pos, end):
+            match = self.regex.search(text, start, stop)
+            if match:
+                return match
+        return None
+
+    def _windows(self, text: str, pos: int, end: int) -> List[Tuple[int, int]]:
+        """
+        必須リテラルの出現位置の前後 max_length 文字ずつの照合範囲（開始位置順）
+
+        先頭の出現位置から max_length 文字未満の出現位置は同じ範囲にまとめ、
+        範囲の終端をその出現位置の後 max_length 文字まで延ばす。すべての出現位置が
+        前後 max_length 文字ずつを含む範囲で照合される一方、範囲の数は
+        入力長 / max_length、範囲の長さは max_length の定数倍に収まるため、
+        全体の照合時間は入力長に対して線形に収まる。
+        """
+        hits = []
+        for literal in self.literals:
+            found = text.find(literal, pos, end)
+            while found >= 0:
+                hits.append((found, found + len(literal)))
+                found = text.find(literal, found + 1, end)
+        hits.sort()
+
+        windows = []
+        first = None
+        for start, stop in hits:
+            if first is not None and start < first + self.max_length:
+                window_start, window_end = windows[-1]
+                windows[-1] = (window_start, max(window_end, min(end, stop + self.max_length)))
+                continue
+            first = start
+            windows.append((max(pos, start - self.max_length), min(end, stop + self.max_length)))
+        return windows
+
+    def __repr__(self) -> str:
+        return f"GuardedPattern({self.pattern!r}, engine={self.engine})"
@@ -0,0 +1,722 @@
+"""
+PIVOT Repository - SQLite によるインサイト・サマリーの永続化
+
+MartStore（JSONL + マニフェスト）はパーティション単位の追記・走査に向くが、
+同じインサイトの再取り込み（上書き）や、Process をまたぐ集計を伴う問い合わせ
+（get_urgent_items の P×I 判定など）は全件をメモリに読み込んで計算する必要がある。
+本モジュールはマートを正規化したスキーマで SQLite に保存し、
+これらの問い合わせを SQL（インデックス + GROUP BY）で実行する。
+
+スキーマ:
+    entities        対象軸の正規名（kind = process / tool / people）
+    insights        インサイト（Voice・対象軸ID・インタビューID・観測日などを列に展開、
+                    マート全体は doc 列に JSON で保持）
+    insight_keywords インサイト × マッチしたキーワード
+    summaries       サマリーマート（期間タイプ・開始日・終了日で一意）
+    summary_counts  サマリー × 対象軸 × Voice の件数
+
+インデックス:
+    insights(pivot_voice) / (process_id, pivot_voice) / (tool_id) /
+    (interview_id) / (observed_at) / (abs(intensity_score))
+
+書き込みは WAL モードで行い、batch_size 件ごとに1トランザクションで
+executemany により upsert する（同じ id のインサイトは置き換え）。
+1つの接続をロックで共有するため、プロセス内のスレッドから並行に呼び出せる。
+読み取りは WAL により書き込み中の別プロセスからも行える。
+
+使用例:
+    from nlp.python.pivot.repository import InsightRepository
+
+    repo = InsightRepository("pivot.db")
+    repo.upsert_marts(engine.iter_marts(result, "2025-03-14"))
+    repo.upsert_summary(summary)
+
+    # 工程管理に関する3月の Pain
+    for mart in repo.query(voice="P", process="工程管理", month="2025-03"):
+        print(mart["title"])
+
+    # P×I が重なる Process のインサイト / 強度の大きいインサイト
+    urgent = repo.get_urgent_items(month="2025-03")
+    top = repo.get_priority_insights(top_n=10, voice=["P", "I"])
+
+    python -m nlp.python.pivot db import pivot.db out/shards/*.jsonl out/summary.json
+    python -m nlp.python.pivot db urgent pivot.db --month 2025-03
+"""
+
+import argparse
+import glob
+import itertools
+import json
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .classifier import PIVOT, _priority_matrix_from_counts
+
+
+# スキーマのバージョン（meta テーブルに記録）
+SCHEMA_VERSION = 1
+
+# 1トランザクションで upsert する件数
+DEFAULT_BATCH_SIZE = 1000
+
+# 対象軸の種類
+LAYER_KINDS = ("process", "tool", "people")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS entities (
+    entity_id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (kind, name)
+);
+
+CREATE TABLE IF NOT EXISTS insights (
+    id TEXT PRIMARY KEY,
+    pivot_voice TEXT NOT NULL,
+    pivot_score INTEGER NOT NULL,
+    process_id INTEGER REFERENCES entities (entity_id),
+    tool_id INTEGER REFERENCES entities (entity_id),
+    people_id INTEGER REFERENCES entities (entity_id),
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    confidence REAL,
+    temperature TEXT,
+    intensity_score REAL NOT NULL DEFAULT 0,
+    frequency INTEGER NOT NULL DEFAULT 1,
+    interview_id TEXT,
+    question_no INTEGER,
+    respondent_id TEXT,
+    observed_at TEXT,
+    lexicon_version TEXT,
+    doc TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_insights_voice ON insights (pivot_voice);
+CREATE INDEX IF NOT EXISTS idx_insights_process ON insights (process_id, pivot_voice);
+CREATE INDEX IF NOT EXISTS idx_insights_tool ON insights (tool_id);
+CREATE INDEX IF NOT EXISTS idx_insights_interview ON insights (interview_id);
+CREATE INDEX IF NOT EXISTS idx_insights_observed ON insights (observed_at);
+CREATE INDEX IF NOT EXISTS idx_insights_intensity ON insights (abs(intensity_score));
+
+CREATE TABLE IF NOT EXISTS insight_keywords (
+    insight_id TEXT NOT NULL REFERENCES insights (id) ON DELETE CASCADE,
+    keyword TEXT NOT NULL,
+    PRIMARY KEY (insight_id, keyword)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_insight_keywords_keyword ON insight_keywords (keyword);
+
+CREATE TABLE IF NOT EXISTS summaries (
+    summary_id INTEGER PRIMARY KEY,
+    period_type TEXT NOT NULL,
+    period_start TEXT NOT NULL,
+    period_end TEXT NOT NULL,
+    total_score INTEGER,
+    sentiment_index REAL,
+    doc TEXT NOT NULL,
+    UNIQUE (period_type, period_start, period_end)
+);
+
+CREATE TABLE IF NOT EXISTS summary_counts (
+    summary_id INTEGER NOT NULL REFERENCES summaries (summary_id) ON DELETE CASCADE,
+    entity_id INTEGER NOT NULL REFERENCES entities (entity_id),
+    voice TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (summary_id, entity_id, voice)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_INSIGHT = """
+INSERT INTO insights (
+    id, pivot_voice, pivot_score, process_id, tool_id, people_id, title, body,
+    confidence, temperature, intensity_score, frequency, interview_id, question_no,
+    respondent_id, observed_at, lexicon_version, doc
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    pivot_voice = excluded.pivot_voice,
+    pivot_score = excluded.pivot_score,
+    process_id = excluded.process_id,
+    tool_id = excluded.tool_id,
+    people_id = excluded.people_id,
+    title = excluded.title,
+    body = excluded.body,
+    confidence = excluded.confidence,
+    temperature = excluded.temperature,
+    intensity_score = excluded.intensity_score,
+    frequency = excluded.frequency,
+    interview_id = excluded.interview_id,
+    question_no = excluded.question_no,
+    respondent_id = excluded.respondent_id,
+    observed_at = excluded.observed_at,
+    lexicon_version = excluded.lexicon_version,
+    doc = excluded.doc
+"""
+
+_UPSERT_SUMMARY = """
+INSERT INTO summaries (period_type, period_start, period_end, total_score, sentiment_index, doc)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (period_type, period_start, period_end) DO UPDATE SET
+    total_score = excluded.total_score,
+    sentiment_index = excluded.sentiment_index,
+    doc = excluded.doc
+"""
+
+
+def _insight_row(mart: Dict, entity_ids: Dict[Tuple[str, str], int]) -> Tuple:
+    """マート1件を insights テーブルの行に変換"""
+    layers = mart.get("target_layers") or {}
+    context = mart.get("context") or {}
+    speaker = mart.get("speaker") or {}
+    morphology = mart.get("morphology") or {}
+    ids = [
+        entity_ids[(kind, layers[kind])] if layers.get(kind) else None
+        for kind in LAYER_KINDS
+    ]
+    return (
+        mart["id"],
+        mart["pivot_voice"],
+        mart.get("pivot_score", PIVOT.SCORES[mart["pivot_voice"]]),
+        *ids,
+        mart.get("title", ""),
+        mart.get("body", ""),
+        mart.get("confidence"),
+        mart.get("temperature"),
+        morphology.get("intensity_score", 0.0),
+        mart.get("frequency", 1),
+        context.get("interview_id"),
+        context.get("question_no"),
+        speaker.get("respondent_id"),
+        (mart.get("source_time") or {}).get("observed_at"),
+        mart.get("lexicon_version"),
+        json.dumps(mart, ensure_ascii=False),
+    )
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ========================================
+# リポジトリ
+# ========================================
+
+class InsightRepository:
+    """SQLite に保存したインサイト・サマリーマートのリポジトリ"""
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            path: データベースファイルのパス（":memory:" でメモリ上）
+            batch_size: 1トランザクションで upsert する件数
+        """
+        self.path = str(path)
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        # トランザクションは _transaction で明示的に開始する
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._entity_ids: Dict[Tuple[str, str], int] = {}
+        self._init_schema()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "InsightRepository":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ----------------------------------------
+    # スキーマ・トランザクション
+    # ----------------------------------------
+
+    def _init_schema(self) -> None:
+        with self._transaction():
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    self._conn.execute(statement)
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if row is None:
+                self._conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),)
+                )
+            elif int(row[0]) != SCHEMA_VERSION:
+                raise ValueError(f"未対応のスキーマバージョン: {row[0]}")
+
+    @contextmanager
+    def _transaction(self):
+        """ロックを取得して1トランザクションを実行（例外時はロールバック）"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                # 取り消された行の entity_id は再利用されうるため、キャッシュを破棄する
+                self._entity_ids.clear()
+                raise
+            self._conn.execute("COMMIT")
+
+    def _resolve_entities(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+        """(kind, name) → entity_id（未登録の対象軸は登録、トランザクション内で呼ぶ）"""
+        missing = {key for key in keys if key not in self._entity_ids}
+        if missing:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entities (kind, name) VALUES (?, ?)", sorted(missing)
+            )
+            for kind, name in missing:
+                row = self._conn.execute(
+                    "SELECT entity_id FROM entities WHERE kind = ? AND name = ?", (kind, name)
+                ).fetchone()
+                self._entity_ids[(kind, name)] = row[0]
+        return self._entity_ids
+
+    # ----------------------------------------
+    # 書き込み
+    # ----------------------------------------
+
+    def upsert_marts(self, marts: Iterable[Dict]) -> int:
+        """
+        インサイトマートを保存（同じ id のマートは置き換え）
+
+        Args:
+            marts: generate_pivot_insight_mart 形式のマート
+
+        Returns:
+            int: 保存した件数
+        """
+        total = 0
+        for chunk in _chunks(marts, self.batch_size):
+            for mart in chunk:
+                if mart.get("pivot_voice") not in PIVOT.ALL:
+                    raise ValueError(f"pivot_voice が不正なマート: {mart.get('id')}")
+            with self._transaction() as conn:
+                self._upsert_chunk(conn, chunk)
+            total += len(chunk)
+        return total
+
+    def _upsert_chunk(self, conn: sqlite3.Connection, chunk: List[Dict]) -> None:
+        entity_ids = self._resolve_entities(
+            (kind, name)
+            for mart in chunk
+            for kind, name in (mart.get("target_layers") or {}).items()
+            if kind in LAYER_KINDS and name
+        )
+        conn.executemany(_UPSERT_INSIGHT, [_insight_row(mart, entity_ids) for mart in chunk])
+        conn.executemany(
+            "DELETE FROM insight_keywords WHERE insight_id = ?", [(mart["id"],) for mart in chunk]
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO insight_keywords (insight_id, keyword) VALUES (?, ?)",
+            [
+                (mart["id"], keyword)
+                for mart in chunk
+                for keyword in (mart.get("keywords") or {}).get("surface") or []
+            ],
+        )
+
+    def upsert_summary(self, summary: Dict) -> int:
+        """
+        サマリーマートを保存（同じ期間のサマリーは置き換える）
+
+        Args:
+            summary: generate_pivot_summary_mart 形式のサマリー
+
+        Returns:
+            int: summary_id
+        """
+        period = summary["period"]
+        key = (period["type"], period["start"], period["end"])
+        with self._transaction() as conn:
+            conn.execute(_UPSERT_SUMMARY, (
+                *key,
+                summary.get("total_score"),
+                summary.get("sentiment_index"),
+                json.dumps(summary, ensure_ascii=False),
+            ))
+            summary_id = conn.execute(
+                "SELECT summary_id FROM summaries WHERE period_type = ? AND period_start = ? AND period_end = ?",
+                key,
+            ).fetchone()[0]
+
+            axes = [("process", summary.get("by_process") or {}), ("tool", summary.get("by_tool") or {})]
+            entity_ids = self._resolve_entities((kind, name) for kind, counts in axes for name in counts)
+            conn.execute("DELETE FROM summary_counts WHERE summary_id = ?", (summary_id,))
+            conn.executemany(
+                "INSERT INTO summary_counts (summary_id, entity_id, voice, count) VALUES (?, ?, ?, ?)",
+                [
+                    (summary_id, entity_ids[(kind, name)], voice, counts[voice])
+                    for kind, by_entity in axes
+                    for name, counts in by_entity.items()
+                    for voice in PIVOT.ALL
+                    if counts.get(voice)
+                ],
+            )
+        return summary_id
+
+    def delete_interview(self, interview_id: str) -> int:
+        """インタビュー1件分のインサイトを削除（再取り込み前の置き換え用）"""
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM insights WHERE interview_id = ?", (interview_id,)).rowcount
+
+    # ----------------------------------------
+    # 問い合わせ
+    # ----------------------------------------
+
+    @staticmethod
+    def _where(
+        voice: Union[str, Sequence[str], None] = None,
+        process: Optional[str] = None,
+        tool: Optional[str] = None,
+        interview_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        month: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        keyword: Optional[str] = None,
+    ) -> Tuple[str, List]:
+        """条件を WHERE 句とパラメータに変換（None=条件なし）"""
+        clauses: List[str] = []
+        params: List = []
+        if voice is not None:
+            voices = [voice] if isinstance(voice, str) else list(voice)
+            clauses.append(f"pivot_voice IN ({', '.join('?' * len(voices))})")
+            params.extend(voices)
+        for kind, name in (("process", process), ("tool", tool)):
+            if name is not None:
+                clauses.append(
+                    f"{kind}_id = (SELECT entity_id FROM entities WHERE kind = '{kind}' AND name = ?)"
+                )
+                params.append(name)
+        if interview_id is not None:
+            clauses.append("interview_id = ?")
+            params.append(interview_id)
+        if month is not None:
+            clauses.append("observed_at >= ? AND observed_at < date(?, '+1 month')")
+            params.extend([f"{month}-01", f"{month}-01"])
+        if start is not None:
+            clauses.append("observed_at >= ?")
+            params.append(start)
+        if end is not None:
+            # 観測日に時刻を含む場合も終了日の当日分を含める
+            clauses.append("observed_at < date(?, '+1 day')")
+            params.append(end)
+        if min_confidence is not None:
+            clauses.append("confidence >= ?")
+            params.append(min_confidence)
+        if keyword is not None:
+            clauses.append("id IN (SELECT insight_id FROM insight_keywords WHERE keyword = ?)")
+            params.append(keyword)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _fetch_docs(self, sql: str, params: Sequence) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(doc) for doc, in rows]
+
+    def query(self, limit: Optional[int] = None, **conditions) -> List[Dict]:
+        """
+        条件に合うインサイトマート
+
+        Args:
+            limit: 最大件数
+            **conditions: voice / process / tool / interview_id / start / end /
+                          month / min_confidence / keyword（MartStore.query と同じ意味）
+
+        Returns:
+            List[Dict]: マート（観測日・保存順）
+        """
+        where, params = self._where(**conditions)
+        sql = f"SELECT doc FROM insights{where} ORDER BY observed_at, rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._fetch_docs(sql, params)
+
+    def count(self, **conditions) -> int:
+        """条件に合う件数"""
+        where, params = self._where(**conditions)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM insights{where}", params).fetchone()[0]
+
+    def get_priority_insights(self, top_n: int = 10, **conditions) -> List[Dict]:
+        """
+        優先度の高いインサイト（engine.get_priority_insights の SQL 版）
+
+        Args:
+            top_n: 取得件数
+            **conditions: 絞り込み条件（query と同じ）
+
+        Returns:
+            List[Dict]: |intensity_score| の大きい順のマート（同値は保存順）
+        """
+        where, params = self._where(**conditions)
+        return self._fetch_docs(
+            f"SELECT doc FROM insights{where} ORDER BY abs(intensity_score) DESC, rowid LIMIT ?",
+            params + [top_n],
+        )
+
+    def get_urgent_items(self, **conditions) -> List[Dict]:
+        """
+        緊急対応が必要なインサイト（engine.get_urgent_items の SQL 版）
+
+        条件に合うインサイトのうち、Pain と Insecurity の両方がある Process の
+        インサイトを返す。
+
+        Args:
+            **conditions: 絞り込み条件（query と同じ、voice は指定不可）
+
+        Returns:
+            List[Dict]: マート（保存順）
+        """
+        if conditions.get("voice") is not None:
+            raise ValueError("get_urgent_items では voice を指定できません")
+        where, params = self._where(**conditions)
+        scope = where + (" AND " if where else " WHERE ") + "process_id IS NOT NULL"
+        return self._fetch_docs(
+            f"""
+            WITH urgent AS (
+                SELECT process_id FROM insights{scope}
+                GROUP BY process_id
+                HAVING SUM(pivot_voice = 'P') > 0 AND SUM(pivot_voice = 'I') > 0
+            )
+            SELECT doc FROM insights{scope}
+            AND process_id IN (SELECT process_id FROM urgent)
+            ORDER BY rowid
+            """,
+            params + params,
+        )
+
+    def by_process(self, **conditions) -> Dict[str, Dict[str, int]]:
+        """条件に合うインサイトの Process 別 PIVOT 件数"""
+        return self._by_layer("process", **conditions)
+
+    def by_tool(self, **conditions) -> Dict[str, Dict[str, int]]:
+        """条件に合うインサイトの Tool 別 PIVOT 件数"""
+        return self._by_layer("tool", **conditions)
+
+    def _by_layer(self, kind: str, **conditions) -> Dict[str, Dict[str, int]]:
+        where, params = self._where(**conditions)
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT e.name, i.pivot_voice, COUNT(*)
+                FROM (SELECT {kind}_id, pivot_voice FROM insights{where}) AS i
+                JOIN entities AS e ON e.entity_id = i.{kind}_id
+                GROUP BY e.name, i.pivot_voice
+                ORDER BY e.name
+                """,
+                params,
+            ).fetchall()
+        counts: Dict[str, Dict[str, int]] = {}
+        for name, voice, count in rows:
+            counts.setdefault(name, {p: 0 for p in PIVOT.ALL})[voice] = count
+        return counts
+
+    def priority_matrix(self, **conditions) -> Dict:
+        """条件に合うインサイトの優先度マトリクス（urgent / quick_win / watch）"""
+        return _priority_matrix_from_counts(self.by_process(**conditions))
+
+    # ----------------------------------------
+    # サマリー
+    # ----------------------------------------
+
+    def find_summaries(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        period_type: Optional[str] = None,
+    ) -> List[Dict]:
+        """期間が重なるサマリーマート（開始日順）"""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("period_end >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("period_start <= ?")
+            params.append(end)
+        if period_type is not None:
+            clauses.append("period_type = ?")
+            params.append(period_type)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return self._fetch_docs(
+            f"SELECT doc FROM summaries{where} ORDER BY period_start, period_end", params
+        )
+
+    def trend(
+        self,
+        process: Optional[str] = None,
+        tool: Optional[str] = None,
+        period_type: str = "monthly",
+    ) -> List[Dict]:
+        """
+        Process（または Tool）の PIVOT 件数の期間推移
+
+        Args:
+            process: Process（正規名）
+            tool: Tool（正規名、process と排他）
+            period_type: 期間タイプ
+
+        Returns:
+            List[Dict]: [{"start": ..., "end": ..., "P": n, ...}]（開始日順）
+        """
+        if (process is None) == (tool is None):
+            raise ValueError("process と tool のどちらか一方を指定してください")
+        kind, name = ("process", process) if process is not None else ("tool", tool)
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT s.period_start, s.period_end, c.voice, c.count
+                FROM summaries AS s
+                JOIN summary_counts AS c ON c.summary_id = s.summary_id
+                JOIN entities AS e ON e.entity_id = c.entity_id
+                WHERE s.period_type = ? AND e.kind = ? AND e.name = ?
+                ORDER BY s.period_start, s.period_end
+                """,
+                (period_type, kind, name),
+            ).fetchall()
+        periods: Dict[Tuple[str, str], Dict] = {}
+        for period_start, period_end, voice, count in rows:
+            entry = periods.setdefault(
+                (period_start, period_end),
+                {"start": period_start, "end": period_end, **{p: 0 for p in PIVOT.ALL}},
+            )
+            entry[voice] = count
+        return list(periods.values())
+
+    def stats(self) -> Dict:
+        """リポジトリ全体の統計"""
+        with self._lock:
+            by_voice = {p: 0 for p in PIVOT.ALL}
+            for voice, count in self._conn.execute(
+                "SELECT pivot_voice, COUNT(*) FROM insights GROUP BY pivot_voice"
+            ):
+                by_voice[voice] = count
+            first, last = self._conn.execute("SELECT MIN(observed_at), MAX(observed_at) FROM insights").fetchone()
+            interviews = self._conn.execute(
+                "SELECT COUNT(DISTINCT interview_id) FROM insights WHERE interview_id IS NOT NULL"
+            ).fetchone()[0]
+            summaries = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        return {
+            "rows": sum(by_voice.values()),
+            "by_voice": by_voice,
+            "interviews": interviews,
+            "date_range": [first, last] if first is not None else None,
+            "summaries": summaries,
+        }
+
+
+# ========================================
+# CLI
+# ========================================
+
+def _add_conditions(parser: argparse.ArgumentParser, voice: bool = True) -> None:
+    if voice:
+        parser.add_argument("--voice", action="append", choices=PIVOT.ALL, help="Voice（複数指定可）")
+    parser.add_argument("--process", default=None, help="Process（正規名）")
+    parser.add_argument("--tool", default=None, help="Tool（正規名）")
+    parser.add_argument("--interview-id", default=None, help="インタビューID")
+    parser.add_argument("--start", default=None, help="観測日の下限")
+    parser.add_argument("--end", default=None, help="観測日の上限")
+    parser.add_argument("--month", default=None, help="観測月（YYYY-MM）")
+    parser.add_argument("--min-confidence", type=float, default=None, help="信頼度の下限")
+    parser.add_argument("--keyword", default=None, help="マッチしたキーワード")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """db サブコマンドの引数定義"""
+    parser = argparse.ArgumentParser(
+        prog="python -m nlp.python.pivot db",
+        description="SQLite リポジトリへのマートの取り込み・問い合わせ",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="マートJSONL・サマリーJSONを取り込む")
+    imp.add_argument("db", help="データベースファイル")
+    imp.add_argument("inputs", nargs="+", help="マートJSONL・サマリーJSONのファイル・globパターン")
+    imp.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="1トランザクションの件数")
+
+    query = sub.add_parser("query", help="条件に合うマートを出力（JSONL）")
+    query.add_argument("db", help="データベースファイル")
+    _add_conditions(query)
+    query.add_argument("--limit", type=int, default=None, help="最大件数")
+    query.add_argument("--count", action="store_true", help="件数のみ出力")
+
+    priority = sub.add_parser("priority", help="|intensity_score| の大きいマートを出力")
+    priority.add_argument("db", help="データベースファイル")
+    _add_conditions(priority)
+    priority.add_argument("--top", type=int, default=10, help="取得件数")
+
+    urgent = sub.add_parser("urgent", help="P×I が重なる Process のマートを出力")
+    urgent.add_argument("db", help="データベースファイル")
+    _add_conditions(urgent, voice=False)
+
+    stats = sub.add_parser("stats", help="リポジトリの統計を出力")
+    stats.add_argument("db", help="データベースファイル")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLIエントリポイント"""
+    args = build_parser().parse_args(argv)
+
+    if args.command == "import":
+        repo = InsightRepository(args.db, batch_size=args.batch_size)
+        marts = summaries = 0
+        for spec in args.inputs:
+            for path in sorted(glob.glob(spec)) or [spec]:
+                with open(path, encoding="utf-8") as f:
+                    if path.endswith(".jsonl"):
+                        marts += repo.upsert_marts(json.loads(line) for line in f if line.strip())
+                    else:
+                        repo.upsert_summary(json.load(f))
+                        summaries += 1
+        print(f"imported {marts} marts, {summaries} summaries", file=sys.stderr)
+        return 0
+
+    repo = InsightRepository(args.db)
+    if args.command == "stats":
+        print(json.dumps(repo.stats(), ensure_ascii=False, indent=2))
+        return 0
+
+    conditions = dict(
+        process=args.process,
+        tool=args.tool,
+        interview_id=args.interview_id,
+        start=args.start,
+        end=args.end,
+        month=args.month,
+        min_confidence=args.min_confidence,
+        keyword=args.keyword,
+    )
+    if args.command != "urgent":
+        conditions["voice"] = args.voice
+    if args.command == "query" and args.count:
+        print(repo.count(**conditions))
+        return 0
+    if args.command == "query":
+        marts = repo.query(limit=args.limit, **conditions)
+    elif args.command == "priority":
+        marts = repo.get_priority_insights(top_n=args.top, **conditions)
+    else:
+        marts = repo.get_urgent_items(**conditions)
+    for mart in marts:
+        print(json.dumps(mart, ensure_ascii=False))
+    return 0
@@ -0,0 +1,252 @@
+"""
+PIVOT Batch Scoring - NumPyによるベクトル化スコアリング
+
+分類済みインサイトの Voice・信頼度・副詞係数・確信度を列指向の配列に展開し、
+強度スコアとドメイン重み付きランキングを一括で算出する。
+
+対応するスカラー実装:
+- 強度スコア: calculate_intensity_score / PIVOTClassifier._classify_single
+- 重み付きスコア: PIVOTClassifier.weighted_score（信頼度 × ドメイン重み）
+- ランキング: PIVOTClassifier._apply_domain_weights（降順・安定ソート）
+
+NumPy はオプション依存（pip install numpy）。未インストール時は
+本モジュールの関数呼び出し時に ImportError を送出する。
+
+使用例:
+    from nlp.python.pivot.scoring import ScoreArrays, rank_by_domains
+
+    arrays = ScoreArrays.from_insights(result.items)
+    orders = rank_by_domains(arrays, ["requirements", "hr_evaluation"])
+
+    top10 = [result.items[i] for i in orders["requirements"][:10]]
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - オプション依存
+    np = None
+
+from .classifier import DOMAIN_PIVOT_WEIGHTS, PIVOT, PIVOTInsight
+from .codes import VOICE_CODES
+
+
+# Voice → 配列インデックス（PIVOT.ALL の順、codes.VOICE_CODES と共通）
+VOICE_INDEX = VOICE_CODES
+
+# PIVOT.ALL 順の基本スコア
+BASE_SCORES = (
+    np.array([PIVOT.SCORES[v] for v in PIVOT.ALL], dtype=np.float64)
+    if np is not None else None
+)
+
+# 重み指定: ドメイン名 or {voice: weight}
+WeightSpec = Union[str, None, Mapping[str, float]]
+
+
+def _require_numpy():
+    """NumPyの存在を確認"""
+    if np is None:
+        raise ImportError("NumPy が必要です: pip install numpy")
+    return np
+
+
+# ========================================
+# 列指向スコア配列
+# ========================================
+
+@dataclass
+class ScoreArrays:
+    """インサイト群のスコア計算用配列（列指向）"""
+    voice: "np.ndarray"          # int8: PIVOT.ALL のインデックス
+    confidence: "np.ndarray"     # float64
+    degree_factor: "np.ndarray"  # float64
+    certainty: "np.ndarray"      # float64
+    _voice_orders: Optional[List["np.ndarray"]] = field(default=None, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.voice)
+
+    def voice_orders(self) -> List["np.ndarray"]:
+        """Voice別の信頼度降順インデックス（同点は元の順序、初回のみ算出）"""
+        if self._voice_orders is None:
+            _np = _require_numpy()
+            order = _np.lexsort((_np.arange(len(self)), -self.confidence, self.voice))
+            bounds = _np.searchsorted(self.voice[order], _np.arange(1, len(PIVOT.ALL)))
+            self._voice_orders = _np.split(order, bounds)
+        return self._voice_orders
+
+    @classmethod
+    def from_insights(cls, items: Sequence[PIVOTInsight]) -> "ScoreArrays":
+        """PIVOTInsightのリストから配列を構築"""
+        _np = _require_numpy()
+        n = len(items)
+        return cls(
+            voice=_np.fromiter((VOICE_INDEX[i.pivot_voice] for i in items), dtype=_np.int8, count=n),
+            confidence=_np.fromiter((i.confidence for i in items), dtype=_np.float64, count=n),
+            degree_factor=_np.fromiter((i.degree_factor for i in items), dtype=_np.float64, count=n),
+            certainty=_np.fromiter((i.certainty for i in items), dtype=_np.float64, count=n),
+        )
+
+    @property
+    def base_score(self) -> "np.ndarray":
+        """PIVOT基本スコア (-2, -1, +1, +2)"""
+        return BASE_SCORES[self.voice]
+
+    def intensity(self) -> "np.ndarray":
+        """強度スコア = 基本スコア × 副詞係数 × 確信度"""
+        return calculate_intensity_scores(self.base_score, self.degree_factor, self.certainty)
+
+
+# ========================================
+# スコア算出
+# ========================================
+
+def calculate_intensity_scores(
+    base_score: "np.ndarray",
+    degree_factor: "np.ndarray",
+    certainty: "np.ndarray",
+) -> "np.ndarray":
+    """
+    強度スコアを一括算出（calculate_intensity_score のベクトル版）
+
+    Args:
+        base_score: PIVOTの基本スコア配列
+        degree_factor: 副詞による程度係数配列
+        certainty: 語尾による確信度配列
+
+    Returns:
+        np.ndarray: 強度スコア配列
+    """
+    _np = _require_numpy()
+    return _np.asarray(base_score, dtype=_np.float64) * degree_factor * certainty
+
+
+def resolve_weights(weights: WeightSpec) -> Dict[str, float]:
+    """重み指定を {voice: weight} に解決（未指定のVoiceは1.0）"""
+    if weights is None or isinstance(weights, str):
+        mapping = DOMAIN_PIVOT_WEIGHTS.get(weights, {})
+    else:
+        mapping = weights
+    return {p: float(mapping.get(p, 1.0)) for p in PIVOT.ALL}
+
+
+def weight_vector(weights: WeightSpec) -> "np.ndarray":
+    """
+    重み指定を PIVOT.ALL 順の重みベクトルに変換
+
+    Args:
+        weights: ドメイン名 / {voice: weight} / None（全て1.0）
+
+    Returns:
+        np.ndarray: shape (5,) の重みベクトル
+    """
+    _np = _require_numpy()
+    resolved = resolve_weights(weights)
+    return _np.array([resolved[v] for v in PIVOT.ALL], dtype=_np.float64)
+
+
+def weighted_scores(arrays: ScoreArrays, weights: WeightSpec) -> "np.ndarray":
+    """重み付きスコア（信頼度 × ドメイン重み）を一括算出"""
+    return arrays.confidence * weight_vector(weights)[arrays.voice]
+
+
+def _ranked_order(
+    arrays: ScoreArrays,
+    weights: "np.ndarray",
+    top_n: Optional[int],
+) -> "np.ndarray":
+    """重み付きスコアの降順・安定の並び順"""
+    _np = _require_numpy()
+    if top_n is None or top_n >= len(arrays):
+        scores = arrays.confidence * weights[arrays.voice]
+        return _np.argsort(-scores, kind="stable")
+    if top_n <= 0:
+        return _np.empty(0, dtype=_np.intp)
+
+    # Voice内の順位は重みに依存しないため、各Voiceの上位 top_n だけが候補になる
+    candidates = _np.concatenate([order[:top_n] for order in arrays.voice_orders()])
+    scores = arrays.confidence[candidates] * weights[arrays.voice[candidates]]
+    return candidates[_np.lexsort((candidates, -scores))[:top_n]]
+
+
+def rank(
+    arrays: ScoreArrays,
+    weights: WeightSpec,
+    top_n: Optional[int] = None,
+) -> "np.ndarray":
+    """
+    重み付きスコアの降順インデックスを算出
+
+    同点は元の順序を維持するため、_apply_domain_weights と同じ並びになる。
+
+    Args:
+        arrays: スコア配列
+        weights: ドメイン名 or 重み辞書
+        top_n: 上位件数（None=全件）
+
+    Returns:
+        np.ndarray: 並び替え後のインデックス配列
+    """
+    return _ranked_order(arrays, weight_vector(weights), top_n)
+
+
+def rank_by_domains(
+    arrays: ScoreArrays,
+    domains: Optional[Iterable[WeightSpec]] = None,
+    top_n: Optional[int] = None,
+) -> Dict[str, "np.ndarray"]:
+    """
+    複数の重み付けでランキングを一括算出
+
+    top_n 指定時は Voice別の信頼度順を1度だけ求め、以降の重み付けは
+    候補 5×top_n 件の並び替えのみで済む。
+
+    Args:
+        arrays: スコア配列
+        domains: ドメイン名 or 重み辞書のリスト（None=全BusinessDomain）
+        top_n: 上位件数（None=全件）
+
+    Returns:
+        Dict[str, np.ndarray]: 重み指定ごとの降順インデックス
+            （キーはドメイン名、重み辞書は "custom_<n>"）
+    """
+    specs = list(DOMAIN_PIVOT_WEIGHTS) if domains is None else list(domains)
+    return {
+        str(spec if isinstance(spec, str) or spec is None else f"custom_{i}"):
+            _ranked_order(arrays, weight_vector(spec), top_n)
+        for i, spec in enumerate(specs)
+    }
+
+
+# ========================================
+# 書き戻し
+# ========================================
+
+def apply_intensity_scores(
+    items: List[PIVOTInsight],
+    arrays: Optional[ScoreArrays] = None,
+) -> "np.ndarray":
+    """
+    強度スコアを一括算出してインサイトに書き戻す
+
+    Args:
+        items: PIVOTInsightのリスト
+        arrays: 構築済みの配列（None=items から構築）
+
+    Returns:
+        np.ndarray: 強度スコア配列
+    """
+    if arrays is None:
+        arrays = ScoreArrays.from_insights(items)
+    intensity = arrays.intensity()
+    for item, score in zip(items, intensity.tolist()):
+        item.intensity_score = score
+    return intensity
+
+
+def reorder(items: Sequence[PIVOTInsight], order: "np.ndarray") -> List[PIVOTInsight]:
+    """インデックス配列に従ってインサイトを並べ替え"""
+    return [items[i] for i in order.tolist()]
@@ -0,0 +1,694 @@
+"""
+PIVOT Insight Search - 文字bigramの転置インデックスによるインサイト全文検索
+
+「引継ぎ・属人化に言及したインサイト」のような問い合わせのために、
+インサイト本文（PIVOTInsight.body / マートの body）の文字bigramから
+転置インデックスを作る。形態素解析を使わないため日本語の複合語の途中にも一致する。
+
+インデックス:
+    - 本文を dedup.normalize_text で正規化（NFKC・空白/句読点除去・小文字化）し、
+      重複を除いた文字bigramごとに文書番号の昇順リスト（array('I')）を持つ
+    - Voice・温度感は文書ごとの1バイトのコード、対象軸（Process/Tool/People）と
+      インタビューIDは記号表のIDの配列で保持する
+    - 追加は逐次（add / add_result / add_marts）。同じIDの再追加・削除は
+      削除フラグで扱い、save 時に詰める
+
+検索:
+    1. 検索語ごとに、bigramの文書リストを短い順に積集合して候補を絞る
+    2. Voice・温度感・対象軸の条件を配列で判定し、候補に含まれる検索語から
+       BM25（出現の有無のみ）でスコアの上限値を算出
+    3. 上限値の高い順に、正規化した本文に検索語が含まれるかを確認して
+       （bigramの偶然の一致を除く）スコアを確定し、上位 limit 件が決まった時点で打ち切る
+    mode="any" はいずれかの検索語、mode="all" はすべての検索語を含む文書を返す。
+    検索語の文書頻度は最も短いbigramの文書リストの長さで近似する。
+    NumPy があれば 1・2 をベクトル化する（結果は同一）。
+
+保存形式（save / load）:
+    マジック "PVIX" + 形式バージョン、続けて各セクションを「長さ(uint32) + zlib圧縮データ」で格納。
+    文書リストは差分符号化した uint32 列（リトルエンディアン）。
+
+使用例:
+    from nlp.python.pivot.search import InsightIndex
+
+    index = InsightIndex()
+    index.add_result(result)                 # 処理結果ごとに逐次追加
+    for hit in index.search("引継ぎ 属人化", voice=["P", "I"], temperature="high"):
+        print(f"{hit.score:.2f} {hit.pivot_voice} {hit.body}")
+    index.save("insights.pvix")
+
+    python -m nlp.python.pivot search add insights.pvix out/shards/*.jsonl
+    python -m nlp.python.pivot search query insights.pvix 引継ぎ 属人化 --voice P
+"""
+
+import argparse
+import glob
+import heapq
+import itertools
+import json
+import math
+import operator
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - オプション依存
+    np = None
+
+from .classifier import PIVOT, PIVOTClassificationResult, PIVOTInsight
+from .codes import (
+    LAYER_KINDS,
+    TEMPERATURES,
+    VOICE_CODES,
+    VOICE_LABELS,
+    SymbolTable,
+    temperature_code,
+)
+from .dedup import normalize_text
+
+
+# 保存形式のマジックとバージョン
+MAGIC = b"PVIX"
+FORMAT_VERSION = 1
+
+# BM25 のパラメータ
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_EMPTY = np.empty(0, dtype=np.uint32) if np is not None else None
+
+
+def bigrams(text: str) -> Set[str]:
+    """正規化済みテキストの文字bigram（1文字のテキストはその1文字）"""
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+@dataclass
+class SearchHit:
+    """検索結果1件"""
+    id: str                       # マートID（pivot_<インサイトID>）
+    score: float
+    pivot_voice: str
+    temperature: str
+    target_layers: Dict[str, Optional[str]] = field(default_factory=dict)
+    interview_id: Optional[str] = None
+    body: str = ""
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "score": round(self.score, 4),
+            "pivot_voice": self.pivot_voice,
+            "temperature": self.temperature,
+            "target_layers": self.target_layers,
+            "interview_id": self.interview_id,
+            "body": self.body,
+        }
+
+
+# ========================================
+# インデックス
+# ========================================
+
+class InsightIndex:
+    """インサイト本文の文字bigram転置インデックス"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.postings: Dict[str, array] = {}
+        self.ids: List[str] = []
+        self.bodies: List[str] = []
+        self.lengths = array("I")
+        self.voices = bytearray()
+        self.temperatures = bytearray()
+        self.layers: Dict[str, array] = {kind: array("i") for kind in LAYER_KINDS}
+        self.interviews = array("i")
+        self.alive = bytearray()
+        self.symbols = SymbolTable()
+        self._doc_ids: Dict[str, int] = {}
+        self._deleted = 0
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.ids) - self._deleted
+
+    def __contains__(self, mart_id: str) -> bool:
+        return mart_id in self._doc_ids
+
+    # ----------------------------------------
+    # 追加・削除
+    # ----------------------------------------
+
+    def add(
+        self,
+        mart_id: str,
+        body: str,
+        pivot_voice: str,
+        temperature: str = "medium",
+        target_layers: Optional[Dict[str, Optional[str]]] = None,
+        interview_id: Optional[str] = None,
+    ) -> int:
+        """
+        文書を1件追加（同じIDの文書は置き換え）
+
+        Args:
+            mart_id: マートID
+            body: 本文
+            pivot_voice: Voice
+            temperature: 温度感（low / medium / high）
+            target_layers: 対象軸（process / tool / people）
+            interview_id: インタビューID
+
+        Returns:
+            int: 文書番号
+        """
+        if pivot_voice not in PIVOT.ALL:
+            raise ValueError(f"pivot_voice が不正な文書: {mart_id}")
+        text = normalize_text(body)
+        layers = target_layers or {}
+        with self._lock:
+            self.remove(mart_id)
+            doc = len(self.ids)
+            self.ids.append(mart_id)
+            self.bodies.append(body)
+            self.lengths.append(len(text))
+            self.voices.append(VOICE_CODES[pivot_voice])
+            self.temperatures.append(temperature_code(temperature))
+            for kind in LAYER_KINDS:
+                self.layers[kind].append(self.symbols.intern(layers.get(kind)))
+            self.interviews.append(self.symbols.intern(interview_id))
+            self.alive.append(1)
+            for gram in bigrams(text):
+                posting = self.postings.get(gram)
+                if posting is None:
+                    posting = self.postings[gram] = array("I")
+                posting.append(doc)
+            self._doc_ids[mart_id] = doc
+            self._total_length += len(text)
+        return doc
+
+    def add_insight(self, insight: PIVOTInsight) -> int:
+        """PIVOTInsight を追加"""
+        source = insight.source
+        return self.add(
+            f"pivot_{insight.id}",
+            insight.body,
+            insight.pivot_voice,
+            insight.temperature,
+            insight.target_layers,
+            source.interview_id if source else None,
+        )
+
+    def add_result(self, result: PIVOTClassificationResult) -> int:
+        """
+        分類結果（または InsightInterviewResult）のインサイトを追加
+
+        Returns:
+            int: 追加した件数
+        """
+        for insight in result.items:
+            self.add_insight(insight)
+        return len(result.items)
+
+    def add_marts(self, marts: Iterable[Dict]) -> int:
+        """
+        インサイトマートを追加
+
+        Args:
+            marts: generate_pivot_insight_mart 形式のマート
+
+        Returns:
+            int: 追加した件数
+        """
+        count = 0
+        for mart in marts:
+            self.add(
+                mart["id"],
+                mart.get("body", ""),
+                mart.get("pivot_voice"),
+                mart.get("temperature") or "medium",
+                mart.get("target_layers"),
+                (mart.get("context") or {}).get("interview_id"),
+            )
+            count += 1
+        return count
+
+    def remove(self, mart_id: str) -> bool:
+        """文書を削除（削除フラグを立て、save 時に詰める）"""
+        with self._lock:
+            doc = self._doc_ids.pop(mart_id, None)
+            if doc is None:
+                return False
+            self.alive[doc] = 0
+            self._deleted += 1
+            self._total_length -= self.lengths[doc]
+            return True
+
+    def remove_interview(self, interview_id: str) -> int:
+        """インタビュー1件分の文書を削除（再処理結果の置き換え用）"""
+        symbol = self.symbols.get(interview_id)
+        if symbol is None:
+            return 0
+        with self._lock:
+            targets = [
+                self.ids[doc] for doc, value in enumerate(self.interviews)
+                if value == symbol and self.alive[doc]
+            ]
+            for mart_id in targets:
+                self.remove(mart_id)
+        return len(targets)
+
+    def compact(self) -> None:
+        """削除済みの文書を除いて文書番号を詰める"""
+        with self._lock:
+            if not self._deleted:
+                return
+            alive = [doc for doc, flag in enumerate(self.alive) if flag]
+            renumber = {doc: new for new, doc in enumerate(alive)}
+            self.ids = [self.ids[doc] for doc in alive]
+            self.bodies = [self.bodies[doc] for doc in alive]
+            self.lengths = array("I", (self.lengths[doc] for doc in alive))
+            self.voices = bytearray(self.voices[doc] for doc in alive)
+            self.temperatures = bytearray(self.temperatures[doc] for doc in alive)
+            for kind in LAYER_KINDS:
+                self.layers[kind] = array("i", (self.layers[kind][doc] for doc in alive))
+            self.interviews = array("i", (self.interviews[doc] for doc in alive))
+            self.alive = bytearray(b"\x01" * len(alive))
+            postings = {}
+            for gram, posting in self.postings.items():
+                kept = array("I", (renumber[doc] for doc in posting if doc in renumber))
+                if kept:
+                    postings[gram] = kept
+            self.postings = postings
+            self._doc_ids = {mart_id: doc for doc, mart_id in enumerate(self.ids)}
+            self._deleted = 0
+
+    # ----------------------------------------
+    # 検索
+    # ----------------------------------------
+
+    def search(
+        self,
+        terms: Union[str, Sequence[str], None] = None,
+        mode: str = "any",
+        voice: Union[str, Sequence[str], None] = None,
+        temperature: Union[str, Sequence[str], None] = None,
+        process: Optional[str] = None,
+        tool: Optional[str] = None,
+        people: Optional[str] = None,
+        interview_id: Optional[str] = None,
+        limit: Optional[int] = 20,
+    ) -> List[SearchHit]:
+        """
+        検索語と条件に合う文書をスコア順に返す
+
+        Args:
+            terms: 検索語（空白区切りの文字列またはリスト、None=条件のみで検索）
+            mode: "any"（いずれかを含む）/ "all"（すべてを含む）
+            voice: Voice（"P" または ["P", "I"]）
+            temperature: 温度感（"high" または ["medium", "high"]）
+            process: Process（正規名）
+            tool: Tool（正規名）
+            people: People（正規名）
+            interview_id: インタビューID
+            limit: 最大件数（None=すべて）
+
+        Returns:
+            List[SearchHit]: スコアの降順（同点は追加順）
+        """
+        if mode not in ("any", "all"):
+            raise ValueError(f"未対応の mode: {mode}")
+        if isinstance(terms, str):
+            terms = terms.split()
+        queries = list(dict.fromkeys(t for t in (normalize_text(t) for t in terms or []) if t))
+
+        with self._lock:
+            checks = self._filters(voice, temperature, process, tool, people, interview_id)
+            if checks is None:
+                return []
+            if not queries:
+                docs = [
+                    doc for doc in range(len(self.ids))
+                    if self.alive[doc] and all(values[doc] in codes for values, _, codes in checks)
+                ]
+                return [self._hit(doc, 0.0) for doc in docs[:limit]]
+
+            live = len(self)
+            idfs, candidates = [], []
+            for query in queries:
+                docs, df = self._candidates(query)
+                if not len(docs) and mode == "all":
+                    return []
+                idfs.append(math.log(1.0 + (live - df + 0.5) / (df + 0.5)))
+                candidates.append(docs)
+
+            docs, estimates = self._estimate(candidates, idfs, mode, checks)
+            ranked = self._verify(docs, estimates, queries, idfs, mode, limit)
+            return [self._hit(doc, score) for doc, score in ranked]
+
+    def count(self, terms: Union[str, Sequence[str], None] = None, mode: str = "any", **conditions) -> int:
+        """検索語と条件に合う件数"""
+        return len(self.search(terms, mode, limit=None, **conditions))
+
+    def _filters(self, voice, temperature, process, tool, people, interview_id):
+        """条件を (配列, NumPy の型, 許容するコード) のリストに変換（一致しえなければ None）"""
+        checks = []
+        if voice is not None:
+            voices = [voice] if isinstance(voice, str) else voice
+            checks.append((self.voices, "u1", {VOICE_CODES[v] for v in voices}))
+        if temperature is not None:
+            temperatures = [temperature] if isinstance(temperature, str) else temperature
+            checks.append((self.temperatures, "u1", {temperature_code(t) for t in temperatures}))
+        for values, name in (
+            (self.layers["process"], process),
+            (self.layers["tool"], tool),
+            (self.layers["people"], people),
+            (self.interviews, interview_id),
+        ):
+            if name is not None:
+                symbol = self.symbols.get(name)
+                if symbol is None:
+                    return None
+                checks.append((values, "i4", {symbol}))
+        return checks
+
+    def _candidates(self, query: str):
+        """
+        検索語を含みうる文書と文書頻度の近似値
+
+        2文字以下の検索語では候補がそのまま一致文書になる。
+        3文字以上ではbigramの並びまでは確認しないため、_verify で本文を確認する。
+        """
+        if len(query) == 1:
+            # 1文字の検索語はその文字を含むbigramの文書リストの和集合
+            lists = [posting for gram, posting in self.postings.items() if query in gram]
+            if np is not None:
+                docs = np.unique(np.concatenate([np.frombuffer(p, dtype=np.uint32) for p in lists] or [_EMPTY]))
+                return docs.astype(np.int64), len(docs)
+            docs = sorted(set().union(*lists))
+            return docs, len(docs)
+
+        lists = [self.postings.get(gram) for gram in bigrams(query)]
+        if any(posting is None for posting in lists):
+            return (np.empty(0, dtype=np.int64) if np is not None else []), 0
+        lists.sort(key=len)
+        df = len(lists[0])
+        if np is not None:
+            docs = np.frombuffer(lists[0], dtype=np.uint32)
+            for posting in lists[1:]:
+                if not len(docs):
+                    break
+                docs = np.intersect1d(docs, np.frombuffer(posting, dtype=np.uint32), assume_unique=True)
+            return docs.astype(np.int64), df
+        docs = set(lists[0])
+        for posting in lists[1:]:
+            if not docs:
+                break
+            docs.intersection_update(posting)
+        return sorted(docs), df
+
+    def _estimate(self, candidates, idfs, mode, checks) -> Tuple[List[int], List[float]]:
+        """
+        候補文書のスコアの上限値（候補に含まれる検索語がすべて一致した場合の BM25）を
+        降順（同点は文書番号順）で返す
+
+        短い発話が中心のため、検索語の出現回数は数えず有無のみをスコアに使う。
+        """
+        avg_length = self._total_length / len(self) if len(self) else 1.0
+        if np is not None:
+            if mode == "all":
+                docs = candidates[0]
+                for other in candidates[1:]:
+                    docs = np.intersect1d(docs, other, assume_unique=True)
+                weights = np.full(len(docs), sum(idfs))
+            else:
+                docs, inverse = np.unique(np.concatenate(candidates), return_inverse=True)
+                weights = np.bincount(
+                    inverse,
+                    weights=np.concatenate([np.full(len(c), idf) for c, idf in zip(candidates, idfs)]),
+                    minlength=len(docs),
+                )
+            mask = np.frombuffer(self.alive, dtype=np.uint8)[docs] == 1
+            for values, dtype, codes in checks:
+                mask &= np.isin(np.frombuffer(values, dtype=dtype)[docs], list(codes))
+            docs, weights = docs[mask], weights[mask]
+            lengths = np.frombuffer(self.lengths, dtype=np.uint32)[docs]
+            estimates = weights * (BM25_K1 + 1.0) / (1.0 + BM25_K1 * (1.0 - BM25_B + BM25_B * lengths / avg_length))
+            order = np.lexsort((docs, -estimates))
+            return docs[order].tolist(), estimates[order].tolist()
+
+        if mode == "all":
+            common = set(candidates[0]).intersection(*candidates[1:])
+            weights = dict.fromkeys(common, sum(idfs))
+        else:
+            weights = {}
+            for docs, idf in zip(candidates, idfs):
+                for doc in docs:
+                    weights[doc] = weights.get(doc, 0.0) + idf
+        ranked = sorted(
+            (
+                (doc, weight * self._length_factor(doc, avg_length))
+                for doc, weight in weights.items()
+                if self.alive[doc] and all(values[doc] in codes for values, _, codes in checks)
+            ),
+            key=lambda x: (-x[1], x[0]),
+        )
+        return [doc for doc, _ in ranked], [score for _, score in ranked]
+
+    def _length_factor(self, doc: int, avg_length: float) -> float:
+        return (BM25_K1 + 1.0) / (1.0 + BM25_K1 * (1.0 - BM25_B + BM25_B * self.lengths[doc] / avg_length))
+
+    def _verify(self, docs, estimates, queries, idfs, mode, limit) -> List[Tuple[int, float]]:
+        """
+        本文に検索語が含まれるかを確認し、確定したスコアで上位 limit 件を返す
+
+        上限値の降順に確認し、確定済みの limit 件目のスコアが次の上限値を
+        上回った時点で打ち切る。検索語がすべて2文字以下なら上限値がそのまま確定値。
+        """
+        if all(len(query) <= 2 for query in queries):
+            ranked = list(zip(docs, estimates))
+            return ranked if limit is None else ranked[:limit]
+
+        avg_length = self._total_length / len(self) if len(self) else 1.0
+        needed = len(queries) if mode == "all" else 1
+        heap: List[Tuple[float, int]] = []
+        for doc, estimate in zip(docs, estimates):
+            if limit is not None and len(heap) >= limit and heap[0][0] > estimate:
+                break
+            text = normalize_text(self.bodies[doc])
+            present = [idf for query, idf in zip(queries, idfs) if query in text]
+            if len(present) < needed:
+                continue
+            entry = (sum(present) * self._length_factor(doc, avg_length), -doc)
+            if limit is None or len(heap) < limit:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heappushpop(heap, entry)
+        return [(-neg_doc, score) for score, neg_doc in sorted(heap, reverse=True)]
+
+    def _hit(self, doc: int, score: float) -> SearchHit:
+        return SearchHit(
+            id=self.ids[doc],
+            score=score,
+            pivot_voice=VOICE_LABELS[self.voices[doc]],
+            temperature=TEMPERATURES[self.temperatures[doc]],
+            target_layers={kind: self.symbols.name(self.layers[kind][doc]) for kind in LAYER_KINDS},
+            interview_id=self.symbols.name(self.interviews[doc]),
+            body=self.bodies[doc],
+        )
+
+    # ----------------------------------------
+    # 保存・読み込み
+    # ----------------------------------------
+
+    def save(self, path: str) -> None:
+        """
+        インデックスをファイルに保存（削除済みの文書は詰める）
+
+        Args:
+            path: 保存先（一時ファイルに書いてから置き換える）
+        """
+        with self._lock:
+            self.compact()
+            terms = sorted(self.postings)
+            deltas = array("I")
+            for term in terms:
+                posting = self.postings[term]
+                deltas.append(posting[0])
+                deltas.extend(map(operator.sub, itertools.islice(posting, 1, None), posting))
+            header = {
+                "format_version": FORMAT_VERSION,
+                "ids": self.ids,
+                "bodies": self.bodies,
+                "symbols": self.symbols.names,
+                "terms": terms,
+                "counts": [len(self.postings[term]) for term in terms],
+            }
+            sections = [
+                json.dumps(header, ensure_ascii=False).encode("utf-8"),
+                bytes(self.voices),
+                bytes(self.temperatures),
+                *(_le_bytes(self.layers[kind]) for kind in LAYER_KINDS),
+                _le_bytes(self.interviews),
+                _le_bytes(self.lengths),
+                _le_bytes(deltas),
+            ]
+
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + bytes([FORMAT_VERSION]))
+            for section in sections:
+                data = zlib.compress(section, 6)
+                f.write(struct.pack("<I", len(data)))
+                f.write(data)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "InsightIndex":
+        """保存したインデックスを読み込む"""
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != MAGIC or data[4] != FORMAT_VERSION:
+            raise ValueError(f"インデックスファイルではないか、未対応の形式です: {path}")
+        sections = []
+        pos = 5
+        while pos < len(data):
+            (size,) = struct.unpack_from("<I", data, pos)
+            sections.append(zlib.decompress(data[pos + 4:pos + 4 + size]))
+            pos += 4 + size
+        header = json.loads(sections[0].decode("utf-8"))
+
+        index = cls()
+        index.ids = header["ids"]
+        index.bodies = header["bodies"]
+        index.symbols = SymbolTable(header["symbols"])
+        index._doc_ids = {mart_id: doc for doc, mart_id in enumerate(index.ids)}
+        index.voices = bytearray(sections[1])
+        index.temperatures = bytearray(sections[2])
+        for kind, section in zip(LAYER_KINDS, sections[3:6]):
+            index.layers[kind] = _from_le_bytes("i", section)
+        index.interviews = _from_le_bytes("i", sections[6])
+        index.lengths = _from_le_bytes("I", sections[7])
+        index.alive = bytearray(b"\x01" * len(index.ids))
+        index._total_length = sum(index.lengths)
+
+        deltas = _from_le_bytes("I", sections[8])
+        pos = 0
+        for term, count in zip(header["terms"], header["counts"]):
+            index.postings[term] = array("I", itertools.accumulate(deltas[pos:pos + count]))
+            pos += count
+        return index
+
+    def stats(self) -> Dict:
+        """インデックスの統計"""
+        with self._lock:
+            by_voice = {p: 0 for p in PIVOT.ALL}
+            for code, flag in zip(self.voices, self.alive):
+                if flag:
+                    by_voice[VOICE_LABELS[code]] += 1
+            return {
+                "documents": len(self),
+                "deleted": self._deleted,
+                "terms": len(self.postings),
+                "postings": sum(len(p) for p in self.postings.values()),
+                "symbols": len(self.symbols),
+                "by_voice": by_voice,
+            }
+
+
+def _le_bytes(values: array) -> bytes:
+    """配列をリトルエンディアンのバイト列に変換"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le_bytes(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+# ========================================
+# CLI
+# ========================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """search サブコマンドの引数定義"""
+    parser = argparse.ArgumentParser(
+        prog="python -m nlp.python.pivot search",
+        description="インサイト本文の転置インデックスの作成・検索",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="マートJSONLをインデックスに追加（同じインタビューは置き換え）")
+    add.add_argument("index", help="インデックスファイル（なければ作成）")
+    add.add_argument("inputs", nargs="+", help="マートJSONLファイル・globパターン")
+
+    query = sub.add_parser("query", help="検索結果を出力（JSONL）")
+    query.add_argument("index", help="インデックスファイル")
+    query.add_argument("terms", nargs="*", help="検索語")
+    query.add_argument("--all", action="store_true", help="すべての検索語を含む文書のみ")
+    query.add_argument("--voice", action="append", choices=PIVOT.ALL, help="Voice（複数指定可）")
+    query.add_argument("--temperature", action="append", choices=TEMPERATURES, help="温度感（複数指定可）")
+    query.add_argument("--process", default=None, help="Process（正規名）")
+    query.add_argument("--tool", default=None, help="Tool（正規名）")
+    query.add_argument("--people", default=None, help="People（正規名）")
+    query.add_argument("--interview-id", default=None, help="インタビューID")
+    query.add_argument("--limit", type=int, default=20, help="最大件数（0=すべて）")
+    query.add_argument("--count", action="store_true", help="件数のみ出力")
+
+    stats = sub.add_parser("stats", help="インデックスの統計を出力")
+    stats.add_argument("index", help="インデックスファイル")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLIエントリポイント"""
+    args = build_parser().parse_args(argv)
+
+    if args.command == "add":
+        index = InsightIndex.load(args.index) if os.path.exists(args.index) else InsightIndex()
+        total = 0
+        for spec in args.inputs:
+            for path in sorted(glob.glob(spec)) or [spec]:
+                with open(path, encoding="utf-8") as f:
+                    marts = [json.loads(line) for line in f if line.strip()]
+                for interview_id in {(m.get("context") or {}).get("interview_id") for m in marts} - {None}:
+                    index.remove_interview(interview_id)
+                total += index.add_marts(marts)
+        index.save(args.index)
+        print(f"indexed {total} marts ({len(index)} documents)", file=sys.stderr)
+        return 0
+
+    index = InsightIndex.load(args.index)
+    if args.command == "stats":
+        print(json.dumps(index.stats(), ensure_ascii=False, indent=2))
+        return 0
+
+    options = dict(
+        mode="all" if args.all else "any",
+        voice=args.voice,
+        temperature=args.temperature,
+        process=args.process,
+        tool=args.tool,
+        people=args.people,
+        interview_id=args.interview_id,
+    )
+    if args.count:
+        print(index.count(args.terms, **options))
+        return 0
+    for hit in index.search(args.terms, limit=args.limit or None, **options):
+        print(json.dumps(hit.to_dict(), ensure_ascii=False))
+    return 0
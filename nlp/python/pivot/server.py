@@ -0,0 +1,628 @@
+"""
+PIVOT HTTP Service - ローカルHTTP/JSON分類サービス
+
+InsightInterviewEngine を1プロセスに常駐させ、複数のアプリケーションから
+HTTP/JSON で利用するためのサービス。各アプリがパッケージを個別に import して
+起動時間・メモリを負担する代わりに、ホストごとに1つのウォームなプロセスへ集約する。
+
+特徴:
+    - 起動時に辞書のルール・品詞分解の索引を構築し、ウォームアップ分類を実行
+    - HTTP/1.1 keep-alive（接続を再利用）、接続ごとのスレッドで受付
+    - リクエストバッチング: 同時に届いたリクエストの発話を max_wait 秒まで待って
+      まとめ、分類ワーカー（workers 個）が1回の classify_items で処理する
+    - /metrics でリクエスト数・レイテンシ（p50/p95/p99）・スループット・バッチサイズを返す
+    - 既定で 127.0.0.1 にのみバインド（ローカル専用）
+
+エンドポイント:
+    GET  /healthz          稼働確認
+    GET  /metrics          メトリクス
+    POST /v1/texts         {"texts": ["...", ...], "observed_at": "YYYY-MM-DD"}
+    POST /v1/qa            {"items": [{"question": "...", "answer": "...", "speaker_id": "...",
+                             "speaker_role": "...", "interview_id": "...", "question_no": 1}, ...]}
+    POST /v1/interviews    {"interviews": ["<インタビューMarkdown>", ...]}
+
+    /v1/texts・/v1/qa は全件をまとめた1つの分類結果、/v1/interviews は
+    インタビューごとの分類結果（"results" の配列）を返す。
+    いずれも "fields": ["id", "pivot_voice", ...] でマートの出力フィールドを絞れる。
+    "domain"（業務ドメイン）・"min_confidence"（最小信頼度）でリクエストごとに
+    重み付け・閾値を指定できる（設定ごとのエンジンを EnginePool で保持し、
+    分類はバッチングしたまま閾値なしで1回行い、リクエストごとに閾値を適用する）。分類結果の形式:
+        {"items": [インサイトマート...], "by_pivot": {...}, "by_process": {...},
+         "by_tool": {...}, "stats": {...}}
+
+使用例:
+    python -m nlp.python.pivot serve --port 8765 --workers 2
+
+    curl -s localhost:8765/v1/texts -d '{"texts": ["工程管理が遅くて困っている"]}'
+"""
+
+import argparse
+import json
+import queue
+import re
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .classifier import (
+    DOMAIN_PIVOT_WEIGHTS,
+    PIVOT,
+    PIVOTClassificationResult,
+    PIVOTClassifier,
+    PIVOTInsight,
+    Utterance,
+    generate_pivot_insight_mart,
+    mart_fields,
+)
+from .engine import InsightInterviewEngine
+from .pool import DEFAULT_MAX_SIZE, EnginePool, engine_options
+
+
+# リクエストボディの上限（バイト）
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# レイテンシの分位点を算出する直近の件数
+LATENCY_WINDOW = 2048
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# 起動時のウォームアップに使う発話
+WARMUP_TEXTS = [
+    "工程管理をExcelでやっているが更新が追いつかなくて非常に困っている",
+    "担当者が辞めたら引継ぎできるか心配です",
+    "ガントチャート機能があれば効率化できると思う",
+    "新しいシステムは使いにくいので導入には反対です",
+    "チャットツールは便利で助かっている",
+]
+
+
+# ========================================
+# メトリクス
+# ========================================
+
+@dataclass
+class _EndpointMetrics:
+    requests: int = 0
+    errors: int = 0
+    utterances: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+
+class ServiceMetrics:
+    """エンドポイント別のレイテンシ・スループットとバッチの統計（スレッドセーフ）"""
+
+    def __init__(self):
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _EndpointMetrics] = {}
+        self.batches = 0
+        self.batched_requests = 0
+        self.batched_utterances = 0
+        self.batch_seconds = 0.0
+        self.max_batch_utterances = 0
+
+    def record_request(self, endpoint: str, latency: float, utterances: int, error: bool = False) -> None:
+        with self._lock:
+            m = self._endpoints.setdefault(endpoint, _EndpointMetrics())
+            m.requests += 1
+            m.errors += int(error)
+            m.utterances += utterances
+            m.latencies.append(latency)
+
+    def record_batch(self, requests: int, utterances: int, elapsed: float) -> None:
+        with self._lock:
+            self.batches += 1
+            self.batched_requests += requests
+            self.batched_utterances += utterances
+            self.batch_seconds += elapsed
+            self.max_batch_utterances = max(self.max_batch_utterances, utterances)
+
+    @staticmethod
+    def _percentile(values: List[float], q: float) -> float:
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def to_dict(self) -> Dict:
+        """JSON出力用（レイテンシはミリ秒、直近 LATENCY_WINDOW 件の分位点）"""
+        with self._lock:
+            uptime = time.time() - self.started
+            endpoints = {}
+            for name, m in self._endpoints.items():
+                latencies = sorted(m.latencies)
+                endpoints[name] = {
+                    "requests": m.requests,
+                    "errors": m.errors,
+                    "utterances": m.utterances,
+                    "requests_per_sec": m.requests / uptime if uptime > 0 else 0.0,
+                    "utterances_per_sec": m.utterances / uptime if uptime > 0 else 0.0,
+                    "latency_ms": {
+                        "p50": self._percentile(latencies, 0.50) * 1000,
+                        "p95": self._percentile(latencies, 0.95) * 1000,
+                        "p99": self._percentile(latencies, 0.99) * 1000,
+                        "max": (latencies[-1] if latencies else 0.0) * 1000,
+                    },
+                }
+            return {
+                "uptime": uptime,
+                "endpoints": endpoints,
+                "batching": {
+                    "batches": self.batches,
+                    "requests_per_batch": self.batched_requests / self.batches if self.batches else 0.0,
+                    "utterances_per_batch": self.batched_utterances / self.batches if self.batches else 0.0,
+                    "max_batch_utterances": self.max_batch_utterances,
+                    "classify_utterances_per_sec": (
+                        self.batched_utterances / self.batch_seconds if self.batch_seconds > 0 else 0.0
+                    ),
+                },
+            }
+
+
+# ========================================
+# リクエストバッチング
+# ========================================
+
+class _Job:
+    """バッチ待ちのリクエスト1件分の発話"""
+
+    __slots__ = ("utterances", "items", "error", "done")
+
+    def __init__(self, utterances: List[Utterance]):
+        self.utterances = utterances
+        self.items: List[PIVOTInsight] = []
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class RequestBatcher:
+    """同時に届いたリクエストの発話をまとめて分類"""
+
+    def __init__(
+        self,
+        classifier: PIVOTClassifier,
+        workers: int = 2,
+        max_batch: int = 256,
+        max_wait: float = 0.005,
+        metrics: Optional[ServiceMetrics] = None,
+    ):
+        """
+        Args:
+            classifier: 分類器
+            workers: 分類ワーカー（スレッド）の数
+            max_batch: 1バッチの発話数の上限（1リクエストがこれを超える場合はそのまま処理）
+            max_wait: 最初のリクエストから後続を待つ最大時間（秒）
+            metrics: バッチの統計の記録先
+        """
+        self.classifier = classifier
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.metrics = metrics
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._threads = [
+            threading.Thread(target=self._loop, name=f"pivot-batch-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def classify(self, utterances: List[Utterance]) -> List[PIVOTInsight]:
+        """
+        発話を分類（他のリクエストとまとめて処理されるまで待つ）
+
+        Returns:
+            List[PIVOTInsight]: 閾値を満たすインサイト（発話順）
+        """
+        if not utterances:
+            return []
+        job = _Job(utterances)
+        self._queue.put(job)
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.items
+
+    def close(self) -> None:
+        """ワーカーを停止"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _loop(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            jobs = [job]
+            size = len(job.utterances)
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    job = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if job is None:
+                    self._queue.put(None)  # 他のワーカーの停止用に戻す
+                    break
+                jobs.append(job)
+                size += len(job.utterances)
+            self._run(jobs, size)
+
+    def _run(self, jobs: List[_Job], size: int) -> None:
+        started = time.perf_counter()
+        try:
+            items = self.classifier.classify_items([u for job in jobs for u in job.utterances])
+            by_source = {id(item.source): item for item in items}
+            for job in jobs:
+                job.items = [by_source[id(u)] for u in job.utterances if id(u) in by_source]
+        except Exception as e:  # noqa: BLE001 - 呼び出し元のリクエストに返す
+            for job in jobs:
+                job.error = e
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_batch(len(jobs), size, time.perf_counter() - started)
+            for job in jobs:
+                job.done.set()
+
+
+# ========================================
+# サービス
+# ========================================
+
+class HTTPError(Exception):
+    """HTTPエラー応答"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class PIVOTService:
+    """分類サービス本体（HTTPに依存しない処理）"""
+
+    def __init__(
+        self,
+        engine: Optional[InsightInterviewEngine] = None,
+        workers: int = 2,
+        max_batch: int = 256,
+        max_wait_ms: float = 5.0,
+        max_engines: int = DEFAULT_MAX_SIZE,
+        **options,
+    ):
+        """
+        Args:
+            engine: 既定のエンジン（None=options で構築）
+            workers: 分類ワーカーの数
+            max_batch: 1バッチの発話数の上限
+            max_wait_ms: バッチングで後続のリクエストを待つ最大時間（ミリ秒）
+            max_engines: リクエストごとのドメイン・閾値用に保持するエンジンの最大数
+            **options: InsightInterviewEngine の引数
+        """
+        self.engine = engine or InsightInterviewEngine(**options)
+        self.pool = EnginePool(max_engines, **engine_options(self.engine))
+        self.metrics = ServiceMetrics()
+        self.warmup()
+        # 分類は閾値なしで行い、リクエストごとのエンジンの閾値で絞り込む
+        self.batcher = RequestBatcher(
+            self.pool.get(min_confidence=0.0).classifier,
+            workers=workers,
+            max_batch=max_batch,
+            max_wait=max_wait_ms / 1000,
+            metrics=self.metrics,
+        )
+
+    def warmup(self) -> None:
+        """辞書のルール・品詞分解の索引を構築し、ウォームアップ分類を実行"""
+        self.engine.classifier.classify_items([
+            Utterance(id=f"warmup_{i}", text=text) for i, text in enumerate(WARMUP_TEXTS)
+        ])
+
+    def close(self) -> None:
+        self.batcher.close()
+
+    # ----------------------------------------
+    # エンドポイント
+    # ----------------------------------------
+
+    def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Dict]:
+        """
+        リクエストを処理
+
+        Returns:
+            (ステータスコード, 応答JSON)
+        """
+        started = time.perf_counter()
+        utterances = 0
+        try:
+            if method == "GET" and path == "/healthz":
+                return 200, {"status": "ok", "lexicon_version": self.engine.classifier.lexicon.version_id}
+            if method == "GET" and path == "/metrics":
+                return 200, {**self.metrics.to_dict(), "engines": self.pool.stats()}
+
+            routes = {
+                "/v1/texts": self.classify_texts,
+                "/v1/qa": self.classify_qa,
+                "/v1/interviews": self.classify_interviews,
+            }
+            if path not in routes:
+                raise HTTPError(404, f"not found: {path}")
+            if method != "POST":
+                raise HTTPError(405, f"method not allowed: {method}")
+            try:
+                request = json.loads(body or b"{}")
+            except ValueError as e:
+                raise HTTPError(400, f"invalid JSON: {e}")
+            if not isinstance(request, dict):
+                raise HTTPError(400, "request body must be a JSON object")
+            response, utterances = routes[path](request)
+            self.metrics.record_request(path, time.perf_counter() - started, utterances)
+            return 200, response
+        except HTTPError as e:
+            self.metrics.record_request(path, time.perf_counter() - started, utterances, error=True)
+            return e.status, {"error": str(e)}
+        except Exception as e:  # noqa: BLE001 - 500 として返す
+            self.metrics.record_request(path, time.perf_counter() - started, utterances, error=True)
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    def classify_texts(self, request: Dict) -> Tuple[Dict, int]:
+        """テキストの配列を分類"""
+        texts = _require_list(request, "texts")
+        utterances = []
+        for i, text in enumerate(texts):
+            if not isinstance(text, str):
+                raise HTTPError(400, "texts must be an array of strings")
+            utterances.extend(self.engine.splitter.split(text, base_line_no=i))
+        return self._respond(utterances, request), len(utterances)
+
+    def classify_qa(self, request: Dict) -> Tuple[Dict, int]:
+        """Q&Aの配列を分類"""
+        utterances = []
+        for i, qa in enumerate(_require_list(request, "items")):
+            if not isinstance(qa, dict) or not isinstance(qa.get("answer"), str):
+                raise HTTPError(400, "items must be objects with an 'answer' string")
+            utterances.extend(self.engine.splitter.split(
+                qa["answer"],
+                speaker_id=qa.get("speaker_id"),
+                speaker_role=qa.get("speaker_role"),
+                question_no=qa.get("question_no", i + 1),
+                question_text=qa.get("question"),
+                interview_id=qa.get("interview_id"),
+            ))
+        return self._respond(utterances, request), len(utterances)
+
+    def classify_interviews(self, request: Dict) -> Tuple[Dict, int]:
+        """インタビューMarkdownの配列を分類（インタビューごとの結果を返す）"""
+        fields = _request_fields(request)
+        requested_at = _request_observed_at(request)
+        engine = self._request_engine(request)
+        parsed = []
+        for text in _require_list(request, "interviews"):
+            if not isinstance(text, str):
+                raise HTTPError(400, "interviews must be an array of strings")
+            interview = self.engine.parser.parse(text)
+            parsed.append((interview, self.engine._extract_utterances(interview)))
+
+        # 全インタビューの発話を1度に分類してから振り分ける
+        all_utterances = [u for _, utts in parsed for u in utts]
+        items = self._classify(engine, all_utterances)
+        by_source = {id(item.source): item for item in items}
+
+        results = []
+        for interview, utts in parsed:
+            own = [by_source[id(u)] for u in utts if id(u) in by_source]
+            date = interview.metadata.date
+            observed_at = requested_at or (date if _ISO_DATE.match(date) else None)
+            result = engine.classifier.aggregate(own)
+            results.append({
+                "interview_id": interview.metadata.interview_id,
+                "title": interview.title,
+                "utterances": len(utts),
+                **_result_json(result, observed_at, fields),
+            })
+        return {"results": results}, len(all_utterances)
+
+    def _respond(self, utterances: List[Utterance], request: Dict) -> Dict:
+        fields = _request_fields(request)
+        observed_at = _request_observed_at(request)
+        engine = self._request_engine(request)
+        result = engine.classifier.aggregate(self._classify(engine, utterances))
+        return {"utterances": len(utterances), **_result_json(result, observed_at, fields)}
+
+    def _request_engine(self, request: Dict) -> InsightInterviewEngine:
+        """リクエストの "domain"・"min_confidence" に対応するエンジン（省略時は既定のエンジン）"""
+        domain = request.get("domain")
+        min_confidence = request.get("min_confidence")
+        if domain is None and min_confidence is None:
+            return self.engine
+        if domain is not None and domain not in DOMAIN_PIVOT_WEIGHTS:
+            raise HTTPError(400, f"unknown domain: {domain}")
+        if min_confidence is not None and (
+            isinstance(min_confidence, bool)
+            or not isinstance(min_confidence, (int, float))
+            or not 0.0 <= min_confidence <= 1.0
+        ):
+            raise HTTPError(400, "min_confidence must be a number between 0 and 1")
+        return self.pool.get(
+            domain=domain,
+            min_confidence=float(min_confidence) if min_confidence is not None else None,
+        )
+
+    def _classify(self, engine: InsightInterviewEngine, utterances: List[Utterance]) -> List[PIVOTInsight]:
+        """バッチングして分類し、エンジンの閾値を適用"""
+        threshold = engine.min_confidence
+        classifier = engine.classifier
+        return [
+            item if item.confidence >= threshold else classifier.mark_below_threshold(item)
+            for item in self.batcher.classify(utterances)
+            if classifier.accepts(item, threshold)
+        ]
+
+
+def _require_list(request: Dict, key: str) -> List:
+    value = request.get(key)
+    if not isinstance(value, list):
+        raise HTTPError(400, f"'{key}' must be an array")
+    return value
+
+
+def _request_fields(request: Dict) -> Optional[List[str]]:
+    """リクエストの "fields"（マートの出力フィールド、省略時は None=すべて）"""
+    fields = request.get("fields")
+    if fields is None:
+        return None
+    if not isinstance(fields, list) or not all(isinstance(f, str) for f in fields):
+        raise HTTPError(400, "fields must be an array of strings")
+    try:
+        return mart_fields(fields)
+    except ValueError as e:
+        raise HTTPError(400, str(e))
+
+
+def _request_observed_at(request: Dict) -> Optional[str]:
+    """リクエストの "observed_at"（YYYY-MM-DD、省略時は None）"""
+    observed_at = request.get("observed_at")
+    if observed_at is None:
+        return None
+    if not isinstance(observed_at, str) or not _ISO_DATE.match(observed_at):
+        raise HTTPError(400, "observed_at must be a date string (YYYY-MM-DD)")
+    return observed_at
+
+
+def _result_json(
+    result: PIVOTClassificationResult,
+    observed_at: Optional[str],
+    fields: Optional[List[str]] = None,
+) -> Dict:
+    """分類結果の応答JSON"""
+    return {
+        "items": [generate_pivot_insight_mart(item, observed_at, fields=fields) for item in result.items],
+        "by_pivot": {p: len(result.by_pivot[p]) for p in PIVOT.ALL},
+        "by_process": result.by_process,
+        "by_tool": result.by_tool,
+        "stats": result.stats,
+    }
+
+
+# ========================================
+# HTTPサーバー
+# ========================================
+
+class _Handler(BaseHTTPRequestHandler):
+    """keep-alive 対応のJSONハンドラ"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "PIVOTService"
+
+    def do_GET(self) -> None:
+        self._dispatch("GET", b"")
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._send(413, {"error": f"request body exceeds {MAX_BODY_BYTES} bytes"})
+            self.close_connection = True
+            return
+        self._dispatch("POST", self.rfile.read(length))
+
+    def _dispatch(self, method: str, body: bytes) -> None:
+        path = self.path.split("?", 1)[0]
+        status, response = self.server.service.handle(method, path, body)
+        self._send(status, response)
+
+    def _send(self, status: int, response: Dict) -> None:
+        data = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class PIVOTServer(ThreadingHTTPServer):
+    """PIVOTService を提供するHTTPサーバー（接続ごとにスレッド）"""
+
+    daemon_threads = True
+
+    def __init__(self, service: PIVOTService, host: str = "127.0.0.1", port: int = 8765, verbose: bool = False):
+        """
+        Args:
+            service: 分類サービス
+            host: バインドするアドレス（既定: ローカルのみ）
+            port: ポート（0=空いているポート）
+            verbose: アクセスログを出力するか
+        """
+        self.service = service
+        self.verbose = verbose
+        super().__init__((host, port), _Handler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.service.close()
+
+
+# ========================================
+# CLI
+# ========================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """serve サブコマンドの引数定義"""
+    parser = argparse.ArgumentParser(
+        prog="python -m nlp.python.pivot serve",
+        description="PIVOT分類のローカルHTTP/JSONサービスを起動",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="バインドするアドレス")
+    parser.add_argument("--port", type=int, default=8765, help="ポート")
+    parser.add_argument("-d", "--domain", default=None, help="業務ドメイン")
+    parser.add_argument("--min-confidence", type=float, default=0.3, help="最小信頼度")
+    parser.add_argument("--no-morphology", action="store_true", help="品詞分解を使用しない")
+    parser.add_argument("--morphology-backend", default=None,
+                        choices=["rule", "fugashi", "sudachi", "auto"],
+                        help="品詞抽出バックエンド（既定: rule）")
+    parser.add_argument("--lexicon", default=None, help="辞書ファイル（既定: 組み込み辞書）")
+    parser.add_argument("--regex-safety", action="store_true",
+                        help="正規表現の安全モード（長い発話で高コストなパターンの入力長を制限）")
+    parser.add_argument("--max-engines", type=int, default=DEFAULT_MAX_SIZE,
+                        help="リクエストごとのドメイン・閾値用に保持するエンジンの最大数")
+    parser.add_argument("-j", "--workers", type=int, default=2, help="分類ワーカー数")
+    parser.add_argument("--max-batch", type=int, default=256, help="1バッチの発話数の上限")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="バッチングの最大待ち時間（ミリ秒）")
+    parser.add_argument("-v", "--verbose", action="store_true", help="アクセスログを出力")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLIエントリポイント"""
+    args = build_parser().parse_args(argv)
+    service = PIVOTService(
+        workers=args.workers,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+        max_engines=args.max_engines,
+        domain=args.domain,
+        min_confidence=args.min_confidence,
+        use_morphology=not args.no_morphology,
+        morphology_backend=args.morphology_backend,
+        lexicon=args.lexicon,
+        regex_safety=args.regex_safety,
+    )
+    server = PIVOTServer(service, args.host, args.port, verbose=args.verbose)
+    host, port = server.server_address[:2]
+    print(f"PIVOT service listening on http://{host}:{port}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
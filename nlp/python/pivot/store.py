@@ -0,0 +1,498 @@
+"""
+PIVOT Mart Store - 観測日・Voiceで分割したマートストア
+
+save_marts / save_summary_mart は呼び出しごとに1つのファイルを書き出すため、
+「3月の工程管理に関する Pain」のような問い合わせでは全ファイルを読む必要がある。
+本モジュールはインサイトマートを観測日（source_time.observed_at）と Voice で
+パーティション分割して追記し、パーティションごとの統計をマニフェストに保持する。
+問い合わせは条件に合わないパーティションを統計だけで除外し、残りのファイルのみを読む。
+observed_at がない、または YYYY-MM-DD で始まらないマートは date=unknown に入れる。
+
+構成:
+    <root>/
+    ├── manifest.json                          # パーティション一覧と統計
+    ├── insights/
+    │   └── date=2025-03-14/voice=P/
+    │       ├── part-00000.jsonl               # max_rows_per_file 行ごとに分割
+    │       └── part-00001.jsonl
+    └── summaries/<period_type>/<start>_<end>.json
+
+パーティションの統計（除外判定に使用）:
+    rows / processes（Process別件数） / tools（Tool別件数） /
+    interviews（インタビューID別件数） / min_confidence / max_confidence
+
+書き込みは1プロセスから行う（プロセス内ではスレッドセーフ）。
+マニフェストに記録した行数・バイト数までを確定分とし、書き込み途中で
+停止した場合の末尾は読み込み時に無視し、次の追記時に切り詰める。
+
+使用例:
+    from nlp.python.pivot.store import MartStore
+
+    store = MartStore("marts/")
+    store.write(engine.iter_marts(result, "2025-03-14"))
+
+    # 3月の「工程管理」に関する Pain（3月の P パーティションのうち工程管理を含むものだけを読む）
+    for mart in store.query(voice="P", process="工程管理", start="2025-03-01", end="2025-03-31"):
+        print(mart["title"])
+
+    python -m nlp.python.pivot mart import marts/ out/shards/*.jsonl
+    python -m nlp.python.pivot mart query marts/ --voice P --process 工程管理 --month 2025-03
+"""
+
+import argparse
+import glob
+import itertools
+import json
+import os
+import re
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .classifier import PIVOT
+
+
+# マニフェストのフォーマットバージョン
+MANIFEST_VERSION = 1
+
+# パーティション内の1ファイルあたりの最大行数
+DEFAULT_MAX_ROWS_PER_FILE = 100_000
+
+# 観測日が不明なマートのパーティション
+UNKNOWN_DATE = "unknown"
+
+# 観測日として扱う observed_at の先頭（YYYY-MM-DD）
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+# ========================================
+# 型定義
+# ========================================
+
+@dataclass
+class PartitionStats:
+    """パーティション（観測日 × Voice）の統計"""
+    date: str
+    voice: str
+    files: List[Dict] = field(default_factory=list)       # [{"name": ..., "rows": ..., "bytes": ...}]
+    rows: int = 0
+    processes: Dict[str, int] = field(default_factory=dict)
+    tools: Dict[str, int] = field(default_factory=dict)
+    interviews: Dict[str, int] = field(default_factory=dict)
+    min_confidence: Optional[float] = None
+    max_confidence: Optional[float] = None
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.date, self.voice)
+
+    @property
+    def path(self) -> str:
+        """ストアのルートからの相対パス"""
+        return f"insights/date={self.date}/voice={self.voice}"
+
+    def add(self, mart: Dict) -> None:
+        """マート1件を統計に加算"""
+        self.rows += 1
+        layers = mart.get("target_layers") or {}
+        for counts, key in (
+            (self.processes, layers.get("process")),
+            (self.tools, layers.get("tool")),
+            (self.interviews, (mart.get("context") or {}).get("interview_id")),
+        ):
+            if key:
+                counts[key] = counts.get(key, 0) + 1
+        confidence = mart.get("confidence")
+        if confidence is not None:
+            self.min_confidence = confidence if self.min_confidence is None else min(self.min_confidence, confidence)
+            self.max_confidence = confidence if self.max_confidence is None else max(self.max_confidence, confidence)
+
+    def to_dict(self) -> Dict:
+        return {
+            "date": self.date,
+            "voice": self.voice,
+            "files": self.files,
+            "rows": self.rows,
+            "processes": self.processes,
+            "tools": self.tools,
+            "interviews": self.interviews,
+            "min_confidence": self.min_confidence,
+            "max_confidence": self.max_confidence,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PartitionStats":
+        return cls(**data)
+
+
+@dataclass
+class MartQuery:
+    """問い合わせ条件（None=条件なし）"""
+    voices: Optional[Sequence[str]] = None
+    process: Optional[str] = None
+    tool: Optional[str] = None
+    interview_id: Optional[str] = None
+    start: Optional[str] = None        # 観測日の下限（ISO-8601、含む）
+    end: Optional[str] = None          # 観測日の上限（ISO-8601、含む）
+    min_confidence: Optional[float] = None
+
+    def prunes(self, stats: PartitionStats) -> bool:
+        """パーティションの統計だけで対象外と判定できるか"""
+        if self.voices is not None and stats.voice not in self.voices:
+            return True
+        if self.start is not None or self.end is not None:
+            if stats.date == UNKNOWN_DATE:
+                return True
+            if self.start is not None and stats.date < self.start:
+                return True
+            if self.end is not None and stats.date > self.end:
+                return True
+        if self.process is not None and self.process not in stats.processes:
+            return True
+        if self.tool is not None and self.tool not in stats.tools:
+            return True
+        if self.interview_id is not None and self.interview_id not in stats.interviews:
+            return True
+        if (self.min_confidence is not None and stats.max_confidence is not None
+                and stats.max_confidence < self.min_confidence):
+            return True
+        return False
+
+    def matches(self, mart: Dict) -> bool:
+        """マート1件が条件に合うか（パーティションで判定済みの Voice・観測日以外）"""
+        layers = mart.get("target_layers") or {}
+        if self.process is not None and layers.get("process") != self.process:
+            return False
+        if self.tool is not None and layers.get("tool") != self.tool:
+            return False
+        if self.interview_id is not None and (mart.get("context") or {}).get("interview_id") != self.interview_id:
+            return False
+        if self.min_confidence is not None and (mart.get("confidence") or 0.0) < self.min_confidence:
+            return False
+        return True
+
+    def count_from_stats(self, stats: PartitionStats) -> Optional[int]:
+        """統計だけで件数が決まる場合はその件数（決まらなければ None）"""
+        filters = [f for f in (self.process, self.tool, self.interview_id) if f is not None]
+        if self.min_confidence is not None or len(filters) > 1:
+            return None
+        if self.process is not None:
+            return stats.processes.get(self.process, 0)
+        if self.tool is not None:
+            return stats.tools.get(self.tool, 0)
+        if self.interview_id is not None:
+            return stats.interviews.get(self.interview_id, 0)
+        return stats.rows
+
+
+def _observed_date(mart: Dict) -> str:
+    """パーティションの観測日（YYYY-MM-DD で始まらない observed_at は UNKNOWN_DATE）"""
+    date = (mart.get("source_time") or {}).get("observed_at")
+    if isinstance(date, str) and _ISO_DATE.match(date):
+        return date[:10]
+    return UNKNOWN_DATE
+
+
+# ========================================
+# ストア
+# ========================================
+
+class MartStore:
+    """観測日・Voiceで分割したインサイトマートのストア"""
+
+    def __init__(self, root: str, max_rows_per_file: int = DEFAULT_MAX_ROWS_PER_FILE):
+        """
+        Args:
+            root: ストアのディレクトリ（最初の書き込み時に作成）
+            max_rows_per_file: パーティション内の1ファイルあたりの最大行数
+        """
+        self.root = Path(root)
+        self.max_rows_per_file = max_rows_per_file
+        self._lock = threading.Lock()
+        self.partitions: Dict[Tuple[str, str], PartitionStats] = {}
+        self.summaries: List[Dict] = []
+        self._load_manifest()
+
+    # ----------------------------------------
+    # マニフェスト
+    # ----------------------------------------
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / "manifest.json"
+
+    def _load_manifest(self) -> None:
+        if not self.manifest_path.exists():
+            return
+        with open(self.manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("manifest_version") != MANIFEST_VERSION:
+            raise ValueError(f"未対応のマニフェストバージョン: {manifest.get('manifest_version')}")
+        partitions = [PartitionStats.from_dict(p) for p in manifest.get("partitions", [])]
+        self.partitions = {stats.key: stats for stats in partitions}
+        self.summaries = manifest.get("summaries", [])
+
+    def _save_manifest(self) -> None:
+        manifest = {
+            "manifest_version": MANIFEST_VERSION,
+            "partitions": [self.partitions[k].to_dict() for k in sorted(self.partitions)],
+            "summaries": self.summaries,
+        }
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_name("manifest.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.manifest_path)
+
+    # ----------------------------------------
+    # 書き込み
+    # ----------------------------------------
+
+    def write(self, marts: Iterable[Dict]) -> int:
+        """
+        インサイトマートをパーティションに追記
+
+        Args:
+            marts: generate_pivot_insight_mart 形式のマート
+
+        Returns:
+            int: 書き込んだ件数
+        """
+        groups: Dict[Tuple[str, str], List[Dict]] = {}
+        for mart in marts:
+            voice = mart.get("pivot_voice")
+            if voice not in PIVOT.ALL:
+                raise ValueError(f"pivot_voice が不正なマート: {mart.get('id')}")
+            groups.setdefault((_observed_date(mart), voice), []).append(mart)
+
+        with self._lock:
+            for (date, voice), rows in groups.items():
+                stats = self.partitions.setdefault((date, voice), PartitionStats(date=date, voice=voice))
+                self._append(stats, rows)
+            if groups:
+                self._save_manifest()
+        return sum(len(rows) for rows in groups.values())
+
+    def _append(self, stats: PartitionStats, rows: List[Dict]) -> None:
+        """パーティションのファイルに追記し、上限行数でファイルを切り替える"""
+        directory = self.root / stats.path
+        directory.mkdir(parents=True, exist_ok=True)
+        pos = 0
+        while pos < len(rows):
+            if not stats.files or stats.files[-1]["rows"] >= self.max_rows_per_file:
+                stats.files.append({"name": f"part-{len(stats.files):05d}.jsonl", "rows": 0, "bytes": 0})
+            current = stats.files[-1]
+            chunk = rows[pos:pos + self.max_rows_per_file - current["rows"]]
+            path = directory / current["name"]
+            # マニフェストに記録されていない末尾（前回の中断分）を切り詰める
+            if path.exists() and path.stat().st_size != current["bytes"]:
+                os.truncate(path, current["bytes"])
+            with open(path, "ab") as f:
+                for mart in chunk:
+                    f.write((json.dumps(mart, ensure_ascii=False) + "\n").encode("utf-8"))
+                    stats.add(mart)
+                current["bytes"] = f.tell()
+            current["rows"] += len(chunk)
+            pos += len(chunk)
+
+    def write_summary(self, summary: Dict) -> Path:
+        """
+        サマリーマートを保存（同じ期間のサマリーは置き換える）
+
+        Args:
+            summary: generate_pivot_summary_mart 形式のサマリー
+
+        Returns:
+            Path: 保存先
+        """
+        period = summary["period"]
+        rel = f"summaries/{period['type']}/{period['start']}_{period['end']}.json"
+        path = self.root / rel
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            entry = {"type": period["type"], "start": period["start"], "end": period["end"], "path": rel}
+            self.summaries = [s for s in self.summaries if s["path"] != rel] + [entry]
+            self._save_manifest()
+        return path
+
+    # ----------------------------------------
+    # 問い合わせ
+    # ----------------------------------------
+
+    def select_partitions(self, query: MartQuery) -> List[PartitionStats]:
+        """条件に合いうるパーティション（観測日・Voice順）"""
+        return [
+            stats for key, stats in sorted(self.partitions.items())
+            if not query.prunes(stats)
+        ]
+
+    def query(
+        self,
+        voice: Union[str, Sequence[str], None] = None,
+        process: Optional[str] = None,
+        tool: Optional[str] = None,
+        interview_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        month: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+    ) -> Iterator[Dict]:
+        """
+        条件に合うインサイトマートを返す（対象パーティションのファイルのみ読む）
+
+        Args:
+            voice: Voice（"P" または ["P", "I"]）
+            process: Process（正規名）
+            tool: Tool（正規名）
+            interview_id: インタビューID
+            start: 観測日の下限（含む）
+            end: 観測日の上限（含む）
+            month: 観測月（"2025-03"、start / end の代わりに指定）
+            min_confidence: 信頼度の下限
+
+        Yields:
+            Dict: マート（観測日・Voice・追記順）
+        """
+        query = self._build_query(voice, process, tool, interview_id, start, end, month, min_confidence)
+        for stats in self.select_partitions(query):
+            for mart in self._read(stats):
+                if query.matches(mart):
+                    yield mart
+
+    def count(self, **conditions) -> int:
+        """条件に合う件数（統計で決まるパーティションはファイルを読まない）"""
+        query = self._build_query(**conditions)
+        total = 0
+        for stats in self.select_partitions(query):
+            count = query.count_from_stats(stats)
+            if count is None:
+                count = sum(1 for mart in self._read(stats) if query.matches(mart))
+            total += count
+        return total
+
+    def _read(self, stats: PartitionStats) -> Iterator[Dict]:
+        """パーティションの確定済みの行を読む"""
+        directory = self.root / stats.path
+        for entry in stats.files:
+            with open(directory / entry["name"], encoding="utf-8") as f:
+                for line in itertools.islice(f, entry["rows"]):
+                    yield json.loads(line)
+
+    def find_summaries(self, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict]:
+        """期間が重なるサマリーマート"""
+        result = []
+        for entry in sorted(self.summaries, key=lambda s: (s["start"], s["end"])):
+            if (end is not None and entry["start"] > end) or (start is not None and entry["end"] < start):
+                continue
+            with open(self.root / entry["path"], encoding="utf-8") as f:
+                result.append(json.load(f))
+        return result
+
+    def stats(self) -> Dict:
+        """ストア全体の統計"""
+        dates = sorted(s.date for s in self.partitions.values() if s.date != UNKNOWN_DATE)
+        by_voice = {p: 0 for p in PIVOT.ALL}
+        for s in self.partitions.values():
+            by_voice[s.voice] += s.rows
+        return {
+            "partitions": len(self.partitions),
+            "files": sum(len(s.files) for s in self.partitions.values()),
+            "rows": sum(by_voice.values()),
+            "by_voice": by_voice,
+            "date_range": [dates[0], dates[-1]] if dates else None,
+            "summaries": len(self.summaries),
+        }
+
+    @staticmethod
+    def _build_query(
+        voice=None,
+        process=None,
+        tool=None,
+        interview_id=None,
+        start=None,
+        end=None,
+        month=None,
+        min_confidence=None,
+    ) -> MartQuery:
+        if month is not None:
+            start, end = f"{month}-01", f"{month}-31"
+        voices = [voice] if isinstance(voice, str) else voice
+        return MartQuery(
+            voices=list(voices) if voices is not None else None,
+            process=process,
+            tool=tool,
+            interview_id=interview_id,
+            start=start,
+            end=end,
+            min_confidence=min_confidence,
+        )
+
+
+# ========================================
+# CLI
+# ========================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """mart サブコマンドの引数定義"""
+    parser = argparse.ArgumentParser(
+        prog="python -m nlp.python.pivot mart",
+        description="観測日・Voiceで分割したマートストアの取り込み・問い合わせ",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="マートJSONLをストアに追記")
+    imp.add_argument("store", help="ストアのディレクトリ")
+    imp.add_argument("inputs", nargs="+", help="マートJSONLファイル・globパターン")
+
+    query = sub.add_parser("query", help="条件に合うマートを出力（JSONL）")
+    query.add_argument("store", help="ストアのディレクトリ")
+    query.add_argument("--voice", action="append", choices=PIVOT.ALL, help="Voice（複数指定可）")
+    query.add_argument("--process", default=None, help="Process（正規名）")
+    query.add_argument("--tool", default=None, help="Tool（正規名）")
+    query.add_argument("--interview-id", default=None, help="インタビューID")
+    query.add_argument("--start", default=None, help="観測日の下限")
+    query.add_argument("--end", default=None, help="観測日の上限")
+    query.add_argument("--month", default=None, help="観測月（YYYY-MM）")
+    query.add_argument("--min-confidence", type=float, default=None, help="信頼度の下限")
+    query.add_argument("--count", action="store_true", help="件数のみ出力")
+
+    stats = sub.add_parser("stats", help="ストアの統計を出力")
+    stats.add_argument("store", help="ストアのディレクトリ")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLIエントリポイント"""
+    args = build_parser().parse_args(argv)
+    store = MartStore(args.store)
+
+    if args.command == "import":
+        total = 0
+        for spec in args.inputs:
+            for path in sorted(glob.glob(spec)) or [spec]:
+                with open(path, encoding="utf-8") as f:
+                    total += store.write(json.loads(line) for line in f if line.strip())
+        print(f"imported {total} marts", file=sys.stderr)
+    elif args.command == "query":
+        conditions = dict(
+            voice=args.voice,
+            process=args.process,
+            tool=args.tool,
+            interview_id=args.interview_id,
+            start=args.start,
+            end=args.end,
+            month=args.month,
+            min_confidence=args.min_confidence,
+        )
+        if args.count:
+            print(store.count(**conditions))
+        else:
+            for mart in store.query(**conditions):
+                print(json.dumps(mart, ensure_ascii=False))
+    else:
+        print(json.dumps(store.stats(), ensure_ascii=False, indent=2))
+    return 0
@@ -0,0 +1,349 @@
+"""
+PIVOT Concurrency Stress Test - スレッド並行実行の検証とスケーリング計測
+
+PIVOTClassifier・MorphologyAnalyzer・UtteranceSplitter は呼び出しごとの
+可変状態を持たず、1つのインスタンスを複数スレッドから同時に使用できる。
+本モジュールはこれを実際のコーパスで検証し、スレッド数ごとの処理速度を計測する。
+
+ストレステスト:
+    共有した1組の分割器・品詞分解エンジン・分類器を threads 個のスレッドから
+    同時に rounds 回ずつ呼び出し（開始はバリアで揃える。分類は1回おきに
+    classify_items の workers も併用する）、すべての結果が
+    1スレッドで処理した基準結果と一致することを確認する。
+    インサイトは id（uuid）以外のフィールドで比較する。
+    swap_lexicon=True では、実行中に同じ内容の辞書を別スレッドから繰り返し
+    差し替え、ルールの切り替えと並行処理の競合も検証する。
+
+スケーリング計測:
+    PIVOTClassifier.classify_items(workers=n) を1〜32スレッドで実行し、
+    発話/秒・1スレッド比の速度向上・並列効率を報告する。
+    GIL のあるビルドでは速度向上は小さく、フリースレッド版の CPython
+    （python3.13t 以降）でスレッド数に応じた向上を確認できる。
+
+使用例:
+    python -m nlp.python.pivot stress interviews/ --threads 16 --rounds 20 --swap-lexicon
+    python -m nlp.python.pivot stress interviews/ --bench 1,2,4,8,16,32
+
+    # Pythonから
+    from nlp.python.pivot.stress import run_stress_test, run_scaling_benchmark
+
+    report = run_stress_test(texts, threads=16)
+    assert report.ok, report.errors
+    for point in run_scaling_benchmark(texts):
+        print(point.threads, point.utterances_per_sec)
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field, fields
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .classifier import THREAD_CHUNK_SIZE, PIVOTClassifier, PIVOTInsight, Utterance
+from .engine import UtteranceSplitter
+from .lexicon import Lexicon, LexiconStore, default_lexicon
+from .morphology import MorphologyAnalyzer
+
+
+# スケーリング計測の既定のスレッド数
+DEFAULT_THREAD_COUNTS = (1, 2, 4, 8, 16, 32)
+
+# 報告するエラーの最大件数
+MAX_ERRORS = 20
+
+
+def gil_enabled() -> bool:
+    """GIL が有効か（フリースレッド版の CPython で無効化されていれば False）"""
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_enabled is None else is_enabled()
+
+
+def insight_signature(item: PIVOTInsight) -> Tuple:
+    """インサイトの比較用の値（uuid の id を除く全フィールド、発話は同一性で比較）"""
+    values = []
+    for f in fields(item):
+        if f.name == "id":
+            continue
+        value = getattr(item, f.name)
+        if f.name == "source":
+            value = id(value)
+        elif isinstance(value, dict):
+            value = tuple(value.items())
+        elif isinstance(value, list):
+            value = tuple(value)
+        values.append(value)
+    return tuple(values)
+
+
+# ========================================
+# 型定義
+# ========================================
+
+@dataclass
+class StressReport:
+    """ストレステストの結果"""
+    threads: int
+    rounds: int
+    utterances: int
+    calls: int = 0             # 呼び出し回数（分割・品詞分解・分類の合計）
+    mismatches: int = 0        # 基準結果と一致しなかった回数
+    swaps: int = 0             # 実行中に辞書を差し替えた回数
+    seconds: float = 0.0
+    gil_enabled: bool = True
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.mismatches == 0 and not self.errors
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), "ok": self.ok}
+
+
+@dataclass
+class ScalingPoint:
+    """スレッド数1件分の計測値"""
+    threads: int
+    seconds: float
+    utterances_per_sec: float
+    speedup: float = 1.0       # 1スレッド（最初の計測）に対する速度比
+    efficiency: float = 1.0    # speedup / threads
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+# ========================================
+# ストレステスト
+# ========================================
+
+def run_stress_test(
+    texts: Sequence[str],
+    threads: int = 8,
+    rounds: int = 10,
+    swap_lexicon: bool = False,
+    lexicon: Optional[Lexicon] = None,
+    **classifier_options,
+) -> StressReport:
+    """
+    共有インスタンスを複数スレッドから同時に呼び出し、結果が逐次処理と一致するか検証
+
+    Args:
+        texts: 発話テキスト
+        threads: スレッド数
+        rounds: スレッドごとの繰り返し回数
+        swap_lexicon: 実行中に同じ内容の辞書を繰り返し差し替えるか
+        lexicon: 辞書（None=組み込み辞書）
+        **classifier_options: PIVOTClassifier の引数
+
+    Returns:
+        StressReport: 結果
+    """
+    lexicon = lexicon or default_lexicon()
+    store = LexiconStore(lexicon=lexicon)
+    classifier = PIVOTClassifier(lexicon=store, **classifier_options)
+    splitter = UtteranceSplitter()
+    analyzer = MorphologyAnalyzer(lexicon=lexicon)
+
+    # 基準結果（1スレッド）
+    expected_splits = [[u.text for u in splitter.split(text)] for text in texts]
+    expected_analyses = [analyzer.analyze(text) for text in texts]
+    utterances = [Utterance(id=f"u{i}", text=text) for i, text in enumerate(texts)]
+    expected_items = [insight_signature(i) for i in classifier.classify_items(utterances)]
+
+    report = StressReport(
+        threads=threads,
+        rounds=rounds,
+        utterances=len(texts),
+        gil_enabled=gil_enabled(),
+    )
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads + (1 if swap_lexicon else 0))
+    done = threading.Event()
+
+    def record(calls: int, mismatches: int = 0, error: Optional[str] = None) -> None:
+        with lock:
+            report.calls += calls
+            report.mismatches += mismatches
+            if error is not None and len(report.errors) < MAX_ERRORS:
+                report.errors.append(error)
+
+    def worker(offset: int) -> None:
+        barrier.wait()
+        try:
+            for r in range(rounds):
+                # スレッドごとに開始位置をずらし、異なる入力を同時に処理する
+                start = (offset * 7 + r) % max(1, len(texts))
+                order = list(range(start, len(texts))) + list(range(start))
+                mismatches = 0
+                for i in order:
+                    if [u.text for u in splitter.split(texts[i])] != expected_splits[i]:
+                        mismatches += 1
+                    if analyzer.analyze(texts[i]) != expected_analyses[i]:
+                        mismatches += 1
+                # 奇数回はスレッドプール（classify_items の workers）も併用する
+                items = classifier.classify_items(utterances, workers=2 if r % 2 else None, chunk_size=8)
+                if [insight_signature(i) for i in items] != expected_items:
+                    mismatches += 1
+                record(2 * len(order) + 1, mismatches)
+        except Exception as e:  # noqa: BLE001 - 結果に記録する
+            record(0, error=f"{type(e).__name__}: {e}")
+
+    def swapper() -> None:
+        barrier.wait()
+        while not done.is_set():
+            # 内容は同じで別のインスタンス（分類器はルールの組を作り直す）
+            store.swap(Lexicon.from_dict(lexicon.to_dict()))
+            with lock:
+                report.swaps += 1
+            time.sleep(0.001)
+
+    workers = [threading.Thread(target=worker, args=(i,), name=f"pivot-stress-{i}") for i in range(threads)]
+    swap_thread = threading.Thread(target=swapper, name="pivot-stress-swap") if swap_lexicon else None
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    if swap_thread is not None:
+        swap_thread.start()
+    for thread in workers:
+        thread.join()
+    done.set()
+    if swap_thread is not None:
+        swap_thread.join()
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+# ========================================
+# スケーリング計測
+# ========================================
+
+def run_scaling_benchmark(
+    texts: Sequence[str],
+    thread_counts: Sequence[int] = DEFAULT_THREAD_COUNTS,
+    repeat: int = 3,
+    chunk_size: int = THREAD_CHUNK_SIZE,
+    **classifier_options,
+) -> List[ScalingPoint]:
+    """
+    classify_items(workers=n) のスレッド数ごとの処理速度を計測
+
+    Args:
+        texts: 発話テキスト
+        thread_counts: 計測するスレッド数
+        repeat: 計測の繰り返し回数（最速の値を採用）
+        chunk_size: スレッドに割り当てる発話の単位
+        **classifier_options: PIVOTClassifier の引数
+
+    Returns:
+        List[ScalingPoint]: スレッド数ごとの計測値（thread_counts の順）
+    """
+    classifier = PIVOTClassifier(**classifier_options)
+    utterances = [Utterance(id=f"u{i}", text=text) for i, text in enumerate(texts)]
+    classifier.classify_items(utterances[:chunk_size])  # ウォームアップ
+
+    points: List[ScalingPoint] = []
+    for threads in thread_counts:
+        best = float("inf")
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            classifier.classify_items(utterances, workers=threads, chunk_size=chunk_size)
+            best = min(best, time.perf_counter() - started)
+        points.append(ScalingPoint(
+            threads=threads,
+            seconds=best,
+            utterances_per_sec=len(utterances) / best if best > 0 else 0.0,
+        ))
+
+    if points:
+        base = points[0]
+        for point in points:
+            point.speedup = base.seconds / point.seconds if point.seconds > 0 else 0.0
+            point.efficiency = point.speedup * base.threads / point.threads
+    return points
+
+
+def format_scaling(points: List[ScalingPoint]) -> str:
+    """スケーリング計測の表"""
+    lines = [
+        f"GIL: {'enabled' if gil_enabled() else 'disabled'}",
+        f"{'threads':>7}  {'seconds':>9}  {'utt/s':>10}  {'speedup':>7}  {'efficiency':>10}",
+    ]
+    for p in points:
+        lines.append(
+            f"{p.threads:>7}  {p.seconds:>9.3f}  {p.utterances_per_sec:>10.0f}  "
+            f"{p.speedup:>7.2f}  {p.efficiency:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+# ========================================
+# CLI
+# ========================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """stress サブコマンドの引数定義"""
+    parser = argparse.ArgumentParser(
+        prog="python -m nlp.python.pivot stress",
+        description="スレッド並行実行のストレステストとスケーリング計測",
+    )
+    parser.add_argument("inputs", nargs="+", help="ディレクトリ・ファイル・globパターン")
+    parser.add_argument("--pattern", default="*.md", help="ディレクトリ指定時のファイルパターン")
+    parser.add_argument("--lines", action="store_true", help="1行を1発話として読む（テキストファイル用）")
+    parser.add_argument("-t", "--threads", type=int, default=8, help="ストレステストのスレッド数")
+    parser.add_argument("--rounds", type=int, default=10, help="スレッドごとの繰り返し回数")
+    parser.add_argument("--swap-lexicon", action="store_true", help="実行中に辞書を繰り返し差し替える")
+    parser.add_argument("--bench", default=None,
+                        help="スケーリング計測を行うスレッド数（カンマ区切り、例: 1,2,4,8,16,32）")
+    parser.add_argument("--repeat", type=int, default=3, help="スケーリング計測の繰り返し回数")
+    parser.add_argument("--no-morphology", action="store_true", help="品詞分解を使用しない")
+    parser.add_argument("--json", action="store_true", help="JSONで出力")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLIエントリポイント"""
+    from .corpus import collect_inputs
+    from .profiler import iter_utterances
+
+    args = build_parser().parse_args(argv)
+    files = collect_inputs(args.inputs, args.pattern)
+    if not files:
+        print("入力ファイルがありません", file=sys.stderr)
+        return 1
+    texts = list(iter_utterances(files, args.lines))
+    options = {"use_morphology": not args.no_morphology}
+
+    if args.bench:
+        try:
+            counts = [int(n) for n in args.bench.split(",") if n.strip()]
+        except ValueError:
+            print(f"--bench はカンマ区切りの整数で指定してください: {args.bench}", file=sys.stderr)
+            return 2
+        points = run_scaling_benchmark(texts, counts, repeat=args.repeat, **options)
+        if args.json:
+            print(json.dumps(
+                {"gil_enabled": gil_enabled(), "utterances": len(texts), "points": [p.to_dict() for p in points]},
+                ensure_ascii=False, indent=2,
+            ))
+        else:
+            print(format_scaling(points))
+        return 0
+
+    report = run_stress_test(
+        texts, threads=args.threads, rounds=args.rounds, swap_lexicon=args.swap_lexicon, **options
+    )
+    if args.json:
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        status = "OK" if report.ok else "FAILED"
+        print(
+            f"{status}: {report.threads} threads x {report.rounds} rounds, {report.calls} calls, "
+            f"{report.mismatches} mismatches, {report.swaps} lexicon swaps, "
+            f"{report.seconds:.2f}s (GIL {'enabled' if report.gil_enabled else 'disabled'})"
+        )
+        for error in report.errors:
+            print(f"  {error}", file=sys.stderr)
+    return 0 if report.ok else 1
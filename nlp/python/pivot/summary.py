@@ -0,0 +1,326 @@
+"""
+PIVOT Summary Builder - 逐次集計によるサマリーマート生成
+
+generate_pivot_summary_mart は全インサイトを保持した PIVOTClassificationResult を
+必要とする。SummaryBuilder はインサイトを1件ずつ（またはシャード単位で）受け取り、
+件数・Process/Tool別の件数・Voice別の上位アイテム（最大5件）のみを保持して、
+最後に同じ形式のサマリーマートを出力する。保持する量はインサイト数によらず、
+Process/Tool の種類数に比例する。
+
+上位アイテム:
+    generate_pivot_summary_mart と同じく、Voiceごとに入力順で先頭の5件
+    （frequencies 指定時は代表インサイトのみ）。シャードを合算する場合は
+    入力順に add_result / add_shard / merge を呼ぶこと。
+
+使用例:
+    from nlp.python.pivot.summary import SummaryBuilder
+
+    builder = SummaryBuilder()
+    for insight in insights:          # ジェネレータでよい
+        builder.add(insight)
+    summary = builder.build("2025-01-01", "2025-01-31")
+
+    # シャード（並列処理した部分結果）の合算
+    total = SummaryBuilder()
+    for part in parts:                # 入力順
+        total.merge(part)
+
+    # CLI（インサイトマートJSONLから）
+    python -m nlp.python.pivot summary out/shards/*.jsonl --start 2025-01-01 --end 2025-01-31
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Iterable, List, Optional
+
+from .classifier import (
+    PIVOT,
+    PIVOTClassificationResult,
+    PIVOTInsight,
+    _priority_matrix_from_counts,
+)
+
+
+# サマリーの上位アイテム件数
+TOP_ITEMS_PER_PIVOT = 5
+
+
+# ========================================
+# サマリーマート
+# ========================================
+
+def summary_from_counts(
+    counts: Dict[str, int],
+    by_process: Dict[str, Dict[str, int]],
+    by_tool: Dict[str, Dict[str, int]],
+    top_items: Dict[str, List[Dict]],
+    period_start: str,
+    period_end: str,
+    period_type: str = "monthly",
+) -> Dict:
+    """
+    集計値からサマリーマートを生成（generate_pivot_summary_mart と同形式）
+
+    Args:
+        counts: Voice別の件数
+        by_process: Process別・Voice別の件数
+        by_tool: Tool別・Voice別の件数
+        top_items: Voice別の上位アイテム
+        period_start: 期間開始日 (ISO-8601)
+        period_end: 期間終了日 (ISO-8601)
+        period_type: 期間タイプ (daily, weekly, monthly)
+
+    Returns:
+        Dict: サマリーマートアイテム
+    """
+    total = sum(counts.values())
+    total_score = sum(counts[p] * PIVOT.SCORES[p] for p in PIVOT.ALL)
+    sentiment_index = total_score / total if total else 0.0
+
+    def scored(table: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+        return {
+            key: {**c, "score": sum(c[p] * PIVOT.SCORES[p] for p in PIVOT.ALL)}
+            for key, c in table.items()
+        }
+
+    return {
+        "id": f"pivot_summary_{period_start.replace('-', '')}",
+        "mart_type": "pivot_summary",
+        "period": {
+            "type": period_type,
+            "start": period_start,
+            "end": period_end,
+        },
+        "pivot_distribution": {
+            p: {"count": counts[p], "score": counts[p] * PIVOT.SCORES[p]}
+            for p in PIVOT.ALL
+        },
+        "total_score": total_score,
+        "sentiment_index": round(sentiment_index, 2),
+        "by_process": scored(by_process),
+        "by_tool": scored(by_tool),
+        "priority_matrix": _priority_matrix_from_counts(by_process),
+        "top_items": top_items,
+    }
+
+
+# ========================================
+# 逐次集計
+# ========================================
+
+class SummaryBuilder:
+    """インサイトを逐次集計してサマリーマートを生成"""
+
+    def __init__(self, frequencies: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            frequencies: 代表インサイトのID → 出現回数（dedup.cluster_frequencies）。
+                         指定時は上位アイテムを代表のみに絞る
+        """
+        self.frequencies = frequencies
+        self.counts: Dict[str, int] = {p: 0 for p in PIVOT.ALL}
+        self.by_process: Dict[str, Dict[str, int]] = {}
+        self.by_tool: Dict[str, Dict[str, int]] = {}
+        self.top_items: Dict[str, List[Dict]] = {p: [] for p in PIVOT.ALL}
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    # ----------------------------------------
+    # インサイト単位
+    # ----------------------------------------
+
+    def add(self, insight: PIVOTInsight) -> None:
+        """インサイトを1件加算（閾値適用済み・入力順）"""
+        voice = insight.pivot_voice
+        self._count(voice, insight.target_layers)
+        top = self.top_items[voice]
+        if len(top) < TOP_ITEMS_PER_PIVOT:
+            if self.frequencies is None:
+                top.append({"id": f"pivot_{insight.id}", "title": insight.title, "frequency": 1})
+            elif insight.id in self.frequencies:
+                top.append({
+                    "id": f"pivot_{insight.id}",
+                    "title": insight.title,
+                    "frequency": self.frequencies[insight.id],
+                })
+
+    def add_all(self, insights: Iterable[PIVOTInsight]) -> "SummaryBuilder":
+        """インサイトを順に加算（ジェネレータ可）"""
+        for insight in insights:
+            self.add(insight)
+        return self
+
+    def add_mart(self, mart: Dict) -> None:
+        """
+        インサイトマート（generate_pivot_insight_mart の出力）を1件加算
+
+        Raises:
+            ValueError: 集計に必要なフィールド（pivot_voice, target_layers, id, title）がない
+        """
+        try:
+            voice = mart["pivot_voice"]
+            layers = mart["target_layers"]
+            item = {"id": mart["id"], "title": mart["title"], "frequency": mart.get("frequency", 1)}
+        except KeyError as e:
+            raise ValueError(f"マートに集計用のフィールドがありません: {e.args[0]}") from None
+        self._count(voice, layers)
+        top = self.top_items[voice]
+        if len(top) < TOP_ITEMS_PER_PIVOT:
+            top.append(item)
+
+    def _count(self, voice: str, layers: Dict[str, Optional[str]]) -> None:
+        if voice not in self.counts:
+            raise ValueError(f"不正なVoice: {voice!r}")
+        self.counts[voice] += 1
+        for table, key in ((self.by_process, layers.get("process")), (self.by_tool, layers.get("tool"))):
+            if key:
+                row = table.get(key)
+                if row is None:
+                    row = table[key] = {p: 0 for p in PIVOT.ALL}
+                row[voice] += 1
+
+    # ----------------------------------------
+    # シャード単位
+    # ----------------------------------------
+
+    def add_result(self, result: PIVOTClassificationResult) -> None:
+        """分類結果（1シャード分）を加算"""
+        items = result.by_pivot
+        if self.frequencies is None:
+            top = {p: items[p][:TOP_ITEMS_PER_PIVOT] for p in PIVOT.ALL}
+        else:
+            top = {}
+            for p in PIVOT.ALL:
+                room = TOP_ITEMS_PER_PIVOT - len(self.top_items[p])
+                top[p] = [i for i in items[p] if i.id in self.frequencies][:max(room, 0)]
+        self.add_shard(
+            {p: len(items[p]) for p in PIVOT.ALL},
+            result.by_process,
+            result.by_tool,
+            {
+                p: [
+                    {
+                        "id": f"pivot_{i.id}",
+                        "title": i.title,
+                        "frequency": self.frequencies[i.id] if self.frequencies is not None else 1,
+                    }
+                    for i in top[p]
+                ]
+                for p in PIVOT.ALL
+            },
+        )
+
+    def add_shard(
+        self,
+        counts: Dict[str, int],
+        by_process: Dict[str, Dict[str, int]],
+        by_tool: Dict[str, Dict[str, int]],
+        top_items: Optional[Dict[str, List[Dict]]] = None,
+    ) -> None:
+        """
+        集計済みのシャードを加算
+
+        Args:
+            counts: Voice別の件数
+            by_process: Process別・Voice別の件数
+            by_tool: Tool別・Voice別の件数
+            top_items: Voice別の上位アイテム（シャード内の入力順、"frequency" 省略時は1）
+        """
+        for p in PIVOT.ALL:
+            self.counts[p] += counts.get(p, 0)
+        for target, source in ((self.by_process, by_process), (self.by_tool, by_tool)):
+            for key, key_counts in source.items():
+                row = target.setdefault(key, {p: 0 for p in PIVOT.ALL})
+                for p in PIVOT.ALL:
+                    row[p] += key_counts.get(p, 0)
+        for p, entries in (top_items or {}).items():
+            room = TOP_ITEMS_PER_PIVOT - len(self.top_items[p])
+            if room > 0:
+                self.top_items[p].extend(
+                    {"id": e["id"], "title": e["title"], "frequency": e.get("frequency", 1)}
+                    for e in entries[:room]
+                )
+
+    def merge(self, other: "SummaryBuilder") -> "SummaryBuilder":
+        """別の SummaryBuilder の集計を加算（other は self の後の入力として扱う）"""
+        self.add_shard(other.counts, other.by_process, other.by_tool, other.top_items)
+        return self
+
+    # ----------------------------------------
+    # 出力
+    # ----------------------------------------
+
+    def build(
+        self,
+        period_start: str,
+        period_end: str,
+        period_type: str = "monthly",
+    ) -> Dict:
+        """
+        サマリーマートを生成（generate_pivot_summary_mart と同形式・同値）
+
+        Args:
+            period_start: 期間開始日 (ISO-8601)
+            period_end: 期間終了日 (ISO-8601)
+            period_type: 期間タイプ (daily, weekly, monthly)
+
+        Returns:
+            Dict: サマリーマートアイテム
+        """
+        return summary_from_counts(
+            dict(self.counts),
+            {k: dict(v) for k, v in self.by_process.items()},
+            {k: dict(v) for k, v in self.by_tool.items()},
+            {p: list(items) for p, items in self.top_items.items()},
+            period_start,
+            period_end,
+            period_type,
+        )
+
+
+# ========================================
+# CLI
+# ========================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """summary サブコマンドの引数定義"""
+    parser = argparse.ArgumentParser(
+        prog="python -m nlp.python.pivot summary",
+        description="インサイトマートJSONLを逐次集計してサマリーマートを出力",
+    )
+    parser.add_argument("inputs", nargs="+", help="インサイトマートJSONL（入力順に集計、- で標準入力）")
+    parser.add_argument("--start", required=True, help="期間開始日 (ISO-8601)")
+    parser.add_argument("--end", required=True, help="期間終了日 (ISO-8601)")
+    parser.add_argument("--period-type", default="monthly", help="期間タイプ (daily, weekly, monthly)")
+    parser.add_argument("-o", "--output", default=None, help="出力ファイル（省略時は標準出力）")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLIエントリポイント"""
+    args = build_parser().parse_args(argv)
+    builder = SummaryBuilder()
+    for path in args.inputs:
+        f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    builder.add_mart(json.loads(line))
+                except ValueError as e:
+                    print(f"{path}:{line_no}: {e}", file=sys.stderr)
+                    return 1
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+    text = json.dumps(builder.build(args.start, args.end, args.period_type), ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            out.write(text + "\n")
+    else:
+        print(text)
+    return 0
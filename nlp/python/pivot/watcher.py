@@ -0,0 +1,634 @@
+"""
+Watch-folder Ingestion - 監視フォルダからの常駐取り込み
+
+共有フォルダに置かれたインタビューファイルを監視し、新規・変更ファイルだけを
+InsightInterviewEngine で処理してマートとサマリーを更新する常駐サービス。
+定期的な全件再処理（cron）を置き換え、ファイル配置から数秒でマートに反映する。
+
+処理の流れ:
+    1. 監視: inotify（Linux）でファイルの書き込み完了・移動・削除を検知。
+       inotify が使えない環境ではポーリング（mtime / サイズの比較）で検知
+    2. デバウンス: 最後のイベントから debounce 秒間変化がなければ処理対象とする
+       （書き込み途中・連続保存のファイルを何度も処理しない）
+    3. フィンガープリント: サイズ・mtime が前回と同じなら処理しない。
+       異なれば内容ハッシュを比較し、同一内容（touch 等）なら処理しない
+    4. 処理: 上限付きのワーカープール（同時実行数=ワーカー数）で
+       corpus と同じシャード・メタを書き出す
+    5. サマリー: 全体と観測月ごとのサマリーを、変更ファイルの集計値の差分で更新
+
+出力構成（corpus と同じシャード形式。再起動時は有効なシャードを再利用）:
+    <output_dir>/
+    ├── shards/<source_key>.jsonl / .meta.json
+    ├── summaries/<YYYY-MM>.json     # 観測月ごとのサマリーマート
+    └── summary.json                 # 全体のサマリーマート
+
+使用例:
+    python -m nlp.python.pivot watch inbox/ -o out/ --workers 4
+
+    # Pythonから
+    from nlp.python.pivot.watcher import IngestService
+
+    service = IngestService("inbox/", "out/", workers=4)
+    service.run()          # stop() されるまで常駐
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, TextIO, Tuple
+
+from .classifier import PIVOT
+from .corpus import (
+    CorpusRunner,
+    CorpusTask,
+    _init_worker,
+    _process_task,
+    _write_atomic,
+)
+from .summary import TOP_ITEMS_PER_PIVOT, summary_from_counts
+
+
+# イベント種別
+CHANGED = "changed"
+DELETED = "deleted"
+RESCAN = "rescan"    # イベントの取りこぼし（inotify のキュー溢れ等）
+
+Event = Tuple[str, Optional[Path]]
+
+
+# ========================================
+# 監視
+# ========================================
+
+class PollingWatcher:
+    """ポーリングによるファイル監視（mtime / サイズの変化を検知）"""
+
+    def __init__(self, root: Path, pattern: str = "*.md", interval: float = 1.0):
+        """
+        Args:
+            root: 監視ディレクトリ（再帰）
+            pattern: 対象ファイルのパターン
+            interval: ポーリング間隔（秒）
+        """
+        self.root = root
+        self.pattern = pattern
+        self.interval = interval
+        self._stats = self._snapshot()
+
+    def _snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        stats = {}
+        for path in self.root.rglob(self.pattern):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if path.is_file():
+                stats[path.resolve()] = (st.st_size, st.st_mtime_ns)
+        return stats
+
+    def poll(self, timeout: float) -> List[Event]:
+        """最大 timeout 秒待ってイベントを返す"""
+        time.sleep(min(timeout, self.interval))
+        stats = self._snapshot()
+        events: List[Event] = [
+            (CHANGED, path) for path, stat in stats.items() if self._stats.get(path) != stat
+        ]
+        events.extend((DELETED, path) for path in self._stats if path not in stats)
+        self._stats = stats
+        return events
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """inotify によるファイル監視（Linux、サブディレクトリも監視）"""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_ISDIR = 0x40000000
+
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    _HEADER = struct.Struct("iIII")
+
+    def __init__(self, root: Path, pattern: str = "*.md"):
+        """
+        Args:
+            root: 監視ディレクトリ（再帰）
+            pattern: 対象ファイルのパターン
+
+        Raises:
+            OSError: inotify が利用できない
+        """
+        self.root = root
+        self.pattern = pattern
+        name = ctypes.util.find_library("c")
+        if name is None:
+            raise OSError("libc が見つかりません")
+        self._libc = ctypes.CDLL(name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify に対応していません")
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 に失敗しました")
+        self._dirs: Dict[int, Path] = {}
+        self._add_tree(root)
+
+    def _add_tree(self, directory: Path) -> None:
+        """ディレクトリとその配下を監視対象に追加"""
+        for path in [directory, *(p for p in directory.rglob("*") if p.is_dir())]:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(path)), self.MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch に失敗しました: {path}")
+            self._dirs[wd] = path.resolve()
+
+    def poll(self, timeout: float) -> List[Event]:
+        """最大 timeout 秒待ってイベントを返す"""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 1 << 16)
+        except BlockingIOError:
+            return []
+
+        events: List[Event] = []
+        offset = 0
+        while offset + self._HEADER.size <= len(data):
+            wd, mask, _, length = self._HEADER.unpack_from(data, offset)
+            offset += self._HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                events.append((RESCAN, None))
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / name
+            if mask & self.IN_ISDIR:
+                # 新しいサブディレクトリは監視を追加し、配下のファイルを再走査
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._add_tree(path)
+                    events.append((RESCAN, None))
+                continue
+            if not path.match(self.pattern):
+                continue
+            if mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                events.append((DELETED, path))
+            else:
+                events.append((CHANGED, path))
+        return events
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(root: Path, pattern: str = "*.md", poll_interval: float = 1.0, use_inotify: bool = True):
+    """inotify が使えれば InotifyWatcher、使えなければ PollingWatcher"""
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root, pattern)
+        except OSError:
+            pass
+    return PollingWatcher(root, pattern, poll_interval)
+
+
+class Debouncer:
+    """連続するイベントをまとめ、一定時間変化のないパスを返す"""
+
+    def __init__(self, delay: float = 2.0):
+        """
+        Args:
+            delay: 最後のイベントからの待ち時間（秒）
+        """
+        self.delay = delay
+        self._last: Dict[Path, float] = {}
+        self._first: Dict[Path, float] = {}
+
+    def touch(self, path: Path, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._last[path] = now
+        self._first.setdefault(path, now)
+
+    def ready(self, now: Optional[float] = None) -> List[Tuple[Path, float]]:
+        """待ち時間を過ぎたパスと最初のイベント時刻（取り出したパスは除かれる）"""
+        now = time.monotonic() if now is None else now
+        paths = [p for p, last in self._last.items() if now - last >= self.delay]
+        result = []
+        for path in paths:
+            del self._last[path]
+            result.append((path, self._first.pop(path)))
+        return result
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+
+# ========================================
+# ローリングサマリー
+# ========================================
+
+class RollingSummary:
+    """シャードメタの集計値を差分で加減算するサマリー"""
+
+    def __init__(self):
+        self.metas: Dict[str, Dict] = {}
+        self.counts = {p: 0 for p in PIVOT.ALL}
+        self.by_process: Dict[str, Dict[str, int]] = {}
+        self.by_tool: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.metas)
+
+    def add(self, meta: Dict) -> None:
+        """メタを加算（同じソースのメタがあれば置き換える）"""
+        self.remove(meta["source"])
+        self.metas[meta["source"]] = meta
+        self._apply(meta, 1)
+
+    def remove(self, source: str) -> None:
+        """ソースのメタを減算"""
+        meta = self.metas.pop(source, None)
+        if meta is not None:
+            self._apply(meta, -1)
+
+    def _apply(self, meta: Dict, sign: int) -> None:
+        for p in PIVOT.ALL:
+            self.counts[p] += sign * meta["by_pivot"].get(p, 0)
+        for target, source in ((self.by_process, meta["by_process"]), (self.by_tool, meta["by_tool"])):
+            for key, key_counts in source.items():
+                row = target.setdefault(key, {p: 0 for p in PIVOT.ALL})
+                for p in PIVOT.ALL:
+                    row[p] += sign * key_counts.get(p, 0)
+                if not any(row.values()):
+                    del target[key]
+
+    def to_mart(self, period_type: str = "monthly") -> Dict:
+        """サマリーマート（期間は観測日の最小〜最大、上位アイテムはソースのパス順）"""
+        dates = sorted(m["observed_at"] for m in self.metas.values())
+        top: Dict[str, List[Dict]] = {p: [] for p in PIVOT.ALL}
+        for source in sorted(self.metas):
+            for p in PIVOT.ALL:
+                room = TOP_ITEMS_PER_PIVOT - len(top[p])
+                if room > 0:
+                    top[p].extend(
+                        {"id": e["id"], "title": e["title"], "frequency": 1}
+                        for e in self.metas[source]["top_items"].get(p, [])[:room]
+                    )
+            if all(len(items) >= TOP_ITEMS_PER_PIVOT for items in top.values()):
+                break
+        return summary_from_counts(
+            dict(self.counts),
+            {k: dict(v) for k, v in self.by_process.items()},
+            {k: dict(v) for k, v in self.by_tool.items()},
+            top,
+            dates[0] if dates else "",
+            dates[-1] if dates else "",
+            period_type,
+        )
+
+
+# ========================================
+# 取り込みサービス
+# ========================================
+
+@dataclass
+class IngestStats:
+    """取り込みの統計"""
+    processed: int = 0
+    unchanged: int = 0   # フィンガープリントが一致して処理しなかった件数
+    deleted: int = 0
+    failed: int = 0
+    insights: int = 0
+    last_latency: float = 0.0   # 最初のイベントからシャード書き出しまで（秒）
+    max_latency: float = 0.0
+
+
+class IngestService:
+    """監視フォルダの常駐取り込みサービス"""
+
+    def __init__(
+        self,
+        watch_dir: str,
+        output_dir: str,
+        pattern: str = "*.md",
+        debounce: float = 2.0,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+        workers: int = 2,
+        progress: Optional[TextIO] = None,
+        root: Optional[str] = None,
+        **engine_options,
+    ):
+        """
+        Args:
+            watch_dir: 監視ディレクトリ（再帰）
+            output_dir: 出力ディレクトリ
+            pattern: 対象ファイルのパターン
+            debounce: 最後の書き込みから処理するまでの待ち時間（秒）
+            poll_interval: ポーリング間隔（inotify が使えない場合、秒）
+            use_inotify: inotify を使うか（False=常にポーリング）
+            workers: 同時に処理するファイル数（1=プロセス内で逐次処理）
+            progress: ログ出力先（None=出力しない）
+            root: シャード名の基準ディレクトリ（None=ファイルの絶対パスから決定。corpus と同じ規則）
+            **engine_options: CorpusRunner と同じエンジン設定
+                              （domain, min_confidence, use_morphology, morphology_backend,
+                              lexicon, regex_safety, observed_at）
+        """
+        self.watch_dir = Path(watch_dir).resolve()
+        self.output_dir = Path(output_dir)
+        self.pattern = pattern
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.workers = max(1, workers)
+        self.runner = CorpusRunner(output_dir, workers=self.workers, progress=progress, root=root, **engine_options)
+
+        self.stats = IngestStats()
+        self._debouncer = Debouncer(debounce)
+        self._queue: Dict[Path, float] = {}                  # 処理待ち（パス → 最初のイベント時刻）
+        self._inflight: Dict[Future, Tuple[CorpusTask, float, Tuple[int, int]]] = {}
+        self._known: Dict[str, Tuple[int, int, str]] = {}    # ソース → (サイズ, mtime, 内容ハッシュ)
+        self._summary = RollingSummary()
+        self._monthly: Dict[str, RollingSummary] = {}
+        self._dirty: Set[str] = set()                        # 書き出しが必要な月（"" = 全体）
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._stop = threading.Event()
+
+    # ----------------------------------------
+    # 起動・停止
+    # ----------------------------------------
+
+    def run(self) -> None:
+        """stop() が呼ばれるまで監視・取り込みを続ける"""
+        (self.output_dir / "shards").mkdir(parents=True, exist_ok=True)
+        (self.output_dir / "summaries").mkdir(exist_ok=True)
+        watcher = create_watcher(self.watch_dir, self.pattern, self.poll_interval, self.use_inotify)
+        self.runner._log(f"watching {self.watch_dir} ({type(watcher).__name__})")
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.runner.config,),
+            )
+        try:
+            self.scan()
+            while not self._stop.is_set():
+                self.step(watcher)
+        finally:
+            watcher.close()
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+            self._collect(block=False)
+            self._write_summaries()
+
+    def stop(self) -> None:
+        """run() のループを停止（処理中のファイルは完了を待つ）"""
+        self._stop.set()
+
+    def scan(self) -> None:
+        """監視ディレクトリを走査し、有効なシャードを読み込んで未処理のファイルを登録"""
+        now = time.monotonic()
+        current = {str(p.resolve()) for p in self.watch_dir.rglob(self.pattern) if p.is_file()}
+        for source in current:
+            path = Path(source)
+            if source in self._known:
+                if self._fingerprint_changed(path):
+                    self._queue.setdefault(path, now)
+                continue
+            stat = self._stat(path)
+            meta = self.runner._load_valid_meta(self._task(path))
+            if meta is not None and stat is not None:
+                self._known[source] = (*stat, meta["content_hash"])
+                self._add_meta(meta)
+            else:
+                self._queue.setdefault(path, now)
+        # 監視外で削除されたファイル
+        for source in [s for s in self._known if s not in current]:
+            self._delete(Path(source))
+        self._write_summaries()
+
+    # ----------------------------------------
+    # ループ
+    # ----------------------------------------
+
+    def step(self, watcher) -> None:
+        """イベントを1回取得して、デバウンス・投入・完了処理・サマリー書き出しを行う"""
+        timeout = self._debouncer.delay / 2 if (self._debouncer or self._queue or self._inflight) else 1.0
+        for kind, path in watcher.poll(timeout):
+            if kind == RESCAN:
+                self.scan()
+            elif kind == DELETED:
+                self._delete(path.resolve())
+            else:
+                self._debouncer.touch(path.resolve())
+
+        for path, first_seen in self._debouncer.ready():
+            self._queue.setdefault(path, first_seen)
+        self._dispatch()
+        self._collect(block=False)
+        self._write_summaries()
+
+    def _dispatch(self) -> None:
+        """処理待ちのファイルを空いているワーカーに投入"""
+        busy = {task.source for task, _, _ in self._inflight.values()}
+        for path in list(self._queue):
+            if len(self._inflight) >= self.workers:
+                break
+            if str(path) in busy:
+                continue  # 処理中のファイルは完了後に再判定
+            first_seen = self._queue.pop(path)
+            stat = self._stat(path)
+            if stat is None:
+                continue
+            if not self._fingerprint_changed(path):
+                self.stats.unchanged += 1
+                continue
+            # 内容ハッシュの前にサイズ・mtime を記録（処理中の変更は次回の判定で検知）
+            task = self._task(path)
+            if task.content_hash == self._known.get(task.source, (0, 0, ""))[2]:
+                self._known[task.source] = (*stat, task.content_hash)
+                self.stats.unchanged += 1
+                continue
+            if self._pool is None:
+                future: Future = Future()
+                try:
+                    future.set_result(_process_task(task, self.runner.config, self.runner.observed_at))
+                except Exception as e:  # noqa: BLE001 - 1ファイルの失敗でサービスを止めない
+                    future.set_exception(e)
+            else:
+                future = self._pool.submit(_process_task, task, self.runner.config, self.runner.observed_at)
+            self._inflight[future] = (task, first_seen, stat)
+            busy.add(task.source)
+
+    def _collect(self, block: bool) -> None:
+        """完了したタスクの結果をサマリーに反映"""
+        if not self._inflight:
+            return
+        done, _ = wait(list(self._inflight), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            task, first_seen, stat = self._inflight.pop(future)
+            try:
+                meta = future.result()
+            except Exception as e:  # noqa: BLE001
+                self.stats.failed += 1
+                self.runner._log(f"FAILED {task.source_key}: {type(e).__name__}: {e}")
+                continue
+            self._known[task.source] = (*stat, task.content_hash)
+            self._add_meta(meta)
+            latency = time.monotonic() - first_seen
+            self.stats.processed += 1
+            self.stats.insights += meta["insights"]
+            self.stats.last_latency = latency
+            self.stats.max_latency = max(self.stats.max_latency, latency)
+            self.runner._log(f"ingested {task.source_key}: {meta['insights']} insights ({latency:.1f}s after change)")
+
+    # ----------------------------------------
+    # 内部処理
+    # ----------------------------------------
+
+    def _task(self, path: Path) -> CorpusTask:
+        """ファイル1件の処理タスク（シャード名は corpus と同じ規則）"""
+        return self.runner.plan([path])[0]
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[Tuple[int, int]]:
+        """(サイズ, mtime)、ファイルがなければ None"""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _fingerprint_changed(self, path: Path) -> bool:
+        """サイズ・mtime が前回の処理時と異なるか"""
+        known = self._known.get(str(path))
+        return known is None or self._stat(path) != known[:2]
+
+    def _add_meta(self, meta: Dict) -> None:
+        """全体・月別サマリーにメタを反映"""
+        self._remove_meta(meta["source"])
+        month = meta["observed_at"][:7]
+        self._summary.add(meta)
+        self._monthly.setdefault(month, RollingSummary()).add(meta)
+        self._dirty.update(("", month))
+
+    def _remove_meta(self, source: str) -> None:
+        old = self._summary.metas.get(source)
+        if old is None:
+            return
+        month = old["observed_at"][:7]
+        self._summary.remove(source)
+        self._monthly[month].remove(source)
+        self._dirty.update(("", month))
+
+    def _delete(self, path: Path) -> None:
+        """削除されたファイルのシャードとサマリーの集計値を除く"""
+        source = str(path)
+        self._queue.pop(path, None)
+        if source not in self._known:
+            return
+        del self._known[source]
+        key = self.runner.source_key(path)
+        for suffix in (".jsonl", ".meta.json"):
+            try:
+                os.remove(self.output_dir / "shards" / f"{key}{suffix}")
+            except OSError:
+                pass
+        self._remove_meta(source)
+        self.stats.deleted += 1
+        self.runner._log(f"removed {key}")
+
+    def _write_summaries(self) -> None:
+        """更新のあったサマリーを書き出す"""
+        for month in sorted(self._dirty):
+            if month == "":
+                path = self.output_dir / "summary.json"
+                summary = self._summary
+            else:
+                path = self.output_dir / "summaries" / f"{month}.json"
+                summary = self._monthly[month]
+            if len(summary):
+                _write_atomic(path, json.dumps(summary.to_mart(), ensure_ascii=False, indent=2))
+            elif path.exists():
+                path.unlink()
+        self._dirty.clear()
+
+
+# ========================================
+# CLI
+# ========================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """watch サブコマンドの引数定義"""
+    parser = argparse.ArgumentParser(
+        prog="python -m nlp.python.pivot watch",
+        description="監視フォルダのインタビューを常駐して取り込み、マートとサマリーを更新",
+    )
+    parser.add_argument("directory", help="監視ディレクトリ")
+    parser.add_argument("-o", "--output", required=True, help="出力ディレクトリ")
+    parser.add_argument("-d", "--domain", default=None, help="業務ドメイン")
+    parser.add_argument("--min-confidence", type=float, default=0.3, help="最小信頼度")
+    parser.add_argument("--no-morphology", action="store_true", help="品詞分解を使用しない")
+    parser.add_argument("--morphology-backend", default=None,
+                        choices=["rule", "fugashi", "sudachi", "auto"],
+                        help="品詞抽出バックエンド（既定: rule）")
+    parser.add_argument("--lexicon", default=None, help="辞書ファイル（既定: 組み込み辞書）")
+    parser.add_argument("--regex-safety", action="store_true",
+                        help="正規表現の安全モード（長い発話で高コストなパターンの入力長を制限）")
+    parser.add_argument("-j", "--workers", type=int, default=2, help="同時処理数")
+    parser.add_argument("--pattern", default="*.md", help="対象ファイルのパターン")
+    parser.add_argument("--root", default=None,
+                        help="シャード名の基準ディレクトリ（既定: ファイルの絶対パスから決定）")
+    parser.add_argument("--debounce", type=float, default=2.0, help="書き込み完了とみなす待ち時間（秒）")
+    parser.add_argument("--poll", action="store_true", help="inotify を使わずポーリングで監視")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="ポーリング間隔（秒）")
+    parser.add_argument("-q", "--quiet", action="store_true", help="ログを出力しない")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLIエントリポイント"""
+    args = build_parser().parse_args(argv)
+    service = IngestService(
+        args.directory,
+        args.output,
+        pattern=args.pattern,
+        debounce=args.debounce,
+        poll_interval=args.poll_interval,
+        use_inotify=not args.poll,
+        workers=args.workers,
+        progress=None if args.quiet else sys.stderr,
+        root=args.root,
+        domain=args.domain,
+        min_confidence=args.min_confidence,
+        use_morphology=not args.no_morphology,
+        morphology_backend=args.morphology_backend,
+        lexicon=args.lexicon,
+        regex_safety=args.regex_safety,
+    )
+    try:
+        service.run()
+    except KeyboardInterrupt:
+        service.stop()
+    return 0
@@ -0,0 +1,265 @@
+"""
+What-if Re-weighting - 再分類なしのドメイン重み比較
+
+PIVOT分類の結果（Voice・信頼度・対象軸）はドメインに依存せず、
+ドメイン重みが影響するのはインサイトの並び順のみである。
+そこで分類は1度だけ行い、任意のドメイン・カスタム重みについて
+ランキング・サマリー・優先度マトリクスを保存済みの特徴量から算出する。
+
+各ドメインの結果は PIVOTClassifier(domain=...).classify() と同一になる。
+
+使用例:
+    from nlp.python.pivot.whatif import WhatIfAnalyzer
+
+    analyzer = WhatIfAnalyzer.from_utterances(utterances)
+
+    views = analyzer.compare(["requirements", "hr_evaluation", "customer_voice"])
+    for name, view in views.items():
+        print(name, [i.title for i in view.result.items[:3]])
+
+    # カスタム重み
+    view = analyzer.view({"P": 3.0, "I": 1.0, "V": 1.0, "O": 0.5, "T": 1.0}, name="pain_first")
+    summary = view.summary("2025-01-01", "2025-01-31")
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from .classifier import (
+    DOMAIN_PIVOT_WEIGHTS,
+    PIVOT,
+    PIVOTClassificationResult,
+    PIVOTClassifier,
+    PIVOTInsight,
+    Utterance,
+    _calculate_priority_matrix,
+    aggregate_insights,
+    generate_pivot_summary_mart,
+)
+from . import scoring
+from .scoring import WeightSpec, resolve_weights
+
+
+# ========================================
+# 型定義
+# ========================================
+
+@dataclass
+class DomainView:
+    """重み付けごとの分析結果"""
+    name: Optional[str]
+    weights: Dict[str, float]
+    result: PIVOTClassificationResult
+    weighted_by_pivot: Dict[str, float]  # Voice別の重み付きスコア合計
+
+    @property
+    def items(self) -> List[PIVOTInsight]:
+        return self.result.items
+
+    @property
+    def priority_matrix(self) -> Dict:
+        return _calculate_priority_matrix(self.result)
+
+    def summary(
+        self,
+        period_start: str,
+        period_end: str,
+        period_type: str = "monthly",
+    ) -> Dict:
+        """サマリーマートを生成"""
+        return generate_pivot_summary_mart(self.result, period_start, period_end, period_type)
+
+
+# ========================================
+# What-if分析
+# ========================================
+
+class WhatIfAnalyzer:
+    """分類1回で複数ドメインの重み付けを比較"""
+
+    def __init__(self, items: List[PIVOTInsight]):
+        """
+        Args:
+            items: 分類済みインサイト（閾値適用済み・発話順）
+                   PIVOTClassifier.classify_items() の戻り値
+        """
+        self.items = items
+
+        # ドメイン非依存の集計は1度だけ行い、全ビューで共有する（読み取り専用）
+        self._base = aggregate_insights(items)
+        self._arrays: Optional["scoring.ScoreArrays"] = None
+
+    @classmethod
+    def from_utterances(
+        cls,
+        utterances: List[Utterance],
+        classifier: Optional[PIVOTClassifier] = None,
+        min_confidence: float = 0.3,
+        use_morphology: bool = True,
+        **options,
+    ) -> "WhatIfAnalyzer":
+        """
+        発話リストを1度だけ分類して構築
+
+        Args:
+            utterances: 発話リスト
+            classifier: 分類に使う分類器（None=以下の設定で生成。指定時は
+                        min_confidence 等は無視され、分類器の設定に従う）
+            min_confidence: 最小信頼度閾値
+            use_morphology: 品詞分解エンジンを使用するか
+            **options: PIVOTClassifier へ渡す設定（lexicon, morphology_backend,
+                       normalize_entities, regex_safety 等。domain は並び順にのみ
+                       影響するため不要）
+
+        Returns:
+            WhatIfAnalyzer: 分析器
+        """
+        if classifier is None:
+            classifier = PIVOTClassifier(
+                min_confidence=min_confidence,
+                use_morphology=use_morphology,
+                **options,
+            )
+        return cls(classifier.classify_items(utterances))
+
+    def view(
+        self,
+        weights: WeightSpec,
+        name: Optional[str] = None,
+    ) -> DomainView:
+        """
+        指定した重み付けでの分析結果を取得
+
+        Args:
+            weights: ドメイン名 / {voice: weight} / None
+            name: 結果の名前（None=ドメイン名）
+
+        Returns:
+            DomainView: 重み付け結果
+        """
+        resolved = resolve_weights(weights)
+        if name is None and (weights is None or isinstance(weights, str)):
+            name = weights
+
+        ranked = self._rank(resolved)
+        base = self._base
+        weighted_by_pivot = self._weighted_by_pivot(resolved)
+
+        result = PIVOTClassificationResult(
+            items=ranked,
+            by_pivot=base.by_pivot,
+            by_process=base.by_process,
+            by_tool=base.by_tool,
+            total_score=base.total_score,
+            sentiment_index=base.sentiment_index,
+            stats={**base.stats, "domain": name},
+        )
+        return DomainView(
+            name=name,
+            weights=resolved,
+            result=result,
+            weighted_by_pivot=weighted_by_pivot,
+        )
+
+    def compare(
+        self,
+        domains: Optional[Iterable[WeightSpec]] = None,
+    ) -> Dict[str, DomainView]:
+        """
+        複数の重み付けを比較
+
+        Args:
+            domains: ドメイン名 or 重み辞書のリスト（None=全BusinessDomain）
+
+        Returns:
+            Dict[str, DomainView]: キーはドメイン名、重み辞書は "custom_<n>"
+        """
+        specs = list(DOMAIN_PIVOT_WEIGHTS) if domains is None else list(domains)
+        views = {}
+        for i, spec in enumerate(specs):
+            name = spec if spec is None or isinstance(spec, str) else f"custom_{i}"
+            views[str(name)] = self.view(spec, name=name)
+        return views
+
+    def rankings(
+        self,
+        domains: Optional[Iterable[WeightSpec]] = None,
+        top_n: Optional[int] = None,
+    ) -> Dict[str, List[PIVOTInsight]]:
+        """重み付けごとのランキング（上位 top_n 件）"""
+        return {
+            name: view.items[:top_n]
+            for name, view in self.compare(domains).items()
+        }
+
+    def summaries(
+        self,
+        period_start: str,
+        period_end: str,
+        domains: Optional[Iterable[WeightSpec]] = None,
+        period_type: str = "monthly",
+    ) -> Dict[str, Dict]:
+        """重み付けごとのサマリーマート"""
+        return {
+            name: view.summary(period_start, period_end, period_type)
+            for name, view in self.compare(domains).items()
+        }
+
+    def priority_matrices(
+        self,
+        domains: Optional[Iterable[WeightSpec]] = None,
+    ) -> Dict[str, Dict]:
+        """重み付けごとの優先度マトリクス"""
+        return {
+            name: view.priority_matrix
+            for name, view in self.compare(domains).items()
+        }
+
+    def _weighted_by_pivot(self, weights: Dict[str, float]) -> Dict[str, float]:
+        """Voice別の重み付きスコア合計（Voiceコードの配列で集計）"""
+        if scoring.np is not None:
+            arrays = self._score_arrays()
+            weighted = scoring.weighted_scores(arrays, weights)
+            sums = scoring.np.bincount(arrays.voice, weights=weighted, minlength=len(PIVOT.ALL))
+            return dict(zip(PIVOT.ALL, sums.tolist()))
+
+        weighted_by_pivot = {p: 0.0 for p in PIVOT.ALL}
+        for item in self.items:
+            weighted_by_pivot[item.pivot_voice] += item.confidence * weights[item.pivot_voice]
+        return weighted_by_pivot
+
+    def _score_arrays(self) -> "scoring.ScoreArrays":
+        if self._arrays is None:
+            self._arrays = scoring.ScoreArrays.from_insights(self.items)
+        return self._arrays
+
+    def _rank(self, weights: Dict[str, float]) -> List[PIVOTInsight]:
+        """重み付きスコアの降順（安定）に並べ替え"""
+        if scoring.np is not None:
+            return scoring.reorder(self.items, scoring.rank(self._score_arrays(), weights))
+
+        return sorted(
+            self.items,
+            key=lambda item: item.confidence * weights[item.pivot_voice],
+            reverse=True,
+        )
+
+
+def compare_domains(
+    utterances: List[Utterance],
+    domains: Optional[Iterable[WeightSpec]] = None,
+    min_confidence: float = 0.3,
+) -> Dict[str, DomainView]:
+    """
+    シンプルなインターフェース
+
+    Args:
+        utterances: 入力発話リスト
+        domains: ドメイン名 or 重み辞書のリスト（None=全BusinessDomain）
+        min_confidence: 最小信頼度
+
+    Returns:
+        Dict[str, DomainView]: 重み付けごとの結果
+    """
+    analyzer = WhatIfAnalyzer.from_utterances(utterances, min_confidence=min_confidence)
+    return analyzer.compare(domains)